@@ -0,0 +1,144 @@
+# ruff: noqa
+"""Benchmarks for the dice and simulator hot paths.
+
+Run from the repository root:
+
+    python benchmarks/bench.py            # compare against benchmarks/baseline.json
+    python benchmarks/bench.py --save     # record a new baseline
+    python benchmarks/bench.py --scaling  # also print model-count scaling curves
+
+Every benchmark clears the engine caches before each call, outside the timed
+region, so timings measure a cold computation rather than a cache lookup.
+Saving with ``--filter`` only replaces the baseline entries that were run.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from vonsneg.dice.cache import clear_caches
+from vonsneg.dice.compound import wound_pmf
+from vonsneg.dice.roller import Roller
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.shooting import ShootingSimulator
+from vonsneg.rules.units import BaseUnit, load_unit_dicts_from_json, unit_from_dict
+from vonsneg.rules.weapons import WEAPONS
+
+# This gets you the root of the repo, regardless of where the script is run from
+ROOT = Path(__file__).resolve().parent.parent
+DATA = ROOT / "src" / "vonsneg" / "data"
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+UNIT_DICTS = load_unit_dicts_from_json(DATA / "core_units.json")
+
+
+def unit(name: str, weapon: str = "close combat", models: int | None = None) -> BaseUnit:
+    built = unit_from_dict(UNIT_DICTS[name], WEAPONS[weapon]())
+    if models is not None:
+        built.models = models
+    return built
+
+
+def melee(attacker: BaseUnit, defender: BaseUnit) -> Callable[[], object]:
+    return lambda: MeleeSimulator(attacker, defender).simulate()
+
+
+def shooting(attacker: BaseUnit, defender: BaseUnit) -> Callable[[], object]:
+    return lambda: ShootingSimulator(attacker, defender).simulate()
+
+
+SCENARIOS: dict[str, Callable[[], object]] = {
+    "roller.prob_dict 12d6": lambda: Roller(12, 4).prob_dict(),
+    "roller.prob_dict 36d12": lambda: Roller(36, 7).prob_dict(),
+    "wound_pmf 24 attacks": lambda: wound_pmf(24, 4, 5),
+    "melee fodder vs fodder": melee(unit("fodder"), unit("fodder")),
+    "melee bastards vs whelps": melee(unit("bastards"), unit("whelps")),
+    "melee brutes vs fodder (stand and shoot)": melee(unit("brutes"), unit("fodder", "missile")),
+    "melee whelps vs chaff (stand and shoot, skirmish)": melee(unit("whelps"), unit("chaff", "missile")),
+    "shooting fodder vs brutes": shooting(unit("fodder", "missile"), unit("brutes")),
+    "shooting fodder vs fodder (stand and shoot)": shooting(unit("fodder", "missile"), unit("fodder", "missile")),
+}
+
+SCALING_MODELS = (1, 2, 4, 8, 12, 16, 24, 32, 48)
+SCALING: dict[str, Callable[[int], Callable[[], object]]] = {
+    "melee fodder(n) vs fodder(n)": lambda n: melee(unit("fodder", models=n), unit("fodder", models=n)),
+    "melee fodder(n) vs brutes (stand and shoot)": lambda n: melee(unit("fodder", models=n), unit("brutes", "missile")),
+    "shooting fodder(n) vs fodder(n) (stand and shoot)": lambda n: shooting(
+        unit("fodder", "missile", models=n), unit("fodder", "missile", models=n)
+    ),
+}
+
+
+def measure(func: Callable[[], object], repeat: int = 50) -> float:
+    """Return the best time in seconds of a cold call to ``func``."""
+    # The setup runs before every single-call repeat, so clearing the caches is never timed
+    timer = timeit.Timer(func, setup=clear_caches)
+    return min(timer.repeat(repeat=repeat, number=1))
+
+
+def format_time(seconds: float) -> str:
+    for unit_name, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit_name}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the VonSneg simulators.")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--scaling", action="store_true", help="also measure scaling over model count")
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this text")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="slowdown ratio that counts as a regression")
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    results = {}
+    regressions = []
+
+    print(f"{'benchmark':<52} {'time':>11} {'baseline':>11} {'ratio':>7}")
+    for name, func in SCENARIOS.items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(func)
+        base = baseline.get("results", {}).get(name)
+        ratio = results[name] / base if base else None
+        flag = ""
+        if ratio is not None and ratio > args.tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        base_text = format_time(base) if base else "-".rjust(11)
+        ratio_text = f"{ratio:6.2f}x" if ratio else "-".rjust(7)
+        print(f"{name:<52} {format_time(results[name])} {base_text} {ratio_text}{flag}")
+
+    if args.scaling:
+        for name, make in SCALING.items():
+            if args.filter not in name:
+                continue
+            print(f"\n{name}")
+            for models in SCALING_MODELS:
+                print(f"  n={models:<3} {format_time(measure(make(models), repeat=3))}")
+
+    if args.save:
+        BASELINE.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": {**baseline.get("results", {}), **results},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"\nSaved baseline to {BASELINE}")
+    elif regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than {args.tolerance}x baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
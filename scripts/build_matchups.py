@@ -0,0 +1,29 @@
+# ruff: noqa
+import time
+from pathlib import Path
+
+from vonsneg.rules.catalog import UnitCatalog
+from vonsneg.rules.matchups import MatchupTable, iter_matchups
+
+# This gets you the root of the repo, regardless of where the script is run from
+ROOT = Path(__file__).resolve().parent.parent
+DATA = ROOT / "src" / "vonsneg" / "data"
+OUTPUT = ROOT / "data" / "matchups.npz"
+
+
+def main():
+    print("Loading units...")
+    unit_dicts = UnitCatalog.load(DATA / "core_units.json").entries
+
+    print("Simulating every matchup...")
+    start = time.perf_counter()
+    table = MatchupTable.build(iter_matchups(unit_dicts))
+    print(f"Simulated {len(table)} matchups in {time.perf_counter() - start:.1f}s")
+
+    OUTPUT.parent.mkdir(exist_ok=True)
+    table.save(OUTPUT)
+    print(f"Wrote {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
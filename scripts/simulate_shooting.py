@@ -1,29 +1,14 @@
 # ruff: noqa
 from pathlib import Path
 
+from vonsneg.rules.catalog import UnitCatalog
 from vonsneg.rules.shooting import ShootingSimulator
-from vonsneg.rules.units import BaseUnit, load_unit_dicts_from_json
-from vonsneg.rules.weapons import (
-    BaseWeapon,
-    BlackPowderWeapon,
-    CloseCombatWeapon,
-    MissileWeapon,
-    OldMissileWeapon,
-    PistolAndSabre,
-)
+from vonsneg.rules.units import BaseUnit
+from vonsneg.rules.weapons import WEAPONS, BaseWeapon, BlackPowderWeapon
 
 # This gets you the root of the repo, regardless of where the script is run from
 ROOT = Path(__file__).resolve().parent.parent
-DATA = ROOT / "data"
-
-# Map of available weapons
-WEAPONS = {
-    "close combat": CloseCombatWeapon,
-    "black powder": BlackPowderWeapon,
-    "missile": MissileWeapon,
-    "old missile": OldMissileWeapon,
-    "pistol and sabre": PistolAndSabre,
-}
+DATA = ROOT / "src" / "vonsneg" / "data"
 
 
 def choose_weapon() -> BaseWeapon:
@@ -48,36 +33,27 @@ def choose_weapon() -> BaseWeapon:
     return weapon
 
 
-def choose_unit(unit_dicts: dict) -> BaseUnit:
+def choose_unit(catalog: UnitCatalog) -> BaseUnit:
     print("\nAvailable units:")
-    for name in unit_dicts:
+    for name in catalog:
         print(f" - {name}")
     print()
     choice = input("Enter unit name: ").strip().lower()
-    if choice not in unit_dicts:
+    if choice not in catalog:
         raise ValueError(f"Unit '{choice}' not found.")
-    unit_data = unit_dicts[choice]
     weapon = choose_weapon()
-    return BaseUnit(
-        name=unit_data["name"],
-        unit_type=unit_data["type"],
-        models=unit_data["models"],
-        base_size=unit_data["base_size"],
-        stats=unit_data["stats"],
-        traits=unit_data["traits"],
-        weapon=weapon,
-    )
+    return catalog.unit(choice, weapon)
 
 
 def main():
     print("Loading units...")
-    unit_dicts = load_unit_dicts_from_json(DATA / "core_units.json")
+    catalog = UnitCatalog.load(DATA / "core_units.json")
 
     print("\nChoose shooter:")
-    shooter = choose_unit(unit_dicts)
+    shooter = choose_unit(catalog)
 
     print("\nChoose target:")
-    target = choose_unit(unit_dicts)
+    target = choose_unit(catalog)
 
     print(f"\nSimulating shooting between {shooter.name} and {target.name}...\n")
     sim = ShootingSimulator(shooter, target)
@@ -0,0 +1,82 @@
+# ruff: noqa
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from vonsneg.rules.catalog import UnitCatalog
+from vonsneg.rules.sweep import iter_cases, run_sweep, write_results
+from vonsneg.rules.weapons import WEAPONS
+
+# This gets you the root of the repo, regardless of where the script is run from
+ROOT = Path(__file__).resolve().parent.parent
+DATA = ROOT / "src" / "vonsneg" / "data"
+
+
+def parse_models(value: str) -> list[int | None]:
+    """Parse "default", "6" or an inclusive range like "1-12"."""
+    if value == "default":
+        return [None]
+    if "-" in value:
+        low, high = value.split("-")
+        return list(range(int(low), int(high) + 1))
+    return [int(part) for part in value.split(",")]
+
+
+def parse_overrides(values: list[str]) -> list[dict[str, int]]:
+    """Turn ["attacker.V=4,5", "defender.I=5"] into every combination of override dicts."""
+    combos = [{}]
+    for value in values:
+        key, options = value.split("=")
+        combos = [{**combo, key: int(option)} for combo in combos for option in options.split(",")]
+    return combos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run melee and shooting simulations over a grid.")
+    parser.add_argument("--units", nargs="+", default=[DATA / "core_units.json"], help="unit data files")
+    parser.add_argument("--kinds", nargs="+", default=["melee", "shooting"], choices=["melee", "shooting"])
+    parser.add_argument("--attackers", nargs="+", help="attacker unit names (default: all)")
+    parser.add_argument("--defenders", nargs="+", help="defender unit names (default: all)")
+    parser.add_argument("--attacker-weapons", nargs="+", default=list(WEAPONS), choices=list(WEAPONS))
+    parser.add_argument("--defender-weapons", nargs="+", default=list(WEAPONS), choices=list(WEAPONS))
+    parser.add_argument("--attacker-models", type=parse_models, default=[None], help='e.g. "1-12" or "6,8"')
+    parser.add_argument("--defender-models", type=parse_models, default=[None], help='e.g. "1-12" or "6,8"')
+    parser.add_argument("--override", action="append", default=[], help='e.g. "attacker.V=4,5"')
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes")
+    parser.add_argument("--chunksize", type=int, default=64)
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--output", help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    unit_dicts = UnitCatalog.load(*args.units).entries
+    cases = list(
+        iter_cases(
+            kinds=args.kinds,
+            attackers=[name.lower() for name in args.attackers or unit_dicts],
+            defenders=[name.lower() for name in args.defenders or unit_dicts],
+            attacker_weapons=args.attacker_weapons,
+            defender_weapons=args.defender_weapons,
+            attacker_models=args.attacker_models,
+            defender_models=args.defender_models,
+            overrides=parse_overrides(args.override),
+        )
+    )
+
+    start = time.perf_counter()
+
+    def progress(done: int) -> None:
+        if done % 1000 == 0 or done == len(cases):
+            print(f"\r{done}/{len(cases)} cases ({time.perf_counter() - start:.1f}s)", end="", file=sys.stderr)
+
+    results = run_sweep(cases, unit_dicts, jobs=args.jobs, chunksize=args.chunksize, progress=progress)
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as stream:
+            write_results(results, stream, args.format)
+    else:
+        write_results(results, sys.stdout, args.format)
+    print(file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Batch command line interface: stream matchup specs in, stream results out.
+
+Each input line (JSON lines) or row (CSV) describes one matchup::
+
+    {"kind": "melee", "attacker": "brutes", "defender": "fodder", "defender_weapon": "missile"}
+
+``attacker_weapon`` and ``defender_weapon`` default to close combat weapons and
+the model counts to the catalog's. Overrides are a ``{"attacker.V": 4}`` object in
+JSON or ``attacker.V=4;defender.I=5`` in CSV, the same form the output uses.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from collections import Counter, OrderedDict, deque
+from collections.abc import Iterable, Iterator
+from importlib import resources
+from pathlib import Path
+from typing import TextIO
+
+from vonsneg.rules.catalog import UnitCatalog
+from vonsneg.rules.matchups import SIMULATORS
+from vonsneg.rules.sweep import SweepCase, SweepResult, run_sweep, write_results
+from vonsneg.rules.weapons import WEAPONS
+
+DEFAULT_WEAPON = "close combat"
+# Unit data shipped with the package, used when no --units are given
+CORE_UNITS = resources.files("vonsneg") / "data" / "core_units.json"
+
+
+class SpecError(ValueError):
+    """Raised for a matchup spec that cannot be simulated."""
+
+
+def parse_overrides(value: dict | str | None) -> tuple[tuple[str, str, int], ...]:
+    """Turn ``{"attacker.V": 4}`` or ``"attacker.V=4;defender.I=5"`` into sweep overrides."""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = dict(part.split("=", 1) for part in value.split(";") if part)
+    overrides = []
+    for key, stat_value in sorted(value.items()):
+        side, _, stat = key.partition(".")
+        if side not in ("attacker", "defender") or not stat:
+            raise SpecError(f"Override '{key}' must look like attacker.V or defender.I.")
+        overrides.append((side, stat, int(stat_value)))
+    return tuple(overrides)
+
+
+def parse_spec(row: dict, catalog: UnitCatalog) -> SweepCase:
+    """Check a spec against the catalog and turn it into a sweep case."""
+
+    def field(name: str, default=None):
+        value = row.get(name)
+        return default if value in (None, "") else value
+
+    kind = field("kind", "")
+    if kind not in SIMULATORS:
+        raise SpecError(f"Unknown kind '{kind}', expected one of {', '.join(SIMULATORS)}.")
+    names = {}
+    for side in ("attacker", "defender"):
+        unit = str(field(side, "")).lower()
+        if unit not in catalog:
+            raise SpecError(f"Unit '{unit}' not found.")
+        weapon = str(field(f"{side}_weapon", DEFAULT_WEAPON)).lower()
+        if weapon not in WEAPONS:
+            raise SpecError(f"Weapon '{weapon}' not found.")
+        models = field(f"{side}_models")
+        names[side] = unit
+        names[f"{side}_weapon"] = weapon
+        names[f"{side}_models"] = None if models is None else int(models)
+    return SweepCase(kind=kind, overrides=parse_overrides(field("overrides")), **names)
+
+
+def read_specs(stream: TextIO, catalog: UnitCatalog, input_format: str = "jsonl") -> Iterator[SweepCase]:
+    """Lazily parse specs from a stream of JSON lines or CSV rows."""
+    if input_format == "csv":
+        rows = enumerate(csv.DictReader(stream), start=2)
+    else:
+        rows = ((number, line) for number, line in enumerate(stream, start=1) if line.strip())
+    for number, row in rows:
+        try:
+            yield parse_spec(row if input_format == "csv" else json.loads(row), catalog)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise SpecError(f"line {number}: {e}") from e
+
+
+def run_specs(
+    cases: Iterable[SweepCase],
+    unit_dicts: dict[str, dict],
+    jobs: int = 1,
+    chunksize: int = 16,
+    cache_size: int = 1024,
+) -> Iterator[SweepResult]:
+    """Simulate specs in input order, simulating each repeated spec only once.
+
+    :param cache_size: Answered results kept for later repeats, least recently used
+        first out; a spec repeated after that many others is simulated again
+    """
+    recent: OrderedDict[SweepCase, SweepResult] = OrderedDict()
+    # Results still owed to waiting specs, and how many of them wait for each
+    held: dict[SweepCase, SweepResult] = {}
+    references: Counter[SweepCase] = Counter()
+    waiting = deque()
+
+    def unique() -> Iterator[SweepCase]:
+        for case in cases:
+            waiting.append(case)
+            references[case] += 1
+            if references[case] > 1:
+                continue  # Already being simulated or held
+            if case in recent:
+                held[case] = recent.pop(case)
+                continue
+            yield case
+
+    def answer(case: SweepCase) -> SweepResult:
+        result = held[case]
+        references[case] -= 1
+        if not references[case]:
+            del references[case], held[case]
+            recent[case] = result
+            if len(recent) > cache_size:
+                recent.popitem(last=False)
+        return result
+
+    for result in run_sweep(unique(), unit_dicts, jobs=jobs, chunksize=chunksize):
+        held[result.case] = result
+        # Repeats of a spec are answered as soon as its first occurrence is
+        while waiting and waiting[0] in held:
+            yield answer(waiting.popleft())
+    while waiting:
+        yield answer(waiting.popleft())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="vonsneg", description="Simulate a stream of melee and shooting matchups.")
+    parser.add_argument("input", nargs="?", default="-", help="spec file, or - for stdin (default)")
+    parser.add_argument("--input-format", choices=["jsonl", "csv"], help="default: from the file extension, else jsonl")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="output format")
+    parser.add_argument("--output", help="output file (default: stdout)")
+    parser.add_argument("--units", nargs="+", help="unit data files (default: the core units shipped with vonsneg)")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes")
+    parser.add_argument("--chunksize", type=int, default=16, help="specs sent to a worker at a time")
+    parser.add_argument("--cache-size", type=int, default=1024, help="results kept to answer repeated specs")
+    args = parser.parse_args(argv)
+
+    input_format = args.input_format or ("csv" if Path(args.input).suffix.lower() == ".csv" else "jsonl")
+    with resources.as_file(CORE_UNITS) as core_units:
+        catalog = UnitCatalog.load(*(args.units or [core_units]))
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")  # noqa: SIM115
+    output = sys.stdout if args.output is None else open(args.output, "w", newline="", encoding="utf-8")  # noqa: SIM115
+    if output is sys.stdout and hasattr(output, "reconfigure"):
+        # Emit each result as soon as it is ready when piped into another program
+        output.reconfigure(line_buffering=True)
+
+    try:
+        cases = read_specs(source, catalog, input_format)
+        write_results(
+            run_specs(cases, catalog.entries, args.jobs, args.chunksize, args.cache_size), output, args.format
+        )
+    except SpecError as e:
+        print(f"vonsneg: {e}", file=sys.stderr)
+        return 2
+    finally:
+        for stream in (source, output):
+            if stream not in (sys.stdin, sys.stdout):
+                stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+This module contains closed-form success distributions for pools of identical dice.
+"""
+
+from fractions import Fraction
+from math import comb
+
+import numpy as np
+
+from vonsneg.dice.cache import lru_cache
+
+
+def success_probability(target: int) -> Fraction:
+    """Chance that a single die succeeds against ``target``.
+
+    Targets below 7 are a d6 rolled against the target, anything higher is a
+    d12 needing a 12 (equivalent to rolling a 6 and then a 4+).
+    """
+    if target < 7:
+        return Fraction(min(max(7 - target, 0), 6), 6)
+    return Fraction(1, 12)
+
+
+REROLLS = ("failures", "ones")
+
+
+@lru_cache(maxsize=256)
+def die_probability(target: int, reroll: str | None = None) -> Fraction:
+    """Chance that a single die succeeds against ``target``, after any reroll.
+
+    :param reroll: "failures" to reroll every failed die once, "ones" to reroll
+        a natural 1 (on the d6 rolled first) once, or None
+    """
+    p = success_probability(target)
+    if reroll is None:
+        return p
+    if reroll == "failures":
+        return p + (1 - p) * p
+    if reroll == "ones":
+        # A 1 is only a failure to reroll when the die could fail at all
+        return p + Fraction(1, 6) * p if p < 1 else p
+    raise ValueError(f"Unknown reroll '{reroll}', expected one of {', '.join(REROLLS)}.")
+
+
+@lru_cache(maxsize=4096)
+def binomial_pmf(num_dice: int, p: Fraction) -> np.ndarray:
+    """Exact binomial PMF of successes, indexed by number of successes.
+
+    Each term is an integer ratio divided once, so the floats are the correctly
+    rounded values of the exact probabilities. The returned array is shared and read-only.
+    """
+    successes, failures, sides = p.numerator, p.denominator - p.numerator, p.denominator
+    total = sides**num_dice
+    pmf = np.array(
+        [comb(num_dice, k) * successes**k * failures ** (num_dice - k) / total for k in range(num_dice + 1)],
+        dtype=np.float64,
+    )
+    pmf.setflags(write=False)
+    return pmf
+
+
+@lru_cache(maxsize=4096)
+def success_pmf(num_dice: int, target: int, reroll: str | None = None) -> np.ndarray:
+    """Return the PMF of successes when rolling ``num_dice`` dice against ``target``."""
+    return binomial_pmf(num_dice, die_probability(target, reroll))
+
+
+def pmf_to_dict(pmf: np.ndarray) -> dict[int, float]:
+    """Convert a PMF array to a {successes: probability} dict, dropping impossible outcomes."""
+    return {k: p for k, p in enumerate(pmf.tolist()) if p > 0}
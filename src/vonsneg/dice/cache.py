@@ -0,0 +1,114 @@
+"""
+This module contains the bounded, process-wide caches shared by the simulation engines.
+"""
+
+import inspect
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import update_wrapper
+
+_REGISTRY: dict[str, "LRUCache"] = {}
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters for a single cache."""
+
+    name: str
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache around a function of hashable arguments.
+
+    Keyword and omitted default arguments are bound to their positions first, so
+    ``f(x)``, ``f(x, None)`` and ``f(x, reroll=None)`` share one entry.
+    """
+
+    def __init__(self, func: Callable, maxsize: int, name: str):
+        self.func = func
+        self.maxsize = maxsize
+        self.name = name
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+        self._signature = inspect.signature(func)
+        positional = []
+        for parameter in self._signature.parameters.values():
+            if parameter.kind not in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+                break
+            positional.append(parameter.default)
+        # Defaults of the positional parameters, and how many leading ones are required
+        self._defaults = tuple(positional)
+        self._required = sum(default is inspect.Parameter.empty for default in positional)
+        update_wrapper(self, func)
+
+    def __call__(self, *args, **kwargs):
+        if kwargs or len(args) < self._required:
+            bound = self._signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            args = bound.args
+        elif len(args) < len(self._defaults):
+            # Padding omitted defaults directly is several times cheaper than binding on every hit
+            args += self._defaults[len(args) :]
+
+        with self._lock:
+            if args in self._entries:
+                self._entries.move_to_end(args)
+                self.hits += 1
+                return self._entries[args]
+            self.misses += 1
+
+        value = self.func(*args)
+
+        with self._lock:
+            self._entries[args] = value
+            self._entries.move_to_end(args)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(self.name, self.hits, self.misses, self.evictions, len(self._entries), self.maxsize)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+def lru_cache(maxsize: int = 1024) -> Callable[[Callable], LRUCache]:
+    """Decorate a function with a bounded, registered LRU cache keyed on its arguments."""
+
+    def decorator(func: Callable) -> LRUCache:
+        cached = LRUCache(func, maxsize, f"{func.__module__}.{func.__qualname__}")
+        _REGISTRY[cached.name] = cached
+        return cached
+
+    return decorator
+
+
+def cache_stats() -> dict[str, CacheStats]:
+    """Return the counters of every registered cache, keyed by function name."""
+    return {name: cached.stats() for name, cached in _REGISTRY.items()}
+
+
+def clear_caches() -> None:
+    """Clear every registered cache."""
+    for cached in _REGISTRY.values():
+        cached.clear()
@@ -0,0 +1,40 @@
+"""
+This module contains the hit-then-save wound distribution shared by the simulators.
+"""
+
+import numpy as np
+
+from vonsneg.dice.binomial import binomial_pmf, die_probability, success_probability
+from vonsneg.dice.cache import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def wound_pmf(num_dice: int, to_hit: int, to_save: int, reroll: str | None = None) -> np.ndarray:
+    """Return the PMF of wounds from rolling ``num_dice`` to hit and then saving every hit.
+
+    A die wounds when it hits and its save then fails, independently of the other
+    dice, so the wound count is a single binomial over the combined chance.
+
+    :param reroll: Reroll applied to the hit rolls, see :func:`die_probability`
+    """
+    p_wound = die_probability(to_hit, reroll) * (1 - success_probability(to_save))
+    return binomial_pmf(num_dice, p_wound)
+
+
+@lru_cache(maxsize=256)
+def wound_table(max_dice: int, to_hit: int, to_save: int, reroll: str | None = None) -> np.ndarray:
+    """Return the wound PMFs for every dice count from 0 to ``max_dice`` as one read-only 2-D array.
+
+    Row ``n`` is the PMF for ``n`` dice, padded with zeros to ``max_dice + 1``
+    columns. Each row is the one before convolved with a single die, so the
+    whole table is built in one incremental pass.
+    """
+    p_wound = die_probability(to_hit, reroll) * (1 - success_probability(to_save))
+    p, q = float(p_wound), float(1 - p_wound)
+    table = np.zeros((max_dice + 1, max_dice + 1))
+    table[0, 0] = 1.0
+    for n in range(1, max_dice + 1):
+        table[n, : n + 1] = table[n - 1, : n + 1] * q
+        table[n, 1 : n + 1] += table[n - 1, :n] * p
+    table.setflags(write=False)
+    return table
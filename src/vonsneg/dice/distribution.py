@@ -0,0 +1,174 @@
+"""
+This module contains the dense distribution type used by the simulators.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+
+import numpy as np
+
+
+class Distribution(Mapping[int, float]):
+    """Distribution over integers backed by a contiguous float64 array.
+
+    ``probs[i]`` is the probability of the outcome ``offset + i``. The mapping
+    interface behaves like the ``{outcome: probability}`` dicts the simulators
+    used to return, listing only outcomes with a non-zero probability.
+    ``probs`` is read-only, since cached results are shared between callers and
+    :meth:`cumulative` is computed from it once. Arrays passed in are used without
+    copying, so they must not be changed afterwards either.
+    """
+
+    __slots__ = ("_cumulative", "offset", "probs")
+
+    def __init__(self, probs: Iterable[float] | np.ndarray, offset: int = 0):
+        probs = np.ascontiguousarray(probs, dtype=np.float64)
+        nonzero = np.flatnonzero(probs)
+        if len(nonzero) == 0:
+            probs, nonzero = np.zeros(1), np.zeros(1, dtype=np.intp)
+        start, stop = int(nonzero[0]), int(nonzero[-1]) + 1
+        self.probs = probs[start:stop]
+        self.probs.setflags(write=False)
+        self.offset = int(offset) + start
+        self._cumulative = None
+
+    @classmethod
+    def point(cls, outcome: int = 0) -> "Distribution":
+        """Return a distribution with all of its mass on a single outcome."""
+        return cls([1.0], outcome)
+
+    @classmethod
+    def from_dict(cls, dist: Mapping[int, float]) -> "Distribution":
+        """Build a distribution from a {outcome: probability} mapping, empty if the mapping is."""
+        if isinstance(dist, Distribution):
+            return dist
+        if not dist:
+            return cls([0.0])
+        low, high = min(dist), max(dist)
+        probs = np.zeros(high - low + 1)
+        for outcome, prob in dist.items():
+            probs[outcome - low] += float(prob)
+        return cls(probs, low)
+
+    @classmethod
+    def mixture(cls, components: Iterable[tuple[float, "Distribution"]]) -> "Distribution":
+        """Return the weighted sum of ``(weight, distribution)`` pairs."""
+        components = [(weight, dist) for weight, dist in components if weight > 0]
+        if not components:
+            return cls([0.0])
+        low = min(dist.offset for _, dist in components)
+        high = max(dist.high for _, dist in components)
+        probs = np.zeros(high - low + 1)
+        for weight, dist in components:
+            start = dist.offset - low
+            probs[start : start + len(dist.probs)] += weight * dist.probs
+        return cls(probs, low)
+
+    @property
+    def high(self) -> int:
+        """Largest outcome covered by the array."""
+        return self.offset + len(self.probs) - 1
+
+    def outcomes(self) -> np.ndarray:
+        """Return the outcome for each entry of ``probs``."""
+        return np.arange(self.offset, self.offset + len(self.probs))
+
+    def convolve(self, other: "Distribution") -> "Distribution":
+        """Return the distribution of the sum of two independent outcomes."""
+        return Distribution(np.convolve(self.probs, other.probs), self.offset + other.offset)
+
+    def __add__(self, other: "Distribution") -> "Distribution":
+        return self.convolve(other)
+
+    def __sub__(self, other: "Distribution") -> "Distribution":
+        return self.convolve(-other)
+
+    def __neg__(self) -> "Distribution":
+        return Distribution(self.probs[::-1], -self.high)
+
+    def shift(self, amount: int) -> "Distribution":
+        """Return the distribution with every outcome moved by ``amount``."""
+        return Distribution(self.probs, self.offset + amount)
+
+    def scale(self, weight: float) -> "Distribution":
+        """Return the distribution with every probability multiplied by ``weight``."""
+        return Distribution(self.probs * weight, self.offset)
+
+    def total(self) -> float:
+        """Total probability mass."""
+        return float(self.cumulative()[-1])
+
+    def mean(self) -> float:
+        """Expected outcome."""
+        return float(self.outcomes() @ self.probs)
+
+    def cumulative(self) -> np.ndarray:
+        """Return the read-only running total of ``probs``, computed once as ``probs`` never changes."""
+        if self._cumulative is None:
+            cumulative = np.cumsum(self.probs)
+            cumulative.setflags(write=False)
+            self._cumulative = cumulative
+        return self._cumulative
+
+    def cdf(self, outcome: int) -> float:
+        """Probability of an outcome of at most ``outcome``."""
+        index = outcome - self.offset
+        if index < 0:
+            return 0.0
+        cumulative = self.cumulative()
+        return float(cumulative[min(index, len(cumulative) - 1)])
+
+    def at_least(self, outcome: int) -> float:
+        """Probability of an outcome of at least ``outcome``."""
+        return self.total() - self.cdf(outcome - 1)
+
+    def _mass_between(self, low: int | None = None, high: int | None = None) -> float:
+        below = 0.0 if low is None else self.cdf(low - 1)
+        upto = self.total() if high is None else self.cdf(high)
+        return max(upto - below, 0.0)
+
+    def win(self) -> float:
+        """Probability of a positive outcome."""
+        return self._mass_between(low=1)
+
+    def lose(self) -> float:
+        """Probability of a negative outcome."""
+        return self._mass_between(high=-1)
+
+    def draw(self) -> float:
+        """Probability of a zero outcome."""
+        index = -self.offset
+        return float(self.probs[index]) if 0 <= index < len(self.probs) else 0.0
+
+    def quantile(self, q: float) -> int:
+        """Return the smallest outcome whose cumulative probability reaches ``q``."""
+        cumulative = self.cumulative()
+        index = int(np.searchsorted(cumulative, q * cumulative[-1]))
+        return self.offset + min(index, len(self.probs) - 1)
+
+    def to_dict(self) -> dict[int, float]:
+        """Return a plain {outcome: probability} dict of the non-zero outcomes."""
+        return {self.offset + i: p for i, p in enumerate(self.probs.tolist()) if p > 0}
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __getitem__(self, outcome: int) -> float:
+        index = outcome - self.offset
+        if 0 <= index < len(self.probs) and self.probs[index] > 0:
+            return float(self.probs[index])
+        raise KeyError(outcome)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(int(i) + self.offset for i in np.flatnonzero(self.probs))
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.probs))
+
+    def __repr__(self) -> str:
+        return f"Distribution({self.to_dict()!r})"
@@ -0,0 +1,56 @@
+"""
+This module contains exact integer-count tables for verifying and publishing odds.
+
+The float path in :mod:`vonsneg.dice.binomial` is what the simulators serve from.
+The tables here count outcomes over a shared power-of-sides denominator, so the
+exact path only builds a :class:`~fractions.Fraction` once per published probability.
+"""
+
+from collections.abc import Iterable, Mapping
+from fractions import Fraction
+from math import comb
+from types import MappingProxyType
+
+from vonsneg.dice.binomial import die_probability, success_probability
+from vonsneg.dice.cache import lru_cache
+
+NUMERIC_BACKENDS = ("float", "exact")
+
+
+def check_numeric(numeric: str, options: Iterable[str] = ()) -> None:
+    """Raise ValueError unless ``numeric`` names a numeric backend that accepts ``options``.
+
+    :param options: Names of the other arguments passed along, which only the float path uses
+    """
+    if numeric not in NUMERIC_BACKENDS:
+        raise ValueError(f"Unknown numeric backend '{numeric}', expected one of {', '.join(NUMERIC_BACKENDS)}.")
+    if numeric == "exact" and options:
+        raise ValueError(f"The exact backend takes no {', '.join(sorted(options))} argument.")
+
+
+@lru_cache(maxsize=4096)
+def binomial_counts(num_dice: int, p: Fraction) -> tuple[tuple[int, ...], int]:
+    """Return the exact binomial PMF of successes as integer counts over a common denominator.
+
+    Entry ``k`` of the counts is the number of the ``denominator`` equally likely
+    outcomes with ``k`` successes, where the denominator is ``p.denominator ** num_dice``.
+    """
+    successes, failures = p.numerator, p.denominator - p.numerator
+    counts = tuple(comb(num_dice, k) * successes**k * failures ** (num_dice - k) for k in range(num_dice + 1))
+    return counts, p.denominator**num_dice
+
+
+@lru_cache(maxsize=4096)
+def wound_counts(num_dice: int, to_hit: int, to_save: int, reroll: str | None = None) -> tuple[tuple[int, ...], int]:
+    """Exact counterpart of :func:`vonsneg.dice.compound.wound_pmf` as integer counts."""
+    return binomial_counts(num_dice, die_probability(to_hit, reroll) * (1 - success_probability(to_save)))
+
+
+def counts_to_mapping(counts: Mapping[int, int], denominator: int) -> Mapping[int, Fraction]:
+    """Convert {outcome: count} to a sorted, read-only {outcome: probability} mapping.
+
+    Impossible outcomes are dropped, as in the float path.
+    """
+    return MappingProxyType(
+        {outcome: Fraction(counts[outcome], denominator) for outcome in sorted(counts) if counts[outcome]}
+    )
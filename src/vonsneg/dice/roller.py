@@ -1,27 +1,77 @@
 import random
+from typing import TYPE_CHECKING
 
-from icepool import Pool, d6, d12
+from vonsneg.instrumentation import count
+
+# NumPy and icepool are imported on first use so that only rolling dice stays cheap to import
+if TYPE_CHECKING:
+    from fractions import Fraction
+
+    import numpy as np
 
 
 class Roller:
-    def __init__(self, num_dice: int, target: int, modifier: int = 0):
+    def __init__(self, num_dice: int, target: int, modifier: int = 0, reroll: str | None = None):
+        """
+        :param modifier: Added to ``target``, so positive modifiers make every die harder
+        :param reroll: "failures" or "ones" to reroll those dice once, see ``binomial.die_probability``
+        """
+        if reroll not in (None, "failures", "ones"):
+            raise ValueError(f"Unknown reroll '{reroll}', expected failures or ones.")
+        count("roller_constructions")
         self.num_dice = num_dice
         self.target = target + modifier
+        self.reroll = reroll
 
     def simulate(self) -> int:
+        if self.reroll is None:
+            if self.target < 7:
+                # Normal rolling for target < 7
+                results = [random.randint(1, 6) for _ in range(self.num_dice)]
+                return sum(1 for roll in results if roll >= self.target)
+            # For target >= 7, use d12 >= 12 (equivalent to roll 6 then 4+)
+            results = [random.randint(1, 12) for _ in range(self.num_dice)]
+            return sum(1 for roll in results if roll >= 12)
+
+        successes = 0
+        for _ in range(self.num_dice):
+            success, roll = self._roll_die()
+            if not success and (self.reroll == "failures" or roll == 1):
+                success, _ = self._roll_die()
+            successes += success
+        return successes
+
+    def _roll_die(self) -> tuple[bool, int]:
+        """Roll one die and return whether it succeeded and the d6 rolled first."""
+        roll = random.randint(1, 6)
         if self.target < 7:
-            # Normal rolling for target < 7
-            results = [random.randint(1, 6) for _ in range(self.num_dice)]
-            return sum(1 for roll in results if roll >= self.target)
-        # For target >= 7, use d12 >= 12 (equivalent to roll 6 then 4+)
-        results = [random.randint(1, 12) for _ in range(self.num_dice)]
-        return sum(1 for roll in results if roll >= 12)
+            return roll >= self.target, roll
+        # For target >= 7, roll a 6 and then a 4+
+        return roll == 6 and random.randint(1, 6) >= 4, roll
+
+    def sample(self, trials: int, rng: "np.random.Generator | None" = None) -> "np.ndarray":
+        """Roll the dice ``trials`` times at once and return the number of successes per roll."""
+        import numpy as np
+
+        from vonsneg.dice.binomial import die_probability
+
+        rng = rng or np.random.default_rng()
+        return rng.binomial(self.num_dice, float(die_probability(self.target, self.reroll)), size=trials)
 
     def distribution(self):
         """Return a Population object (unnormalized frequencies)."""
+        from icepool import Die, Pool, d6, d12
+
         if self.num_dice == 0:
             # No dice: always 0 successes
             return {0: 1.0}
+        if self.reroll is not None:
+            from vonsneg.dice.binomial import die_probability
+
+            # A rerolled die is still a single success or failure, just with better odds
+            p = die_probability(self.target, self.reroll)
+            success_die = Die({1: p.numerator, 0: p.denominator - p.numerator})
+            return Pool([success_die] * self.num_dice).sum()
         if self.target < 7:
             # Normal distribution for target < 7
             success_die = (d6 >= self.target).map({True: 1, False: 0})
@@ -30,13 +80,25 @@ class Roller:
         success_die = (d12 >= 12).map({True: 1, False: 0})
         return Pool([success_die] * self.num_dice).sum()
 
-    def prob_dict(self) -> dict[int, float]:
-        """Returns a dictionary of {successes: probability} for all outcomes."""
-        if self.num_dice == 0:
-            return {0: 1.0}
-        dist = self.distribution()
-        if isinstance(dist, dict):
-            # Handle dict case (from two-stage process)
-            return dist
-        # Handle Population case (from normal process)
-        return {k: dist.probability(k) for k in dist}
+    def pmf(self) -> "np.ndarray":
+        """Return the exact success PMF as a read-only array indexed by successes."""
+        from vonsneg.dice.binomial import success_pmf
+
+        return success_pmf(self.num_dice, self.target, self.reroll)
+
+    def prob_dict(self, numeric: str = "float") -> "dict[int, float] | dict[int, Fraction]":
+        """Returns a dictionary of {successes: probability} for all outcomes.
+
+        :param numeric: "float", or "exact" for Fraction probabilities
+        """
+        if numeric == "float":
+            from vonsneg.dice.binomial import pmf_to_dict
+
+            return pmf_to_dict(self.pmf())
+
+        from vonsneg.dice.binomial import die_probability
+        from vonsneg.dice.exact import binomial_counts, check_numeric, counts_to_mapping
+
+        check_numeric(numeric)
+        counts, denominator = binomial_counts(self.num_dice, die_probability(self.target, self.reroll))
+        return dict(counts_to_mapping(dict(enumerate(counts)), denominator))
@@ -0,0 +1,166 @@
+"""Opt-in timing and counters for the simulation stages.
+
+Instrumentation is off until :func:`profiling` is entered, and while it is off an
+instrumented stage costs a single global lookup. While on, every stage records
+its calls, wall time, result sizes and how deeply stages were nested, and the
+process-wide caches are snapshotted so their hits and misses can be attributed
+to the profiled code::
+
+    with profiling() as stats:
+        MeleeSimulator(attacker, defender).simulate()
+    print(stats.to_prometheus())
+"""
+
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+
+from vonsneg.dice.cache import CacheStats, cache_stats
+
+# Stats being recorded, or None while instrumentation is off
+_ACTIVE: "SimulationStats | None" = None
+_LOCK = threading.Lock()
+# How deeply instrumented stages are nested in the current thread or task
+_DEPTH: ContextVar[int] = ContextVar("vonsneg_stage_depth", default=0)
+
+
+@dataclass
+class StageStats:
+    """Calls and wall time of one stage, and the size of what it returned."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    max_size: int = 0
+
+
+@dataclass
+class SimulationStats:
+    """Everything recorded while :func:`profiling` was active."""
+
+    stages: dict[str, StageStats] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+    caches: dict[str, CacheStats] = field(default_factory=dict)
+    max_depth: int = 0
+
+    def record(self, stage: str, seconds: float, size: int) -> None:
+        with _LOCK:
+            stats = self.stages.setdefault(stage, StageStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.max_size = max(stats.max_size, size)
+
+    def to_dict(self) -> dict:
+        """Return the stats as plain dicts and numbers."""
+        return {
+            "stages": {name: asdict(stats) for name, stats in self.stages.items()},
+            "counters": dict(self.counters),
+            "caches": {name: {**asdict(stats), "hit_ratio": stats.hit_ratio} for name, stats in self.caches.items()},
+            "max_depth": self.max_depth,
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """Return the stats as a JSON document."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "vonsneg") -> str:
+        """Return the stats in the Prometheus text exposition format."""
+        lines = []
+
+        def metric(name: str, kind: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(f"{prefix}_{name}{labels} {value!r}" for labels, value in samples)
+
+        stages = sorted(self.stages.items())
+        metric("stage_calls_total", "counter", [(f'{{stage="{n}"}}', s.calls) for n, s in stages])
+        metric("stage_seconds_total", "counter", [(f'{{stage="{n}"}}', s.seconds) for n, s in stages])
+        metric("stage_max_seconds", "gauge", [(f'{{stage="{n}"}}', s.max_seconds) for n, s in stages])
+        metric("stage_max_size", "gauge", [(f'{{stage="{n}"}}', s.max_size) for n, s in stages])
+        for name, value in sorted(self.counters.items()):
+            metric(f"{name.replace('.', '_')}_total", "counter", [("", value)])
+        caches = sorted(self.caches.items())
+        metric("cache_hits_total", "counter", [(f'{{cache="{n}"}}', s.hits) for n, s in caches])
+        metric("cache_misses_total", "counter", [(f'{{cache="{n}"}}', s.misses) for n, s in caches])
+        metric("cache_hit_ratio", "gauge", [(f'{{cache="{n}"}}', s.hit_ratio) for n, s in caches])
+        metric("stage_max_depth", "gauge", [("", self.max_depth)])
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profiling() -> Iterator[SimulationStats]:
+    """Record stats for the code run inside the block.
+
+    Cache counters are reported as the change over the block, with their sizes at the end.
+    """
+    global _ACTIVE
+    if _ACTIVE is not None:
+        raise RuntimeError("Profiling is already active.")
+    stats = SimulationStats()
+    before = cache_stats()
+    _ACTIVE = stats
+    try:
+        yield stats
+    finally:
+        _ACTIVE = None
+        for name, after in cache_stats().items():
+            start = before.get(name, CacheStats(name, 0, 0, 0, 0, after.maxsize))
+            stats.caches[name] = CacheStats(
+                name,
+                after.hits - start.hits,
+                after.misses - start.misses,
+                after.evictions - start.evictions,
+                after.size,
+                after.maxsize,
+            )
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to a named counter while profiling."""
+    stats = _ACTIVE
+    if stats is not None:
+        with _LOCK:
+            stats.counters[name] = stats.counters.get(name, 0) + amount
+
+
+def _size(result) -> int:
+    if isinstance(result, tuple):
+        result = result[0]
+    if hasattr(result, "probs"):
+        return len(result.probs)
+    return int(getattr(result, "size", 0))
+
+
+def instrumented(stage: str) -> Callable[[Callable], Callable]:
+    """Time every call of the decorated function as ``stage`` while profiling.
+
+    Placed under a cache decorator, only the calls that miss the cache are timed.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            stats = _ACTIVE
+            if stats is None:
+                return func(*args, **kwargs)
+
+            depth = _DEPTH.get() + 1
+            token = _DEPTH.set(depth)
+            with _LOCK:
+                stats.max_depth = max(stats.max_depth, depth)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                _DEPTH.reset(token)
+            stats.record(stage, time.perf_counter() - start, _size(result))
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,153 @@
+"""Army-against-army evaluation over every pairing of two unit lists."""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from vonsneg.rules.catalog import UnitCatalog
+from vonsneg.rules.matchups import SIMULATORS, matchup_key
+from vonsneg.rules.units import BaseUnit
+from vonsneg.rules.weapons import WEAPONS
+
+SIDES = ("ours", "theirs")
+
+
+def army_from_catalog(catalog: UnitCatalog, specs: Iterable[str | tuple[str, str]]) -> list[BaseUnit]:
+    """Build an army from catalog names, each optionally paired with a weapon name from ``WEAPONS``.
+
+    Units listed twice are built twice, as two separate units on the table.
+    """
+    army = []
+    for spec in specs:
+        name, weapon = (spec, None) if isinstance(spec, str) else spec
+        if weapon is not None and weapon.lower() not in WEAPONS:
+            raise KeyError(f"Weapon '{weapon}' not found.")
+        army.append(catalog.unit(name, WEAPONS[weapon.lower()]() if weapon else None))
+    return army
+
+
+def unit_label(unit: BaseUnit) -> str:
+    """Short name for a unit in reports."""
+    return f"{unit.name} ({unit.weapon.name})"
+
+
+@dataclass(frozen=True)
+class MatchupMatrix:
+    """Results of every unit of one army attacking every unit of the other.
+
+    Entry ``[i, j]`` of each array is attacker ``i`` against defender ``j``;
+    ``inflicted`` and ``suffered`` are the expected models the defender and the
+    attacker lose.
+    """
+
+    kind: str
+    attackers: tuple[str, ...]
+    defenders: tuple[str, ...]
+    win: np.ndarray
+    lose: np.ndarray
+    mean: np.ndarray
+    inflicted: np.ndarray
+    suffered: np.ndarray
+
+    def best_targets(self) -> list[int]:
+        """Index of the defender each attacker is most likely to beat, preferring more casualties on a tie."""
+        if not self.defenders:
+            return []
+        columns = range(len(self.defenders))
+        return [max(columns, key=lambda j: (self.win[i, j], self.inflicted[i, j])) for i in range(len(self.attackers))]
+
+
+@dataclass(frozen=True)
+class Target:
+    """An attacker's best target and what it can expect from the fight."""
+
+    attacker: str
+    defender: str
+    win: float
+    inflicted: float
+    suffered: float
+
+
+@dataclass(frozen=True)
+class ArmyReport:
+    """Matchup matrices in both directions and the summaries built from them."""
+
+    matrices: dict[tuple[str, str], MatchupMatrix]
+
+    def matrix(self, kind: str = "melee", side: str = "ours") -> MatchupMatrix:
+        """Matrix of ``side``'s units attacking the other army's."""
+        return self.matrices[kind, side]
+
+    def best_targets(self, kind: str = "melee", side: str = "ours") -> list[Target]:
+        """The best target of each of ``side``'s units."""
+        matrix = self.matrix(kind, side)
+        return [
+            Target(
+                attacker,
+                matrix.defenders[j],
+                float(matrix.win[i, j]),
+                float(matrix.inflicted[i, j]),
+                float(matrix.suffered[i, j]),
+            )
+            for (i, attacker), j in zip(enumerate(matrix.attackers), matrix.best_targets(), strict=False)
+        ]
+
+    def expected_attrition(self, kind: str = "melee", side: str = "ours") -> tuple[float, float]:
+        """Expected models (inflicted, suffered) if every one of ``side``'s units attacks its best target."""
+        targets = self.best_targets(kind, side)
+        return sum(t.inflicted for t in targets), sum(t.suffered for t in targets)
+
+    def threat_rankings(self, kind: str = "melee", side: str = "theirs") -> list[tuple[str, float]]:
+        """``side``'s units ordered by their best win probability against the other army, most dangerous first."""
+        matrix = self.matrix(kind, side)
+        threat = matrix.win.max(axis=1, initial=0.0)
+        order = sorted(range(len(matrix.attackers)), key=lambda i: -threat[i])
+        return [(matrix.attackers[i], float(threat[i])) for i in order]
+
+
+class ArmyEvaluator:
+    """Evaluates two armies against each other in a single deduplicated pass.
+
+    Every (kind, attacker, defender) pairing in both directions is simulated at
+    most once, however often identical units appear in either list.
+    """
+
+    def __init__(self, ours: Sequence[BaseUnit], theirs: Sequence[BaseUnit]):
+        self.armies = {"ours": list(ours), "theirs": list(theirs)}
+
+    def evaluate(self, kinds: Iterable[str] = tuple(SIMULATORS)) -> ArmyReport:
+        """Simulate every pairing and return the matrices for each kind and direction."""
+        results: dict[str, tuple[float, float, float, float, float]] = {}
+        matrices = {}
+        for kind in kinds:
+            for side in SIDES:
+                attackers = self.armies[side]
+                defenders = self.armies["theirs" if side == "ours" else "ours"]
+                table = np.zeros((5, len(attackers), len(defenders)))
+                for i, attacker in enumerate(attackers):
+                    for j, defender in enumerate(defenders):
+                        key = matchup_key(kind, attacker, defender)
+                        if key not in results:
+                            results[key] = _summarise(kind, attacker, defender)
+                        table[:, i, j] = results[key]
+                table.setflags(write=False)
+                matrices[kind, side] = MatchupMatrix(
+                    kind,
+                    tuple(unit_label(unit) for unit in attackers),
+                    tuple(unit_label(unit) for unit in defenders),
+                    *table,
+                )
+        return ArmyReport(matrices)
+
+
+def _summarise(kind: str, attacker: BaseUnit, defender: BaseUnit) -> tuple[float, float, float, float, float]:
+    simulator = SIMULATORS[kind](attacker, defender)
+    dist = simulator.simulate_distribution()
+    return (
+        dist.win(),
+        dist.lose(),
+        dist.mean(),
+        simulator.expected_casualties("defender"),
+        simulator.expected_casualties("attacker"),
+    )
@@ -0,0 +1,196 @@
+"""Exact resolution of melee bouts."""
+
+from collections import defaultdict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from fractions import Fraction
+
+import numpy as np
+
+from vonsneg.dice.cache import lru_cache
+from vonsneg.dice.compound import wound_pmf, wound_table
+from vonsneg.dice.distribution import Distribution
+from vonsneg.dice.exact import counts_to_mapping, wound_counts
+from vonsneg.instrumentation import instrumented
+from vonsneg.rules.units import BaseUnit, UnitProfile
+
+
+@dataclass(frozen=True)
+class BoutSide:
+    """Melee profile of one side of a bout.
+
+    ``reroll`` applies to this side's hit rolls, see :func:`vonsneg.dice.binomial.die_probability`.
+    """
+
+    attacks: int
+    to_hit: int
+    to_save: int
+    wounds: int = 1
+    reroll: str | None = None
+
+    @classmethod
+    def from_profile(cls, profile: UnitProfile, charging: bool = False) -> "BoutSide":
+        """Melee profile of a unit profile, with its weapon's melee modifiers.
+
+        :param charging: Whether this side charged, which lets weapons with ``reroll_charge`` reroll failed hits
+        """
+        reroll = "failures" if charging and profile.reroll_charge else None
+        to_hit = profile.inaccuracy + profile.melee_inaccuracy_mod
+        return cls(profile.attacks, to_hit, profile.vitality, profile.wounds, reroll)
+
+    @classmethod
+    def from_unit(cls, unit: BaseUnit, charging: bool = False) -> "BoutSide":
+        """Melee profile of a unit."""
+        return cls.from_profile(unit.profile(), charging)
+
+
+@lru_cache(maxsize=1024)
+@instrumented("solve_bout")
+def solve_bout(attacker: BoutSide, defender: BoutSide, attacker_models: int, defender_models: int) -> Distribution:
+    """Return the {wound_delta: probability} distribution of a bout (positive = attacker wins).
+
+    The attacker strikes first and the surviving defenders strike back. A tied bout
+    is fought again from the same model counts, so ties form a geometric series and
+    the remaining outcomes are simply rescaled by 1 / (1 - P(tie)).
+    """
+    if attacker_models <= 0:
+        return Distribution.point(-1)  # attacker wiped out
+    if defender_models <= 0:
+        return Distribution.point(1)  # defender wiped out
+
+    atk_wound_dist = wound_pmf(attacker_models * attacker.attacks, attacker.to_hit, defender.to_save, attacker.reroll)
+    # Look up the defenders' wounds for every attacker result at once, one row per number left standing
+    def_table = wound_table(defender_models * defender.attacks, defender.to_hit, attacker.to_save, defender.reroll)
+    atk_wounds = np.arange(len(atk_wound_dist))[:, None]
+    def_attacks = np.maximum(defender_models - atk_wounds // defender.wounds, 0) * defender.attacks
+    def_wounds = np.arange(def_table.shape[1])[None, :]
+    atk_wiped = attacker_models - def_wounds // attacker.wounds <= 0
+    deltas = np.where(atk_wiped, -def_wounds, atk_wounds - def_wounds)
+    # Ties are dropped here and redistributed by the normalisation below. Defenders
+    # with no attacks left can't tie, the attacker's result simply stands.
+    tied = ~atk_wiped & (def_wounds == atk_wounds) & (def_attacks > 0)
+    probs = np.where(tied, 0.0, atk_wound_dist[:, None] * def_table[def_attacks[:, 0]])
+    low = -(def_table.shape[1] - 1)
+    decided = Distribution(np.bincount((deltas - low).ravel(), weights=probs.ravel()), low)
+    total = decided.total()
+    if total == 0:
+        # Every bout ties, so split the result evenly
+        return Distribution([0.5, 0.0, 0.5], -1)
+    return decided.scale(1 / total)
+
+
+@lru_cache(maxsize=1024)
+@instrumented("exact_solve_bout")
+def exact_solve_bout(
+    attacker: BoutSide,
+    defender: BoutSide,
+    attacker_models: int,
+    defender_models: int,
+) -> Mapping[int, Fraction]:
+    """Exact counterpart of :func:`solve_bout` as a read-only {wound_delta: Fraction} mapping.
+
+    Outcomes are counted as integers over the denominator of the defender's largest
+    roll, which cancels when the decided bouts are normalised.
+    """
+    if attacker_models <= 0:
+        return counts_to_mapping({-1: 1}, 1)
+    if defender_models <= 0:
+        return counts_to_mapping({1: 1}, 1)
+
+    atk_counts, _ = wound_counts(attacker_models * attacker.attacks, attacker.to_hit, defender.to_save, attacker.reroll)
+    _, max_denominator = wound_counts(
+        defender_models * defender.attacks, defender.to_hit, attacker.to_save, defender.reroll
+    )
+    decided = defaultdict(int)
+
+    for atk_wounds, atk_count in enumerate(atk_counts):
+        if atk_count == 0:
+            continue
+        def_remaining = max(defender_models - atk_wounds // defender.wounds, 0)
+        def_attacks = def_remaining * defender.attacks
+        if def_attacks == 0:
+            decided[atk_wounds] += atk_count * max_denominator
+            continue
+
+        def_counts, denominator = wound_counts(def_attacks, defender.to_hit, attacker.to_save, defender.reroll)
+        weight = atk_count * (max_denominator // denominator)
+        for def_wounds, def_count in enumerate(def_counts):
+            if attacker_models - def_wounds // attacker.wounds <= 0:
+                decided[-def_wounds] += weight * def_count
+            elif def_wounds != atk_wounds:
+                decided[atk_wounds - def_wounds] += weight * def_count
+
+    total = sum(decided.values())
+    if total == 0:
+        # Every bout ties, so split the result evenly
+        return counts_to_mapping({-1: 1, 1: 1}, 2)
+    return counts_to_mapping(decided, total)
+
+
+@lru_cache(maxsize=256)
+@instrumented("bout_table")
+def bout_table(
+    attacker: BoutSide,
+    defender: BoutSide,
+    max_attacker_models: int,
+    defender_models: int,
+) -> tuple[np.ndarray, int]:
+    """Return bout results for every attacker model count from 0 to ``max_attacker_models`` at once.
+
+    Returns a read-only 2-D array whose row ``n`` is the wound delta distribution
+    of a bout fought by ``n`` attacking models, and the outcome of its first column.
+    Row 0 has all of its mass on a delta of 0 since an attacker with no models
+    never reaches combat.
+    """
+    rows = [Distribution.point(0)]
+    rows.extend(solve_bout(attacker, defender, models, defender_models) for models in range(1, max_attacker_models + 1))
+    low = min(row.offset for row in rows)
+    high = max(row.high for row in rows)
+    table = np.zeros((len(rows), high - low + 1))
+    for models, row in enumerate(rows):
+        table[models, row.offset - low : row.high - low + 1] = row.probs
+    table.setflags(write=False)
+    return table, low
+
+
+@lru_cache(maxsize=1024)
+@instrumented("bout_casualties")
+def bout_casualties(
+    attacker: BoutSide,
+    defender: BoutSide,
+    attacker_models: int,
+    defender_models: int,
+) -> np.ndarray:
+    """Return the joint distribution of models lost in a bout.
+
+    Entry ``[a, d]`` of the returned read-only array is the probability that the
+    attacker loses ``a`` models and the defender ``d``. Ties are fought again as in
+    :func:`solve_bout`; a bout that can never be decided leaves both sides intact.
+    """
+    losses = np.zeros((attacker_models + 1, defender_models + 1))
+    if attacker_models <= 0 or defender_models <= 0:
+        losses[0, 0] = 1.0
+        losses.setflags(write=False)
+        return losses
+
+    atk_wound_dist = wound_pmf(attacker_models * attacker.attacks, attacker.to_hit, defender.to_save, attacker.reroll)
+    # Look up the defenders' wounds for every attacker result at once, one row per number left standing
+    def_table = wound_table(defender_models * defender.attacks, defender.to_hit, attacker.to_save, defender.reroll)
+    atk_wounds = np.arange(len(atk_wound_dist))[:, None]
+    def_lost = np.minimum(atk_wounds // defender.wounds, defender_models)
+    def_attacks = (defender_models - def_lost) * defender.attacks
+    def_wounds = np.arange(def_table.shape[1])[None, :]
+    atk_lost = np.minimum(def_wounds // attacker.wounds, attacker_models)
+    # Ties are dropped here and redistributed by the normalisation below
+    tied = (atk_lost < attacker_models) & (def_wounds == atk_wounds) & (def_attacks > 0)
+    probs = np.where(tied, 0.0, atk_wound_dist[:, None] * def_table[def_attacks[:, 0]])
+    cells = atk_lost * (defender_models + 1) + def_lost
+    losses += np.bincount(cells.ravel(), weights=probs.ravel(), minlength=losses.size).reshape(losses.shape)
+
+    total = losses.sum()
+    if total == 0:
+        losses[0, 0] = 1.0
+    else:
+        losses /= total
+    losses.setflags(write=False)
+    return losses
@@ -0,0 +1,200 @@
+"""Validated, indexed unit catalogs loaded from one or more JSON files."""
+
+import contextlib
+import copy
+import hashlib
+import json
+import marshal
+import os
+import tempfile
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from vonsneg.rules.units import BaseUnit, unit_from_dict
+from vonsneg.rules.weapons import BaseWeapon
+
+# Bump when the parsed form changes so stale snapshots are rebuilt
+SNAPSHOT_VERSION = 3
+
+REQUIRED_FIELDS = {"name": str, "type": str, "models": int, "base_size": str, "stats": dict, "traits": list}
+REQUIRED_STATS = ("A", "I", "V")
+
+# Parsed entries of every file loaded by this process, keyed by path
+_LOADED: dict[Path, tuple[tuple[int, int], list[dict]]] = {}
+
+
+class CatalogError(ValueError):
+    """Raised when a unit data file is malformed."""
+
+
+def validate_entry(entry: dict, source: str) -> dict:
+    """Check a unit entry has every field the simulators read, with the right types."""
+    if not isinstance(entry, dict):
+        raise CatalogError(f"{source}: expected an object, got {type(entry).__name__}.")
+    for name, expected in REQUIRED_FIELDS.items():
+        value = entry.get(name)
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise CatalogError(f"{source}: '{name}' must be {expected.__name__}, got {value!r}.")
+    if entry["models"] < 1:
+        raise CatalogError(f"{source}: 'models' must be at least 1, got {entry['models']}.")
+    for stat in REQUIRED_STATS:
+        if stat not in entry["stats"]:
+            raise CatalogError(f"{source}: missing stat '{stat}'.")
+    for stat, value in entry["stats"].items():
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise CatalogError(f"{source}: stat '{stat}' must be int, got {value!r}.")
+    if not all(isinstance(trait, str) for trait in entry["traits"]):
+        raise CatalogError(f"{source}: 'traits' must be a list of strings.")
+    return entry
+
+
+def parse_units(raw: bytes, source: str) -> list[dict]:
+    """Parse and validate the ``units`` list of a unit data file."""
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise CatalogError(f"{source}: invalid JSON ({e}).") from e
+    if not isinstance(data, dict) or not isinstance(data.get("units"), list):
+        raise CatalogError(f"{source}: expected an object with a 'units' list.")
+    return [validate_entry(entry, f"{source}, unit {index}") for index, entry in enumerate(data["units"])]
+
+
+def cache_dir() -> Path:
+    """Directory the package keeps its own files in: ``$VONSNEG_CACHE_DIR``, else the user cache directory."""
+    configured = os.environ.get("VONSNEG_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "vonsneg"
+
+
+def snapshot_path(path: str | Path) -> Path:
+    """Where the validated snapshot of a unit data file is kept, named after the file's resolved path."""
+    key = hashlib.sha256(str(Path(path).resolve()).encode()).hexdigest()[:32]
+    return cache_dir() / "catalog" / f"{key}.bin"
+
+
+def load_entries(path: str | Path, snapshot: bool = True) -> list[dict]:
+    """Load the validated unit entries of one file, reusing earlier work where possible.
+
+    Entries are kept in memory for the life of the process and, with ``snapshot``,
+    saved already validated in :mod:`marshal` form in :func:`cache_dir`, which
+    loads several times faster than parsing the JSON. Both are reused while the
+    file's modification time and size are unchanged; a snapshot whose file was
+    touched but not edited is recognised by the content hash and refreshed.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    loaded = _LOADED.get(path)
+    if loaded is not None and loaded[0] == stamp:
+        return loaded[1]
+
+    cached = _read_snapshot(snapshot_path(path)) if snapshot else None
+    if cached is not None and cached["stamp"] == stamp:
+        entries = cached["entries"]
+    else:
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached is not None and cached["digest"] == digest:
+            entries = cached["entries"]
+        else:
+            entries = parse_units(raw, str(path))
+        if snapshot:
+            _write_snapshot(snapshot_path(path), {"stamp": stamp, "digest": digest, "entries": entries})
+
+    _LOADED[path] = (stamp, entries)
+    return entries
+
+
+def _read_snapshot(path: Path) -> dict | None:
+    try:
+        version, stamp, digest, entries = marshal.loads(path.read_bytes())
+        valid = version == SNAPSHOT_VERSION and isinstance(entries, list)
+        stamp = tuple(stamp)
+    except Exception:  # noqa: BLE001
+        # A missing, truncated or foreign snapshot only means parsing the file again
+        return None
+    return {"stamp": stamp, "digest": digest, "entries": entries} if valid else None
+
+
+def _write_snapshot(path: Path, data: dict) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError:
+        return  # An unwritable cache directory just means no snapshot
+    # Swap the finished file in, so concurrent readers never see half a snapshot
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(marshal.dumps((SNAPSHOT_VERSION, data["stamp"], data["digest"], data["entries"])))
+        os.replace(temporary, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(temporary)
+
+
+class UnitCatalog:
+    """Unit entries from one or more data files, indexed by name, type and trait.
+
+    Names are unique across all files and every lookup is case-insensitive.
+    """
+
+    def __init__(self, entries: Iterable[dict] = ()):
+        self.entries: dict[str, dict] = {}
+        self._by_type: dict[str, list[str]] = defaultdict(list)
+        self._by_trait: dict[str, list[str]] = defaultdict(list)
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def load(cls, *paths: str | Path, snapshot: bool = True) -> "UnitCatalog":
+        """Load and merge unit data files, such as the core units and faction files.
+
+        The catalog gets its own copy of every entry, so changing it never reaches
+        the entries shared with later loads.
+        """
+        catalog = cls()
+        for path in paths:
+            for entry in load_entries(path, snapshot):
+                catalog.add(copy.deepcopy(entry), str(path))
+        return catalog
+
+    def add(self, entry: dict, source: str = "catalog") -> None:
+        """Validate an entry and index it."""
+        validate_entry(entry, source)
+        key = entry["name"].lower()
+        if key in self.entries:
+            raise CatalogError(f"{source}: duplicate unit '{entry['name']}'.")
+        self.entries[key] = entry
+        self._by_type[entry["type"].lower()].append(key)
+        for trait in entry["traits"]:
+            self._by_trait[trait.lower()].append(key)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def get(self, name: str) -> dict:
+        """Return the raw entry of a unit."""
+        try:
+            return self.entries[name.lower()]
+        except KeyError:
+            raise KeyError(f"Unit '{name}' not found.") from None
+
+    def of_type(self, unit_type: str) -> list[str]:
+        """Names of every unit of a type, such as "Follower"."""
+        return list(self._by_type.get(unit_type.lower(), ()))
+
+    def with_trait(self, trait: str) -> list[str]:
+        """Names of every unit with a trait, such as "Skirmish"."""
+        return list(self._by_trait.get(trait.lower(), ()))
+
+    def unit(self, name: str, weapon: BaseWeapon | None = None) -> BaseUnit:
+        """Build a fresh BaseUnit that can be changed without touching the catalog."""
+        return unit_from_dict(self.get(name), weapon)
@@ -0,0 +1,223 @@
+"""Multi-step engagements between two units with persistent casualties and powder smoke.
+
+An engagement tracks a probability distribution over states (models left on
+each side and whether each side carries a powder smoke token) and pushes it
+through a sequence of actions: shooting volleys, charges, melee rounds and
+reloads. Each action is a sparse transition from a state to the states it can
+lead to, computed once per distinct state, and identical states are merged
+after every step so the state space stays bounded by the unit sizes.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from vonsneg.dice.distribution import Distribution
+from vonsneg.instrumentation import instrumented
+from vonsneg.rules.bout import BoutSide, bout_casualties
+from vonsneg.rules.shooting import casualty_pmf
+from vonsneg.rules.units import BaseUnit
+
+SIDES = ("attacker", "defender")
+
+
+@dataclass(frozen=True)
+class EngagementState:
+    """Models left on each side and their powder smoke tokens."""
+
+    attacker_models: int
+    defender_models: int
+    attacker_smoke: bool = False
+    defender_smoke: bool = False
+
+    def models(self, side: str) -> int:
+        return getattr(self, f"{side}_models")
+
+    def smoke(self, side: str) -> bool:
+        return getattr(self, f"{side}_smoke")
+
+
+@dataclass(frozen=True)
+class Volley:
+    """``side`` shoots at the other side, which stands and shoots back if it can."""
+
+    side: str = "attacker"
+
+
+@dataclass(frozen=True)
+class Charge:
+    """``side`` charges: the target stands and shoots, then ``side`` strikes first in melee."""
+
+    side: str = "attacker"
+
+
+@dataclass(frozen=True)
+class MeleeRound:
+    """A further round of an ongoing melee, with ``side`` striking first."""
+
+    side: str = "attacker"
+
+
+@dataclass(frozen=True)
+class Reload:
+    """``side`` clears its powder smoke token."""
+
+    side: str = "attacker"
+
+
+Action = Volley | Charge | MeleeRound | Reload
+
+
+def _other(side: str) -> str:
+    return SIDES[1 - SIDES.index(side)]
+
+
+@dataclass(frozen=True)
+class EngagementResult:
+    """Distribution over the states an engagement can end in."""
+
+    states: dict[EngagementState, float]
+
+    def models_distribution(self, side: str) -> Distribution:
+        """Distribution of the models ``side`` has left."""
+        models = defaultdict(float)
+        for state, prob in self.states.items():
+            models[state.models(side)] += prob
+        return Distribution.from_dict(models)
+
+    def expected_models(self, side: str) -> float:
+        """Expected number of models ``side`` has left."""
+        return self.models_distribution(side).mean()
+
+    def wiped_out(self, side: str) -> float:
+        """Probability that ``side`` has no models left."""
+        return sum(prob for state, prob in self.states.items() if state.models(side) == 0)
+
+
+class EngagementSimulator:
+    """Resolves a sequence of actions between two units over a distribution of states.
+
+    Unit stats and weapons are read once when the simulator is created.
+    """
+
+    def __init__(self, attacker: BaseUnit, defender: BaseUnit):
+        self.units = {"attacker": attacker, "defender": defender}
+        self.profiles = {"attacker": attacker.profile(), "defender": defender.profile()}
+
+    def initial_state(self) -> EngagementState:
+        """The state described by the units, including smoke tokens in ``BaseUnit.state``."""
+        attacker, defender = self.units["attacker"], self.units["defender"]
+        return EngagementState(
+            attacker.models,
+            defender.models,
+            bool(attacker.state.get("smoke", False)),
+            bool(defender.state.get("smoke", False)),
+        )
+
+    @instrumented("engagement.simulate")
+    def simulate(self, actions: Iterable[Action], initial: EngagementState | None = None) -> EngagementResult:
+        """Apply ``actions`` in order and return the distribution of final states."""
+        states = {initial or self.initial_state(): 1.0}
+        for action in actions:
+            states = self.step(states, action)
+        return EngagementResult(states)
+
+    def step(self, states: dict[EngagementState, float], action: Action) -> dict[EngagementState, float]:
+        """Push a state distribution through one action, merging identical states."""
+        next_states = defaultdict(float)
+        for state, prob in states.items():
+            for next_state, p_next in self.transitions(state, action).items():
+                next_states[next_state] += prob * p_next
+        return dict(next_states)
+
+    def transitions(self, state: EngagementState, action: Action) -> dict[EngagementState, float]:
+        """Return the sparse transition row of ``action`` from ``state``."""
+        if state.attacker_models == 0 or state.defender_models == 0:
+            return {state: 1.0}
+        if isinstance(action, Reload):
+            return {replace(state, **{f"{action.side}_smoke": False}): 1.0}
+        if isinstance(action, Volley):
+            return self._volley(state, action.side)
+        if isinstance(action, Charge):
+            return self._charge(state, action.side)
+        if isinstance(action, MeleeRound):
+            return self._melee(state, action.side)
+        raise TypeError(f"Unknown action {action!r}.")
+
+    def _can_fire(self, state: EngagementState, side: str) -> bool:
+        profile = self.profiles[side]
+        return profile.can_shoot and not (profile.black_powder and state.smoke(side))
+
+    def _fired(self, state: EngagementState, side: str) -> EngagementState:
+        if self.profiles[side].black_powder:
+            return replace(state, **{f"{side}_smoke": True})
+        return state
+
+    def _casualties(self, state: EngagementState, side: str) -> np.ndarray:
+        """Distribution of models ``side`` kills by shooting, indexed by models lost."""
+        target = _other(side)
+        return casualty_pmf(self.profiles[side], self.profiles[target], state.models(side), state.models(target))
+
+    def _volley(self, state: EngagementState, side: str) -> dict[EngagementState, float]:
+        target = _other(side)
+        if not self._can_fire(state, side):
+            return {state: 1.0}
+        fired = self._fired(state, side)
+        target_lost = self._casualties(state, side)
+        side_lost = np.array([1.0])
+        if self._can_fire(state, target):
+            # Both sides fire simultaneously
+            fired = self._fired(fired, target)
+            side_lost = self._casualties(state, target)
+
+        transitions = {}
+        for lost, p_lost in enumerate(side_lost.tolist()):
+            for killed, p_killed in enumerate(target_lost.tolist()):
+                if p_lost * p_killed > 0:
+                    next_state = replace(
+                        fired,
+                        **{
+                            f"{side}_models": state.models(side) - lost,
+                            f"{target}_models": state.models(target) - killed,
+                        },
+                    )
+                    transitions[next_state] = p_lost * p_killed
+        return transitions
+
+    def _charge(self, state: EngagementState, side: str) -> dict[EngagementState, float]:
+        target = _other(side)
+        if not self._can_fire(state, target):
+            return self._melee(state, side, charging=True)
+
+        # Stand and shoot, then melee with the survivors
+        transitions = defaultdict(float)
+        fired = self._fired(state, target)
+        for lost, p_lost in enumerate(self._casualties(state, target).tolist()):
+            if p_lost == 0:
+                continue
+            survivors = replace(fired, **{f"{side}_models": state.models(side) - lost})
+            for next_state, p_next in self._melee(survivors, side, charging=True).items():
+                transitions[next_state] += p_lost * p_next
+        return dict(transitions)
+
+    def _melee(self, state: EngagementState, side: str, charging: bool = False) -> dict[EngagementState, float]:
+        target = _other(side)
+        losses = bout_casualties(
+            BoutSide.from_profile(self.profiles[side], charging),
+            BoutSide.from_profile(self.profiles[target]),
+            state.models(side),
+            state.models(target),
+        )
+        transitions = {}
+        for lost, killed in zip(*np.nonzero(losses), strict=True):
+            next_state = replace(
+                state,
+                **{
+                    f"{side}_models": state.models(side) - int(lost),
+                    f"{target}_models": state.models(target) - int(killed),
+                },
+            )
+            transitions[next_state] = float(losses[lost, killed])
+        return transitions
@@ -0,0 +1,148 @@
+"""Precomputed melee and shooting results for unit and weapon pairings."""
+
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from vonsneg.dice.distribution import Distribution
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.shooting import ShootingSimulator
+from vonsneg.rules.store import ENGINE_VERSION
+from vonsneg.rules.units import BaseUnit, unit_from_dict
+from vonsneg.rules.weapons import WEAPONS, BaseWeapon
+
+# Bump whenever the layout or the key format of saved tables changes
+FORMAT_VERSION = 2
+
+SIMULATORS = {
+    "melee": MeleeSimulator,
+    "shooting": ShootingSimulator,
+}
+
+
+def unit_key(unit: BaseUnit) -> str:
+    """Identify a unit by everything the simulators read from it."""
+    stats = ",".join(f"{stat}{value}" for stat, value in sorted(unit.stats.items()))
+    traits = ",".join(sorted(unit.traits))
+    shoots = "shoots" if unit.weapon.can_shoot() else "holds"
+    return f"{unit.name.lower()}/{unit.models}/{stats}/{traits}/{unit.weapon.name.lower()}/{shoots}"
+
+
+def matchup_key(kind: str, attacker: BaseUnit, defender: BaseUnit) -> str:
+    """Identify a matchup between two armed units."""
+    return f"{kind}|{unit_key(attacker)}|{unit_key(defender)}"
+
+
+def iter_matchups(
+    unit_dicts: dict[str, dict],
+    weapons: dict[str, type[BaseWeapon]] = WEAPONS,
+) -> Iterable[tuple[str, BaseUnit, BaseUnit]]:
+    """Yield (kind, attacker, defender) for every unit, weapon and simulator pairing."""
+    armed = [unit_from_dict(entry, weapon()) for entry in unit_dicts.values() for weapon in weapons.values()]
+    for kind in SIMULATORS:
+        for attacker in armed:
+            for defender in armed:
+                yield kind, attacker, defender
+
+
+class MatchupTable:
+    """Result distributions indexed by matchup key.
+
+    On disk this is an uncompressed ``.npz`` holding its :data:`FORMAT_VERSION`
+    and the :data:`~vonsneg.rules.store.ENGINE_VERSION` that computed it, the
+    keys, the offset and length of each distribution, and every probability
+    concatenated into a single float64 array.
+    """
+
+    def __init__(self, keys: Iterable[str] = (), offsets=(), lengths=(), probs=()):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.starts = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+        self.probs = np.asarray(probs, dtype=np.float64)
+        self.index = {key: row for row, key in enumerate(keys)}
+        self._appended: dict[str, Distribution] = {}
+
+    @classmethod
+    def build(cls, matchups: Iterable[tuple[str, BaseUnit, BaseUnit]]) -> "MatchupTable":
+        """Simulate every (kind, attacker, defender) matchup into a new table."""
+        table = cls()
+        for kind, attacker, defender in matchups:
+            table.add(kind, attacker, defender)
+        return table
+
+    @classmethod
+    def load(cls, path: str | Path) -> "MatchupTable":
+        """Load a table written by :meth:`save`.
+
+        :raises ValueError: If the table was saved in another format, whose keys would never match,
+            or by another engine version, whose results may be stale
+        """
+        with np.load(path) as data:
+            # Tables from before the version was recorded are version 1
+            version = int(data["format_version"]) if "format_version" in data else 1
+            if version != FORMAT_VERSION:
+                raise ValueError(
+                    f"Matchup table '{path}' has format version {version}, expected {FORMAT_VERSION}; rebuild it."
+                )
+            engine = int(data["engine_version"]) if "engine_version" in data else None
+            if engine != ENGINE_VERSION:
+                raise ValueError(
+                    f"Matchup table '{path}' was built by engine version {engine}, expected {ENGINE_VERSION}; rebuild it."
+                )
+            return cls(data["keys"].tolist(), data["offsets"], data["lengths"], data["probs"])
+
+    def save(self, path: str | Path) -> None:
+        """Write the table, including appended entries, to ``path``."""
+        keys, dists = zip(*self.items(), strict=True) if len(self) else ((), ())
+        np.savez(
+            path,
+            format_version=np.int64(FORMAT_VERSION),
+            engine_version=np.int64(ENGINE_VERSION),
+            keys=np.array(keys, dtype=str),
+            offsets=np.array([dist.offset for dist in dists], dtype=np.int64),
+            lengths=np.array([len(dist.probs) for dist in dists], dtype=np.int64),
+            probs=np.concatenate([dist.probs for dist in dists]) if dists else np.zeros(0),
+        )
+
+    def __len__(self) -> int:
+        return len(self.index) + len(self._appended)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index or key in self._appended
+
+    def _row(self, row: int) -> Distribution:
+        return Distribution(self.probs[self.starts[row] : self.starts[row + 1]], int(self.offsets[row]))
+
+    def items(self) -> Iterable[tuple[str, Distribution]]:
+        for key, row in self.index.items():
+            yield key, self._row(row)
+        yield from self._appended.items()
+
+    def lookup(self, kind: str, attacker: BaseUnit, defender: BaseUnit) -> Distribution | None:
+        """Return the stored distribution for a matchup, or None if it was never computed."""
+        key = matchup_key(kind, attacker, defender)
+        row = self.index.get(key)
+        if row is not None:
+            return self._row(row)
+        return self._appended.get(key)
+
+    def add(self, kind: str, attacker: BaseUnit, defender: BaseUnit) -> Distribution:
+        """Simulate a matchup and keep the result in the table, replacing any stored one."""
+        dist = SIMULATORS[kind](attacker, defender).simulate_distribution()
+        key = matchup_key(kind, attacker, defender)
+        # The loaded row is dropped rather than overwritten, so each key is saved once
+        self.index.pop(key, None)
+        self._appended[key] = dist
+        return dist
+
+    def get(self, kind: str, attacker: BaseUnit, defender: BaseUnit, append: bool = False) -> Distribution:
+        """Serve a matchup from the table, falling back to a live simulation.
+
+        :param append: Keep cold results so the next :meth:`save` includes them
+        """
+        dist = self.lookup(kind, attacker, defender)
+        if dist is not None:
+            return dist
+        if append:
+            return self.add(kind, attacker, defender)
+        return SIMULATORS[kind](attacker, defender).simulate_distribution()
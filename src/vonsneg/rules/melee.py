@@ -1,9 +1,23 @@
 from collections import defaultdict
-from collections.abc import Callable
-from functools import cache
+from collections.abc import Callable, Mapping
+from fractions import Fraction
+from typing import TYPE_CHECKING
 
-from vonsneg.dice.roller import Roller
-from vonsneg.rules.units import BaseUnit
+import numpy as np
+
+from vonsneg.dice.cache import lru_cache
+from vonsneg.dice.compound import wound_pmf
+from vonsneg.dice.distribution import Distribution
+from vonsneg.dice.exact import check_numeric, counts_to_mapping, wound_counts
+from vonsneg.instrumentation import instrumented
+from vonsneg.rules.bout import BoutSide, bout_table, exact_solve_bout, solve_bout
+from vonsneg.rules.engagement import Charge, EngagementSimulator, EngagementState
+from vonsneg.rules.queries import ResultQueries
+from vonsneg.rules.shooting import shooting_targets
+from vonsneg.rules.units import BaseUnit, UnitProfile
+
+if TYPE_CHECKING:
+    from vonsneg.rules.store import ResultStore
 
 
 def combine_distributions(
@@ -73,83 +87,28 @@ class MeleeCombatSimulator:
             defender_wounds=defender.stats.get("W", 1),
         )
 
-    @cache
-    def wound_distribution(self, attacks: int, to_hit: int, to_save: int) -> dict[int, float]:
-        hit_dist = Roller(attacks, to_hit).prob_dict()
-        wound_dist = defaultdict(float)
-        for hits, p_hit in hit_dist.items():
-            if hits == 0:
-                wound_dist[0] += float(p_hit)
-                continue
-            save_dist = Roller(hits, to_save).prob_dict()
-            for saves, p_save in save_dist.items():
-                wounds = hits - saves
-                wound_dist[wounds] += float(p_hit) * float(p_save)
-        return dict(wound_dist)
-
-    def result_distribution(self, max_depth=6):
-        def resolve_bout(attacker_models, defender_models, depth=0, weight=1.0):
-            if attacker_models <= 0:
-                return {-1: weight}  # attacker wiped out
-            if defender_models <= 0:
-                return {1: weight}  # defender wiped out
-
-            atk_attacks = attacker_models * self.attacker["attacks_per_model"]
-            atk_wound_dist = self.wound_distribution(
-                atk_attacks,
-                self.attacker["to_hit"],
-                self.defender["to_save"],
-            )
+    def wound_distribution(self, attacks: int, to_hit: int, to_save: int) -> Distribution:
+        return Distribution(wound_pmf(attacks, to_hit, to_save))
 
-            outcome_dist = defaultdict(float)
-
-            for atk_wounds, p_hit in atk_wound_dist.items():
-                def_remaining = max(defender_models - (atk_wounds // self.defender["wounds_per_model"]), 0)
-                def_attacks = def_remaining * self.defender["attacks_per_model"]
-
-                if def_attacks == 0:
-                    outcome_dist[atk_wounds] += weight * p_hit
-                    continue
-
-                def_wound_dist = self.wound_distribution(
-                    def_attacks,
-                    self.defender["to_hit"],
-                    self.attacker["to_save"],
-                )
-
-                for def_wounds, p_def in def_wound_dist.items():
-                    if weight * p_hit * p_def < 1e-12:
-                        continue
-                    total_prob = weight * p_hit * p_def
-                    atk_remaining = max(attacker_models - (def_wounds // self.attacker["wounds_per_model"]), 0)
-
-                    if def_remaining <= 0:
-                        outcome_dist[atk_wounds] += total_prob
-                    elif atk_remaining <= 0:
-                        outcome_dist[-def_wounds] += total_prob
-                    elif atk_wounds > def_wounds:
-                        delta = atk_wounds - def_wounds
-                        outcome_dist[delta] += total_prob
-                    elif def_wounds > atk_wounds:
-                        delta = def_wounds - atk_wounds
-                        outcome_dist[-delta] += total_prob
-                    elif depth < max_depth:
-                        sub_result = resolve_bout(attacker_models, defender_models, depth + 1, total_prob)
-                        if sub_result is not None:
-                            for k, v in sub_result.items():
-                                outcome_dist[k] += v
-                    else:
-                        outcome_dist[1] += total_prob * 0.5
-                        outcome_dist[-1] += total_prob * 0.5
-
-            return dict(outcome_dist)
-
-        return dict(resolve_bout(self.attacker["models"], self.defender["models"]))
+    def result_distribution(self, **kwargs) -> dict[int, float]:
+        attacker = BoutSide(
+            self.attacker["attacks_per_model"],
+            self.attacker["to_hit"],
+            self.attacker["to_save"],
+            self.attacker["wounds_per_model"],
+        )
+        defender = BoutSide(
+            self.defender["attacks_per_model"],
+            self.defender["to_hit"],
+            self.defender["to_save"],
+            self.defender["wounds_per_model"],
+        )
+        return solve_bout(attacker, defender, self.attacker["models"], self.defender["models"]).to_dict()
 
     def describe(self) -> str:
-        result = self.result_distribution()
-        win = sum(p for k, p in result.items() if k > 0)
-        lose = sum(p for k, p in result.items() if k < 0)
+        result = Distribution.from_dict(self.result_distribution())
+        win = result.win()
+        lose = result.lose()
 
         bar_width = 30
         win_bar = int(win * bar_width)
@@ -169,7 +128,68 @@ class MeleeCombatSimulator:
         return "\n".join(lines)
 
 
-class MeleeSimulator:
+@lru_cache(maxsize=1024)
+@instrumented("melee_distribution")
+def melee_distribution(
+    attacker: BoutSide,
+    defender: BoutSide,
+    attacker_models: int,
+    defender_models: int,
+    stand_and_shoot: tuple[int, int] | None = None,
+) -> Distribution:
+    """Return the wound delta distribution of a charge (positive = attacker wins).
+
+    :param stand_and_shoot: The defender's (inaccuracy, save target) if it stands and shoots
+    """
+    if stand_and_shoot is None:
+        return solve_bout(attacker, defender, attacker_models, defender_models)
+
+    # Calculate remaining attacker models after each stand and shoot outcome
+    stand_and_shoot_dist = Distribution(wound_pmf(defender_models, *stand_and_shoot))
+    stand_wounds = stand_and_shoot_dist.outcomes()
+    remaining_attacker_models = np.maximum(attacker_models - stand_wounds // attacker.wounds, 0)
+
+    # Melee for every remaining model count at once (an attacker wiped out by
+    # stand and shoot has a melee delta of 0), weighted by its stand and shoot outcome
+    table, low = bout_table(attacker, defender, attacker_models, defender_models)
+    weighted = stand_and_shoot_dist.probs[:, None] * table[remaining_attacker_models]
+
+    # Account for the wounds the defender already inflicted with stand and shoot
+    max_wounds = stand_and_shoot_dist.high
+    columns = np.arange(table.shape[1])[None, :] - stand_wounds[:, None] + max_wounds
+    return Distribution(np.bincount(columns.ravel(), weights=weighted.ravel()), low - max_wounds)
+
+
+@lru_cache(maxsize=1024)
+@instrumented("exact_melee_distribution")
+def exact_melee_distribution(
+    attacker: BoutSide,
+    defender: BoutSide,
+    attacker_models: int,
+    defender_models: int,
+    stand_and_shoot: tuple[int, int] | None = None,
+) -> Mapping[int, Fraction]:
+    """Exact counterpart of :func:`melee_distribution` as a read-only {wound_delta: Fraction} mapping."""
+    if stand_and_shoot is None:
+        return exact_solve_bout(attacker, defender, attacker_models, defender_models)
+
+    shot_counts, denominator = wound_counts(defender_models, *stand_and_shoot)
+    result = defaultdict(Fraction)
+    for stand_wounds, count in enumerate(shot_counts):
+        if count == 0:
+            continue
+        remaining_attacker_models = max(attacker_models - stand_wounds // attacker.wounds, 0)
+        if remaining_attacker_models == 0:
+            # Wiped out before reaching combat
+            result[-stand_wounds] += Fraction(count, denominator)
+            continue
+        bout = exact_solve_bout(attacker, defender, remaining_attacker_models, defender_models)
+        for delta, prob in bout.items():
+            result[delta - stand_wounds] += Fraction(count, denominator) * prob
+    return counts_to_mapping(result, 1)
+
+
+class MeleeSimulator(ResultQueries):
     """Simulates melee combat in Turnip28.
     Provides a consistent interface: can_engage, simulate, get_result, describe.
     Handles stand and shoot reactions before melee combat.
@@ -178,22 +198,6 @@ class MeleeSimulator:
     def __init__(self, attacker: BaseUnit, defender: BaseUnit):
         self.attacker = attacker
         self.defender = defender
-        self._result_cache = None
-
-    @cache
-    def _wound_distribution(self, attacks: int, to_hit: int, to_save: int) -> dict[int, float]:
-        """Calculate wound distribution for a given number of attacks."""
-        hit_dist = Roller(attacks, to_hit).prob_dict()
-        wound_dist = defaultdict(float)
-        for hits, p_hit in hit_dist.items():
-            if hits == 0:
-                wound_dist[0] += float(p_hit)
-                continue
-            save_dist = Roller(hits, to_save).prob_dict()
-            for saves, p_save in save_dist.items():
-                wounds = hits - saves
-                wound_dist[wounds] += float(p_hit) * float(p_save)
-        return dict(wound_dist)
 
     def _can_stand_and_shoot(self) -> bool:
         """Check if the defender can stand and shoot back."""
@@ -201,174 +205,144 @@ class MeleeSimulator:
             return self.defender.weapon.can_shoot()
         return False
 
-    def _calculate_stand_and_shoot_wounds(self) -> dict[int, float]:
+    @instrumented("melee.stand_and_shoot")
+    def _calculate_stand_and_shoot_wounds(self) -> Distribution:
         """Calculate the wound distribution from defender's stand and shoot."""
         if not self._can_stand_and_shoot():
-            return {0: 1.0}
-
-        # Calculate defender's inaccuracy (with Skirmish modifier)
-        defender_inaccuracy = self.defender.inaccuracy()
-        if "Skirmish" in self.attacker.traits:
-            defender_inaccuracy += 2
+            return Distribution.point(0)
 
         # Defender's stand and shoot
-        defender_roller = Roller(num_dice=self.defender.models, target=defender_inaccuracy)
-        defender_hit_dist = defender_roller.prob_dict()
-
-        # Calculate defender's to-wound target with missile weapon modifier
-        defender_to_wound_target = self.attacker.stats.get("V", 6)
-        if hasattr(self.defender.weapon, "shooting_save_mod"):
-            defender_to_wound_target += self.defender.weapon.shooting_save_mod
-
-        defender_wound_dist = defaultdict(float)
-        for hits, prob_hit in defender_hit_dist.items():
-            if hits > 0:
-                # The to_wound_target is actually the save target
-                save_roller = Roller(num_dice=hits, target=defender_to_wound_target)
-                save_dist = save_roller.prob_dict()
-                for saves, prob_save in save_dist.items():
-                    wounds = hits - saves  # Failed saves become wounds
-                    defender_wound_dist[wounds] += prob_hit * prob_save
-            else:
-                defender_wound_dist[0] += prob_hit
-
-        return dict(defender_wound_dist)
+        attacker, defender = self.profiles()
+        defender_inaccuracy, defender_to_wound_target = shooting_targets(defender, attacker)
+        return Distribution(wound_pmf(defender.models, defender_inaccuracy, defender_to_wound_target))
 
     def can_engage(self, **kwargs) -> bool:
         """Check if melee combat can proceed (both units must have models)."""
         return self.attacker.models > 0 and self.defender.models > 0
 
-    def simulate(self, max_depth: int = 6, **kwargs) -> dict[int, float]:
+    def simulate(self, numeric: str = "float", **kwargs) -> dict[int, float] | dict[int, Fraction]:
         """Simulate melee combat with stand and shoot before combat begins.
         Returns a {wound_delta: probability} distribution (positive = attacker wins).
         Does not mutate input units.
+
+        :param numeric: "float" for float64 probabilities, or "exact" for :class:`~fractions.Fraction`
+            probabilities from integer-count tables, for verification and published odds
         """
+        check_numeric(numeric, kwargs)
+        if numeric == "exact":
+            if not self.can_engage():
+                return {0: Fraction(1)}
+            return dict(exact_melee_distribution(*self._inputs()))
+        return self.simulate_distribution(**kwargs).to_dict()
+
+    @instrumented("melee.simulate")
+    def simulate_distribution(self, **kwargs) -> Distribution:
+        """Simulate melee combat and return the wound delta as a Distribution."""
         if not self.can_engage():
-            return {0: 1.0}
-
-        # Handle stand and shoot first
-        stand_and_shoot_dist = self._calculate_stand_and_shoot_wounds()
+            return Distribution.point(0)
+
+        return melee_distribution(*self._inputs())
+
+    def profiles(self) -> tuple[UnitProfile, UnitProfile]:
+        """Snapshot the attacker and defender as they are now."""
+        return self.attacker.profile(), self.defender.profile()
+
+    def _inputs(self) -> tuple:
+        """Everything the melee result depends on, as the key of :func:`melee_distribution`."""
+        attacker, defender = self.profiles()
+        stand_and_shoot = shooting_targets(defender, attacker) if defender.can_shoot else None
+        return (
+            BoutSide.from_profile(attacker, charging=True),
+            BoutSide.from_profile(defender),
+            attacker.models,
+            defender.models,
+            stand_and_shoot,
+        )
 
-        # If no stand and shoot, proceed with normal melee
-        if not self._can_stand_and_shoot():
-            return self._simulate_melee_only(max_depth)
-
-        # Combine stand and shoot with melee outcomes
-        final_dist = defaultdict(float)
-
-        for stand_wounds, stand_prob in stand_and_shoot_dist.items():
-            # Calculate remaining attacker models after stand and shoot
-            attacker_casualties = stand_wounds // self.attacker.stats.get("W", 1)
-            remaining_attacker_models = max(self.attacker.models - attacker_casualties, 0)
-
-            if remaining_attacker_models == 0:
-                # Attacker wiped out by stand and shoot
-                final_dist[-stand_wounds] += stand_prob
-            else:
-                # Proceed with melee using remaining models
-                melee_dist = self._simulate_melee_only(max_depth, attacker_models=remaining_attacker_models)
-
-                for melee_delta, melee_prob in melee_dist.items():
-                    # Combine stand and shoot wounds with melee delta
-                    # Positive melee_delta means attacker wins melee
-                    # We need to account for the wounds already inflicted by stand and shoot
-                    if melee_delta > 0:
-                        # Attacker wins melee, but defender already inflicted stand_wounds
-                        net_delta = melee_delta - stand_wounds
-                        final_dist[net_delta] += stand_prob * melee_prob
-                    else:
-                        # Defender wins melee, plus the stand and shoot wounds
-                        net_delta = melee_delta - stand_wounds
-                        final_dist[net_delta] += stand_prob * melee_prob
-
-        return dict(final_dist)
-
-    def _simulate_melee_only(self, max_depth: int = 6, attacker_models: int = None) -> dict[int, float]:
+    @instrumented("melee.bout_only")
+    def _simulate_melee_only(self, attacker_models: int | None = None) -> Distribution:
         """Simulate melee combat without stand and shoot.
         Returns a {wound_delta: probability} distribution (positive = attacker wins).
         """
         if attacker_models is None:
             attacker_models = self.attacker.models
 
-        def resolve_bout(attacker_models, defender_models, depth=0, weight=1.0):
-            if attacker_models <= 0:
-                return {-1: weight}
-            if defender_models <= 0:
-                return {1: weight}
-            atk_attacks = attacker_models * self.attacker.stats["A"]
-            atk_wound_dist = self._wound_distribution(
-                atk_attacks,
-                self.attacker.stats["I"],
-                self.defender.stats["V"],
-            )
-            outcome_dist = defaultdict(float)
-            for atk_wounds, p_hit in atk_wound_dist.items():
-                def_remaining = max(defender_models - (atk_wounds // self.defender.stats.get("W", 1)), 0)
-                def_attacks = def_remaining * self.defender.stats["A"]
-                if def_attacks == 0:
-                    outcome_dist[atk_wounds] += weight * p_hit
-                    continue
-                def_wound_dist = self._wound_distribution(
-                    def_attacks,
-                    self.defender.stats["I"],
-                    self.attacker.stats["V"],
-                )
-                for def_wounds, p_def in def_wound_dist.items():
-                    if weight * p_hit * p_def < 1e-12:
-                        continue
-                    total_prob = weight * p_hit * p_def
-                    atk_remaining = max(attacker_models - (def_wounds // self.attacker.stats.get("W", 1)), 0)
-                    if def_remaining <= 0:
-                        outcome_dist[atk_wounds] += total_prob
-                    elif atk_remaining <= 0:
-                        outcome_dist[-def_wounds] += total_prob
-                    elif atk_wounds > def_wounds:
-                        delta = atk_wounds - def_wounds
-                        outcome_dist[delta] += total_prob
-                    elif def_wounds > atk_wounds:
-                        delta = def_wounds - atk_wounds
-                        outcome_dist[-delta] += total_prob
-                    elif depth < max_depth:
-                        sub_result = resolve_bout(attacker_models, defender_models, depth + 1, total_prob)
-                        if sub_result is not None:
-                            for k, v in sub_result.items():
-                                outcome_dist[k] += v
-                    else:
-                        outcome_dist[1] += total_prob * 0.5
-                        outcome_dist[-1] += total_prob * 0.5
-            return dict(outcome_dist)
-
-        return dict(resolve_bout(attacker_models, self.defender.models))
-
-    def get_result(self, **kwargs) -> dict[int, float]:
-        """Get cached result or run simulation."""
-        if self._result_cache is None:
-            self._result_cache = self.simulate(**kwargs)
-        return self._result_cache
+        return solve_bout(
+            BoutSide.from_unit(self.attacker, charging=True),
+            BoutSide.from_unit(self.defender),
+            attacker_models,
+            self.defender.models,
+        )
 
-    def describe(self) -> str:
-        """Generate a human-readable description of the melee outcome."""
-        result = self.get_result()
-        win = sum(p for k, p in result.items() if k > 0)
-        lose = sum(p for k, p in result.items() if k < 0)
+    def delta_bounds(self) -> tuple[int, int]:
+        """Smallest and largest wound delta the combat can produce."""
+        if not self.can_engage():
+            return 0, 0
+        attacker, defender = self.profiles()
+        low = -defender.models * defender.attacks - (defender.models if defender.can_shoot else 0)
+        # A bout that can never be decided is split between -1 and 1
+        return min(low, -1), max(attacker.models * attacker.attacks, 1)
+
+    def expected_casualties(self, side: str = "defender") -> float:
+        """Expected models ``side`` loses to stand and shoot and the bout, counting ``stats["W"]`` wounds per model."""
+        if not self.can_engage():
+            return 0.0
+        attacker, defender = self.profiles()
+        engagement = EngagementSimulator(self.attacker, self.defender)
+        result = engagement.simulate([Charge()], EngagementState(attacker.models, defender.models))
+        return getattr(self, side).models - result.expected_models(side)
+
+    def result_key(self) -> tuple:
+        """Everything the result depends on, as a hashable key for persistent caches."""
+        return ("melee", self.can_engage(), *self._inputs())
+
+    def get_distribution(self, store: "ResultStore | None" = None, **kwargs) -> Distribution:
+        """Get the result Distribution for the units as they are now.
+
+        Results are cached by their inputs rather than per simulator, so changing a
+        stat or weapon only recomputes the stages that depend on it.
+
+        :param store: Persistent store to serve the result from, and to keep it in on a miss
+        """
+        if store is not None:
+            return store.get_distribution(self)
+        return self.simulate_distribution(**kwargs)
+
+    def get_result(self, numeric: str = "float", **kwargs) -> dict[int, float] | dict[int, Fraction]:
+        """Get the result for the units as they are now, see :meth:`simulate` for ``numeric``.
+
+        Other arguments, such as ``store``, go to :meth:`get_distribution` and only apply to the float path.
+        """
+        if numeric != "float":
+            return self.simulate(numeric, **kwargs)
+        return self.get_distribution(**kwargs).to_dict()
+
+    def describe(self, store: "ResultStore | None" = None, result: Distribution | None = None) -> str:
+        """Generate a human-readable description of the melee outcome.
+
+        :param result: The result distribution, if already computed, so it isn't looked up again
+        """
+        if result is None:
+            result = self.get_distribution(store)
+        win = result.win()
+        lose = result.lose()
         bar_width = 30
         win_bar = int(win * bar_width)
         lose_bar = int(lose * bar_width)
         bar = f"{'█' * win_bar}{'▓' * lose_bar}".ljust(bar_width)
 
-        lines = [f"Melee: {self.attacker.name} → {self.defender.name}"]
+        attacker, defender = self.profiles()
+        lines = [f"Melee: {attacker.name} → {defender.name}"]
 
         # Add stand and shoot information if applicable
         if self._can_stand_and_shoot():
             stand_and_shoot_dist = self._calculate_stand_and_shoot_wounds()
-            expected_stand_wounds = sum(wounds * prob for wounds, prob in stand_and_shoot_dist.items())
-            defender_inaccuracy = self.defender.inaccuracy()
-            if "Skirmish" in self.attacker.traits:
-                defender_inaccuracy += 2
+            expected_stand_wounds = stand_and_shoot_dist.mean()
+            defender_inaccuracy, _ = shooting_targets(defender, attacker)
 
             lines.extend(
                 [
-                    f"Stand and Shoot: {self.defender.name} → {self.attacker.name}",
+                    f"Stand and Shoot: {defender.name} → {attacker.name}",
                     f"Defender inaccuracy: {defender_inaccuracy}",
                     f"Expected stand and shoot wounds: {expected_stand_wounds:.2f}",
                     "",
@@ -0,0 +1,162 @@
+"""Monte Carlo simulation of melee and shooting, batched over many engagements at once.
+
+These mirror the rules of MeleeSimulator and ShootingSimulator but roll dice
+instead of solving exactly, which makes them a cross-check for the exact
+engines and a fallback for rules that are impractical to solve analytically.
+"""
+
+from dataclasses import dataclass
+from math import sqrt
+from statistics import NormalDist
+
+import numpy as np
+
+from vonsneg.dice.binomial import die_probability, success_probability
+from vonsneg.dice.distribution import Distribution
+from vonsneg.rules.bout import BoutSide
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.shooting import ShootingSimulator, shooting_targets
+from vonsneg.rules.units import BaseUnit
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    """Wound deltas of every simulated engagement (positive = attacker wins)."""
+
+    samples: np.ndarray
+
+    @property
+    def trials(self) -> int:
+        return len(self.samples)
+
+    def distribution(self) -> Distribution:
+        """Return the observed frequency of each wound delta."""
+        low = int(self.samples.min())
+        return Distribution(np.bincount(self.samples - low) / self.trials, low)
+
+    def interval(self, successes: int, confidence: float = 0.95) -> tuple[float, float]:
+        """Wilson score interval for a proportion of ``successes`` out of all trials."""
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        n = self.trials
+        p = successes / n
+        denominator = 1 + z**2 / n
+        center = (p + z**2 / (2 * n)) / denominator
+        half_width = z * sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denominator
+        return max(center - half_width, 0.0), min(center + half_width, 1.0)
+
+    def probability_interval(self, outcome: int, confidence: float = 0.95) -> tuple[float, float]:
+        """Confidence interval for the probability of a single wound delta."""
+        return self.interval(int(np.count_nonzero(self.samples == outcome)), confidence)
+
+    def win_interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        """Confidence interval for the probability that the attacker wins."""
+        return self.interval(int(np.count_nonzero(self.samples > 0)), confidence)
+
+    def lose_interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        """Confidence interval for the probability that the attacker loses."""
+        return self.interval(int(np.count_nonzero(self.samples < 0)), confidence)
+
+    def mean_interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        """Normal-approximation confidence interval for the expected wound delta."""
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        mean = float(self.samples.mean())
+        half_width = z * float(self.samples.std(ddof=1)) / sqrt(self.trials)
+        return mean - half_width, mean + half_width
+
+
+def roll_wounds(
+    rng: np.random.Generator,
+    dice: np.ndarray,
+    to_hit: int,
+    to_save: int,
+    reroll: str | None = None,
+) -> np.ndarray:
+    """Roll ``dice`` to hit, then save every hit, and return the failed saves per engagement."""
+    hits = rng.binomial(dice, float(die_probability(to_hit, reroll)))
+    saves = rng.binomial(hits, float(success_probability(to_save)))
+    return hits - saves
+
+
+def resolve_bouts(
+    rng: np.random.Generator,
+    attacker: BoutSide,
+    defender: BoutSide,
+    attacker_models: np.ndarray,
+    defender_models: int,
+    max_rounds: int = 1000,
+) -> np.ndarray:
+    """Fight one bout per entry of ``attacker_models``, re-rolling ties, and return the wound deltas.
+
+    Bouts still tied after ``max_rounds`` are split evenly between the sides.
+    """
+    result = np.zeros(len(attacker_models), dtype=np.int64)
+    pending = np.flatnonzero(attacker_models > 0)
+    result[attacker_models <= 0] = -1
+
+    for _ in range(max_rounds):
+        if not len(pending):
+            break
+        models = attacker_models[pending]
+        atk_wounds = roll_wounds(rng, models * attacker.attacks, attacker.to_hit, defender.to_save, attacker.reroll)
+        def_remaining = np.maximum(defender_models - atk_wounds // defender.wounds, 0)
+        def_attacks = def_remaining * defender.attacks
+        def_wounds = roll_wounds(rng, def_attacks, defender.to_hit, attacker.to_save, defender.reroll)
+
+        struck_back = def_attacks > 0
+        atk_wiped = struck_back & (models - def_wounds // attacker.wounds <= 0)
+        outcome = np.where(atk_wiped, -def_wounds, atk_wounds - def_wounds)
+        tied = struck_back & ~atk_wiped & (atk_wounds == def_wounds)
+
+        result[pending[~tied]] = outcome[~tied]
+        pending = pending[tied]
+
+    result[pending] = rng.choice([-1, 1], size=len(pending))
+    return result
+
+
+def simulate_melee(
+    attacker: BaseUnit,
+    defender: BaseUnit,
+    trials: int = 1_000_000,
+    rng: np.random.Generator | None = None,
+) -> MonteCarloResult:
+    """Roll ``trials`` melee combats, including stand and shoot, between two units."""
+    rng = rng or np.random.default_rng()
+    simulator = MeleeSimulator(attacker, defender)
+    if not simulator.can_engage():
+        return MonteCarloResult(np.zeros(trials, dtype=np.int64))
+
+    attacker, defender = simulator.profiles()
+    attacker_side = BoutSide.from_profile(attacker, charging=True)
+    attacker_models = np.full(trials, attacker.models)
+    stand_wounds = np.zeros(trials, dtype=np.int64)
+    if defender.can_shoot:
+        inaccuracy, to_save = shooting_targets(defender, attacker)
+        stand_wounds = roll_wounds(rng, np.full(trials, defender.models), inaccuracy, to_save)
+        attacker_models = np.maximum(attacker_models - stand_wounds // attacker_side.wounds, 0)
+
+    melee = resolve_bouts(rng, attacker_side, BoutSide.from_profile(defender), attacker_models, defender.models)
+    # Attackers wiped out by stand and shoot never reach combat
+    melee[attacker_models == 0] = 0
+    return MonteCarloResult(melee - stand_wounds)
+
+
+def simulate_shooting(
+    attacker: BaseUnit,
+    defender: BaseUnit,
+    trials: int = 1_000_000,
+    rng: np.random.Generator | None = None,
+) -> MonteCarloResult:
+    """Roll ``trials`` shooting attacks, including simultaneous stand and shoot."""
+    rng = rng or np.random.default_rng()
+    simulator = ShootingSimulator(attacker, defender)
+    if not simulator.can_engage():
+        return MonteCarloResult(np.zeros(trials, dtype=np.int64))
+
+    attacker, defender = simulator.profiles()
+    inaccuracy, to_save = shooting_targets(attacker, defender)
+    net_wounds = roll_wounds(rng, np.full(trials, attacker.models), inaccuracy, to_save)
+    if defender.can_shoot:
+        inaccuracy, to_save = shooting_targets(defender, attacker)
+        net_wounds -= roll_wounds(rng, np.full(trials, defender.models), inaccuracy, to_save)
+    return MonteCarloResult(net_wounds)
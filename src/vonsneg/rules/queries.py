@@ -0,0 +1,64 @@
+"""One-number queries about simulation results."""
+
+from abc import ABC, abstractmethod
+
+from vonsneg.dice.distribution import Distribution
+
+
+class ResultQueries(ABC):
+    """Tail probabilities, CDFs and quantiles of a simulator's result.
+
+    Subclasses provide ``get_distribution``, ``simulate_distribution``, ``result_key``
+    and ``delta_bounds``. Thresholds outside the bounds are answered from the
+    bounds alone, without simulating.
+    """
+
+    @abstractmethod
+    def get_distribution(self) -> Distribution:
+        """The simulation's result distribution."""
+
+    @abstractmethod
+    def simulate_distribution(self) -> Distribution:
+        """Compute the result distribution, bypassing any cache."""
+
+    @abstractmethod
+    def result_key(self) -> tuple:
+        """Everything the result depends on, as a hashable key for persistent caches."""
+
+    @abstractmethod
+    def delta_bounds(self) -> tuple[int, int]:
+        """Smallest and largest result the simulation can produce."""
+
+    def probability_at_least(self, delta: int) -> float:
+        """Probability of a result of at least ``delta``."""
+        low, high = self.delta_bounds()
+        if delta <= low:
+            return 1.0
+        if delta > high:
+            return 0.0
+        return self.get_distribution().at_least(delta)
+
+    def probability_at_most(self, delta: int) -> float:
+        """Probability of a result of at most ``delta`` (the CDF)."""
+        low, high = self.delta_bounds()
+        if delta < low:
+            return 0.0
+        if delta >= high:
+            return 1.0
+        return self.get_distribution().cdf(delta)
+
+    def win_probability(self) -> float:
+        """Probability that the attacker comes out ahead."""
+        return self.probability_at_least(1)
+
+    def lose_probability(self) -> float:
+        """Probability that the defender comes out ahead."""
+        return self.probability_at_most(-1)
+
+    def quantile(self, q: float) -> int:
+        """Smallest result whose cumulative probability reaches ``q``."""
+        return self.get_distribution().quantile(q)
+
+    def expected_delta(self) -> float:
+        """Expected result."""
+        return self.get_distribution().mean()
@@ -0,0 +1,133 @@
+"""Threshold and best-choice searches over unit sizes, stats and weapons.
+
+Win probabilities grow with a unit's strength (more models or attacks, lower
+inaccuracy or vitality targets), so threshold questions are answered by binary
+search rather than a sweep. Smaller model counts share their bouts and wound
+tables through the simulators' caches, so each probe reuses earlier work.
+"""
+
+import dataclasses
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from vonsneg.rules.matchups import SIMULATORS
+from vonsneg.rules.units import BaseUnit
+from vonsneg.rules.weapons import WEAPONS, BaseWeapon
+
+SIDES = ("attacker", "defender")
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """Weakest value of a parameter that reaches the threshold."""
+
+    parameter: str
+    value: int
+    win: float
+    evaluations: int
+
+
+@dataclass(frozen=True)
+class WeaponChoice:
+    """Win probability of a unit carrying one of the candidate weapons."""
+
+    weapon: str
+    win: float
+
+
+def with_parameter(unit: BaseUnit, parameter: str, value: int) -> BaseUnit:
+    """Return a copy of ``unit`` with ``models`` or one of its stats set to ``value``."""
+    if parameter == "models":
+        return dataclasses.replace(unit, models=value, stats=dict(unit.stats), state=dict(unit.state))
+    return dataclasses.replace(unit, stats={**unit.stats, parameter: value}, state=dict(unit.state))
+
+
+def win_probability(kind: str, attacker: BaseUnit, defender: BaseUnit, side: str = "attacker") -> float:
+    """Probability that ``side`` comes out ahead in a melee or shooting matchup."""
+    if side not in SIDES:
+        raise ValueError(f"Unknown side '{side}', expected attacker or defender.")
+    simulator = SIMULATORS[kind](attacker, defender)
+    return simulator.win_probability() if side == "attacker" else simulator.lose_probability()
+
+
+def minimum_to_win(
+    kind: str,
+    attacker: BaseUnit,
+    defender: BaseUnit,
+    threshold: float,
+    parameter: str = "models",
+    values: Sequence[int] | None = None,
+    side: str = "attacker",
+) -> SearchResult | None:
+    """Find the weakest value of ``side``'s ``parameter`` that wins at least ``threshold`` of the time.
+
+    :param parameter: "models" or a stat such as "A", "I" or "V"
+    :param values: Candidate values ordered from weakest to strongest, e.g. ``range(6, 1, -1)``
+        for inaccuracy; defaults to 1 to 50 models
+    :return: The first value reaching the threshold, or None if even the strongest falls short
+    """
+    if values is None:
+        if parameter != "models":
+            raise ValueError(f"Candidate values are required for '{parameter}'.")
+        values = range(1, 51)
+    units = {"attacker": attacker, "defender": defender}
+
+    def win_at(index: int) -> float:
+        units[side] = with_parameter(attacker if side == "attacker" else defender, parameter, values[index])
+        return win_probability(kind, units["attacker"], units["defender"], side)
+
+    # Binary search for the first index reaching the threshold, assuming wins grow along ``values``
+    low, high = 0, len(values) - 1
+    evaluations, best = 0, None
+    while low <= high:
+        middle = (low + high) // 2
+        win = win_at(middle)
+        evaluations += 1
+        if win >= threshold:
+            best = (middle, win)
+            high = middle - 1
+        else:
+            low = middle + 1
+    if best is None:
+        return None
+    return SearchResult(parameter, values[best[0]], best[1], evaluations)
+
+
+def rank_weapons(
+    kind: str,
+    attacker: BaseUnit,
+    defender: BaseUnit,
+    weapons: dict[str, type[BaseWeapon]] = WEAPONS,
+    side: str = "attacker",
+) -> list[WeaponChoice]:
+    """Rank candidate weapons for ``side`` by win probability, best first.
+
+    Weapons that leave the matchup's inputs unchanged share one simulation, and
+    a weapon that cannot produce a win is ranked without simulating.
+    """
+    results: dict[tuple, float] = {}
+    choices = []
+    for weapon in weapons.values():
+        armed = dataclasses.replace(attacker if side == "attacker" else defender, weapon=weapon())
+        pair = (armed, defender) if side == "attacker" else (attacker, armed)
+        simulator = SIMULATORS[kind](*pair)
+        key = simulator.result_key()
+        if key not in results:
+            low, high = simulator.delta_bounds()
+            if (side == "attacker" and high <= 0) or (side == "defender" and low >= 0):
+                results[key] = 0.0
+            else:
+                results[key] = win_probability(kind, *pair, side)
+        choices.append(WeaponChoice(armed.weapon.name, results[key]))
+    return sorted(choices, key=lambda choice: -choice.win)
+
+
+def best_weapon(
+    kind: str,
+    attacker: BaseUnit,
+    defender: BaseUnit,
+    weapons: dict[str, type[BaseWeapon]] = WEAPONS,
+    side: str = "attacker",
+) -> WeaponChoice:
+    """The weapon that gives ``side`` the best chance of winning."""
+    return rank_weapons(kind, attacker, defender, weapons, side)[0]
@@ -1,10 +1,88 @@
 from collections import defaultdict
+from collections.abc import Mapping
+from fractions import Fraction
+from typing import TYPE_CHECKING
 
-from vonsneg.dice.roller import Roller
-from vonsneg.rules.units import BaseUnit
+import numpy as np
 
+from vonsneg.dice.binomial import success_probability
+from vonsneg.dice.cache import lru_cache
+from vonsneg.dice.compound import wound_pmf
+from vonsneg.dice.distribution import Distribution
+from vonsneg.dice.exact import check_numeric, counts_to_mapping, wound_counts
+from vonsneg.instrumentation import instrumented
+from vonsneg.rules.queries import ResultQueries
+from vonsneg.rules.units import BaseUnit, UnitProfile
 
-class ShootingSimulator:
+if TYPE_CHECKING:
+    from vonsneg.rules.store import ResultStore
+
+
+def shooting_targets(shooter: UnitProfile, target: UnitProfile) -> tuple[int, int]:
+    """Return the (inaccuracy, save target) for ``shooter`` firing at ``target``.
+
+    Skirmishers are harder to hit and missile weapons modify the target's save.
+    """
+    # Calculate inaccuracy (with Skirmish modifier)
+    inaccuracy = shooter.inaccuracy
+    if "Skirmish" in target.traits:
+        inaccuracy += 2
+
+    # Calculate to-wound target with missile weapon modifier (the to_wound_target is actually the save target)
+    to_wound_target = target.vitality + shooter.shooting_save_mod
+    return inaccuracy, to_wound_target
+
+
+def casualty_pmf(shooter: UnitProfile, target: UnitProfile, shooter_models: int, target_models: int) -> np.ndarray:
+    """Return the probability of each number of models ``target`` loses to a volley, indexed by models lost."""
+    wounds = wound_pmf(shooter_models, *shooting_targets(shooter, target))
+    lost = np.minimum(np.arange(len(wounds)) // target.wounds, target_models)
+    return np.bincount(lost, weights=wounds, minlength=target_models + 1)
+
+
+@lru_cache(maxsize=1024)
+@instrumented("shooting_distribution")
+def shooting_distribution(
+    attacker_models: int,
+    attacker_targets: tuple[int, int],
+    defender_models: int,
+    stand_and_shoot: tuple[int, int] | None = None,
+) -> Distribution:
+    """Return the net wound distribution of a volley (positive = attacker wins).
+
+    :param attacker_targets: The attacker's (inaccuracy, save target)
+    :param stand_and_shoot: The defender's (inaccuracy, save target) if it shoots back simultaneously
+    """
+    attacker_wound_dist = Distribution(wound_pmf(attacker_models, *attacker_targets))
+    if stand_and_shoot is None:
+        return attacker_wound_dist
+
+    # Combine both distributions to get net wounds
+    return attacker_wound_dist - Distribution(wound_pmf(defender_models, *stand_and_shoot))
+
+
+@lru_cache(maxsize=1024)
+@instrumented("exact_shooting_distribution")
+def exact_shooting_distribution(
+    attacker_models: int,
+    attacker_targets: tuple[int, int],
+    defender_models: int,
+    stand_and_shoot: tuple[int, int] | None = None,
+) -> Mapping[int, Fraction]:
+    """Exact counterpart of :func:`shooting_distribution` as a read-only {net_wounds: Fraction} mapping."""
+    atk_counts, atk_denominator = wound_counts(attacker_models, *attacker_targets)
+    def_counts, def_denominator = (1,), 1
+    if stand_and_shoot is not None:
+        def_counts, def_denominator = wound_counts(defender_models, *stand_and_shoot)
+
+    net = defaultdict(int)
+    for atk_wounds, atk_count in enumerate(atk_counts):
+        for def_wounds, def_count in enumerate(def_counts):
+            net[atk_wounds - def_wounds] += atk_count * def_count
+    return counts_to_mapping(net, atk_denominator * def_denominator)
+
+
+class ShootingSimulator(ResultQueries):
     """Simulates a shooting attack in Turnip28.
     Provides a consistent interface: can_engage, simulate, get_result, describe.
     Handles simultaneous stand and shoot reactions.
@@ -13,7 +91,6 @@ class ShootingSimulator:
     def __init__(self, attacker: BaseUnit, defender: BaseUnit):
         self.attacker = attacker
         self.defender = defender
-        self._result_cache = None
 
     def can_engage(self, **kwargs) -> bool:
         """Check if the shooter can fire.
@@ -33,98 +110,110 @@ class ShootingSimulator:
             return self.defender.weapon.can_shoot()
         return False
 
-    def simulate(self, **kwargs) -> dict[int, float]:
+    def simulate(self, numeric: str = "float", **kwargs) -> dict[int, float] | dict[int, Fraction]:
         """Simulate a shooting attack and return a {net_wounds: probability} distribution.
         If defender can stand and shoot, both sides fire simultaneously.
         Does not mutate input units.
 
+        :param numeric: "float" for float64 probabilities, or "exact" for :class:`~fractions.Fraction`
+            probabilities from integer-count tables, for verification and published odds
         :return: Dictionary mapping net wounds to probabilities (positive = attacker wins)
         """
+        check_numeric(numeric, kwargs)
+        if numeric == "exact":
+            if not self.can_engage():
+                return {0: Fraction(1)}
+            return dict(exact_shooting_distribution(*self._inputs()))
+        return self.simulate_distribution(**kwargs).to_dict()
+
+    @instrumented("shooting.simulate")
+    def simulate_distribution(self, **kwargs) -> Distribution:
+        """Simulate a shooting attack and return the net wounds as a Distribution.
+
+        :return: Distribution of net wounds (positive = attacker wins)
+        """
+        if not self.can_engage():
+            return Distribution.point(0)
+
+        return shooting_distribution(*self._inputs())
+
+    def profiles(self) -> tuple[UnitProfile, UnitProfile]:
+        """Snapshot the attacker and defender as they are now."""
+        return self.attacker.profile(), self.defender.profile()
+
+    def _inputs(self) -> tuple:
+        """Everything the shooting result depends on, as the key of :func:`shooting_distribution`."""
+        attacker, defender = self.profiles()
+        stand_and_shoot = shooting_targets(defender, attacker) if defender.can_shoot else None
+        return attacker.models, shooting_targets(attacker, defender), defender.models, stand_and_shoot
+
+    def delta_bounds(self) -> tuple[int, int]:
+        """Smallest and largest net wounds the volley can produce."""
         if not self.can_engage():
-            return {0: 1.0}
-
-        # Calculate attacker's inaccuracy (with Skirmish modifier)
-        attacker_inaccuracy = self.attacker.inaccuracy()
-        if "Skirmish" in self.defender.traits:
-            attacker_inaccuracy += 2
-
-        # Attacker's shooting
-        attacker_roller = Roller(num_dice=self.attacker.models, target=attacker_inaccuracy)
-        attacker_hit_dist = attacker_roller.prob_dict()
-
-        # Calculate attacker's to-wound target with missile weapon modifier
-        attacker_to_wound_target = self.defender.stats.get("V", 6)
-        if hasattr(self.attacker.weapon, "shooting_save_mod"):
-            attacker_to_wound_target += self.attacker.weapon.shooting_save_mod
-
-        attacker_wound_dist = defaultdict(float)
-        for hits, prob_hit in attacker_hit_dist.items():
-            if hits > 0:
-                # The to_wound_target is actually the save target
-                save_roller = Roller(num_dice=hits, target=attacker_to_wound_target)
-                save_dist = save_roller.prob_dict()
-                for saves, prob_save in save_dist.items():
-                    wounds = hits - saves  # Failed saves become wounds
-                    attacker_wound_dist[wounds] += prob_hit * prob_save
-            else:
-                attacker_wound_dist[0] += prob_hit
-
-        # Check if defender can stand and shoot
-        if self._can_stand_and_shoot():
-            # Calculate defender's inaccuracy (with Skirmish modifier)
-            defender_inaccuracy = self.defender.inaccuracy()
-            if "Skirmish" in self.attacker.traits:
-                defender_inaccuracy += 2
-
-            # Defender's stand and shoot
-            defender_roller = Roller(num_dice=self.defender.models, target=defender_inaccuracy)
-            defender_hit_dist = defender_roller.prob_dict()
-
-            # Calculate defender's to-wound target with missile weapon modifier
-            defender_to_wound_target = self.attacker.stats.get("V", 6)
-            if hasattr(self.defender.weapon, "shooting_save_mod"):
-                defender_to_wound_target += self.defender.weapon.shooting_save_mod
-
-            defender_wound_dist = defaultdict(float)
-            for hits, prob_hit in defender_hit_dist.items():
-                if hits > 0:
-                    # The to_wound_target is actually the save target
-                    save_roller = Roller(num_dice=hits, target=defender_to_wound_target)
-                    save_dist = save_roller.prob_dict()
-                    for saves, prob_save in save_dist.items():
-                        wounds = hits - saves  # Failed saves become wounds
-                        defender_wound_dist[wounds] += prob_hit * prob_save
-                else:
-                    defender_wound_dist[0] += prob_hit
-
-            # Combine both distributions to get net wounds
-            net_wound_dist = defaultdict(float)
-            for atk_wounds, atk_prob in attacker_wound_dist.items():
-                for def_wounds, def_prob in defender_wound_dist.items():
-                    net_wounds = atk_wounds - def_wounds
-                    net_wound_dist[net_wounds] += atk_prob * def_prob
-
-            return dict(net_wound_dist)
-        # No stand and shoot - just attacker's wounds
-        return dict(attacker_wound_dist)
-
-    def get_result(self, **kwargs) -> dict[int, float]:
-        """Get cached result or run simulation."""
-        if self._result_cache is None:
-            self._result_cache = self.simulate(**kwargs)
-        return self._result_cache
-
-    def describe(self) -> str:
-        """Generate a human-readable description of the shooting outcome."""
-        result = self.get_result()
+            return 0, 0
+        attacker, defender = self.profiles()
+        return (-defender.models if defender.can_shoot else 0), attacker.models
+
+    def expected_delta(self) -> float:
+        """Expected net wounds, straight from the hit and save chances."""
+        if not self.can_engage():
+            return 0.0
+        attacker, defender = self.profiles()
+        expected = _expected_wounds(attacker, defender)
+        if defender.can_shoot:
+            expected -= _expected_wounds(defender, attacker)
+        return expected
+
+    def expected_casualties(self, side: str = "defender") -> float:
+        """Expected models ``side`` loses, counting ``stats["W"]`` wounds per model."""
+        attacker, defender = self.profiles()
+        shooter, target = (attacker, defender) if side == "defender" else (defender, attacker)
+        if not self.can_engage() or not shooter.can_shoot:
+            return 0.0
+        lost = casualty_pmf(shooter, target, shooter.models, target.models)
+        return float(np.arange(len(lost)) @ lost)
+
+    def result_key(self) -> tuple:
+        """Everything the result depends on, as a hashable key for persistent caches."""
+        return ("shooting", self.can_engage(), *self._inputs())
+
+    def get_distribution(self, store: "ResultStore | None" = None, **kwargs) -> Distribution:
+        """Get the result Distribution for the units as they are now.
+
+        Results are cached by their inputs rather than per simulator, so changing a
+        stat or weapon only recomputes the stages that depend on it.
+
+        :param store: Persistent store to serve the result from, and to keep it in on a miss
+        """
+        if store is not None:
+            return store.get_distribution(self)
+        return self.simulate_distribution(**kwargs)
+
+    def get_result(self, numeric: str = "float", **kwargs) -> dict[int, float] | dict[int, Fraction]:
+        """Get the result for the units as they are now, see :meth:`simulate` for ``numeric``.
+
+        Other arguments, such as ``store``, go to :meth:`get_distribution` and only apply to the float path.
+        """
+        if numeric != "float":
+            return self.simulate(numeric, **kwargs)
+        return self.get_distribution(**kwargs).to_dict()
+
+    def describe(self, store: "ResultStore | None" = None, result: Distribution | None = None) -> str:
+        """Generate a human-readable description of the shooting outcome.
+
+        :param result: The result distribution, if already computed, so it isn't looked up again
+        """
+        if result is None:
+            result = self.get_distribution(store)
+        attacker, defender = self.profiles()
 
         # Calculate summary statistics
-        if self._can_stand_and_shoot():
+        if defender.can_shoot:
             # Net wounds (positive = attacker wins)
-            expected_net_wounds = sum(wounds * prob for wounds, prob in result.items())
-            attacker_wins = sum(prob for wounds, prob in result.items() if wounds > 0)
-            defender_wins = sum(prob for wounds, prob in result.items() if wounds < 0)
-            draw = sum(prob for wounds, prob in result.items() if wounds == 0)
+            expected_net_wounds = result.mean()
+            attacker_wins = result.win()
+            defender_wins = result.lose()
+            draw = result.draw()
 
             # Create visual bar
             bar_width = 30
@@ -133,15 +222,11 @@ class ShootingSimulator:
             bar = f"{'█' * attacker_bar}{'▓' * defender_bar}".ljust(bar_width)
 
             # Show inaccuracy information
-            attacker_inaccuracy = self.attacker.inaccuracy()
-            if "Skirmish" in self.defender.traits:
-                attacker_inaccuracy += 2
-            defender_inaccuracy = self.defender.inaccuracy()
-            if "Skirmish" in self.attacker.traits:
-                defender_inaccuracy += 2
+            attacker_inaccuracy, _ = shooting_targets(attacker, defender)
+            defender_inaccuracy, _ = shooting_targets(defender, attacker)
 
             lines = [
-                f"Shooting: {self.attacker.name} ↔ {self.defender.name} (Stand and Shoot)",
+                f"Shooting: {attacker.name} ↔ {defender.name} (Stand and Shoot)",
                 f"Attacker inaccuracy: {attacker_inaccuracy}",
                 f"Defender inaccuracy: {defender_inaccuracy}",
                 "Combat Outcome:",
@@ -164,23 +249,21 @@ class ShootingSimulator:
                         lines.append(f"  Draw: {result[wounds]:.1%}")
         else:
             # One-sided shooting
-            expected_wounds = sum(wounds * prob for wounds, prob in result.items())
-            expected_casualties = expected_wounds // self.defender.stats.get("W", 1)
+            expected_wounds = result.mean()
+            expected_casualties = expected_wounds // defender.wounds
 
             # Create simple bar for one-sided shooting
             bar_width = 30
             # Scale the bar based on expected wounds (cap at 100% for visual purposes)
-            wound_percentage = min(expected_wounds / max(1, self.defender.models), 1.0)
+            wound_percentage = min(expected_wounds / max(1, defender.models), 1.0)
             wound_bar = int(wound_percentage * bar_width)
             bar = f"{'█' * wound_bar}{'░' * (bar_width - wound_bar)}"
 
             # Show inaccuracy information
-            attacker_inaccuracy = self.attacker.inaccuracy()
-            if "Skirmish" in self.defender.traits:
-                attacker_inaccuracy += 2
+            attacker_inaccuracy, _ = shooting_targets(attacker, defender)
 
             lines = [
-                f"Shooting: {self.attacker.name} → {self.defender.name}",
+                f"Shooting: {attacker.name} → {defender.name}",
                 f"Attacker inaccuracy: {attacker_inaccuracy}",
                 "Expected Outcome:",
                 bar,
@@ -192,7 +275,12 @@ class ShootingSimulator:
 
             for wounds in sorted(result.keys()):
                 if result[wounds] > 0.001:
-                    casualties = wounds // self.defender.stats.get("W", 1)
+                    casualties = wounds // defender.wounds
                     lines.append(f"  {wounds} wounds ({casualties} casualties): {result[wounds]:.1%}")
 
         return "\n".join(lines)
+
+
+def _expected_wounds(shooter: UnitProfile, target: UnitProfile) -> float:
+    inaccuracy, to_save = shooting_targets(shooter, target)
+    return shooter.models * float(success_probability(inaccuracy) * (1 - success_probability(to_save)))
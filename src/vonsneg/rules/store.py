@@ -0,0 +1,203 @@
+"""Persistent result store shared by simulator instances, processes and restarts.
+
+Results are kept in an SQLite database in WAL mode, so any number of worker
+processes can read while one writes. Each entry is keyed by a fingerprint of
+everything the result depends on plus :data:`ENGINE_VERSION`, so entries written
+by an older engine are never served and simply age out.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from vonsneg.dice.distribution import Distribution
+from vonsneg.rules.queries import ResultQueries
+
+# Bump whenever a change to the rules or solvers changes any result
+ENGINE_VERSION = 1
+
+# The total size of the stored probabilities is kept in a one-row table by
+# triggers, so checking the size limit never has to scan the results
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS results (
+    fingerprint TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    probs BLOB NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS size (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO size SELECT 0, COALESCE(SUM(LENGTH(probs)), 0) FROM results;
+CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results
+BEGIN UPDATE size SET bytes = bytes + LENGTH(NEW.probs); END;
+CREATE TRIGGER IF NOT EXISTS results_update AFTER UPDATE OF probs ON results
+BEGIN UPDATE size SET bytes = bytes - LENGTH(OLD.probs) + LENGTH(NEW.probs); END;
+CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results
+BEGIN UPDATE size SET bytes = bytes - LENGTH(OLD.probs); END;
+COMMIT;
+"""
+
+
+def fingerprint(simulator: ResultQueries) -> str:
+    """Canonical hash of a simulator's result key and the engine version.
+
+    Powder smoke tokens in ``BaseUnit.state`` are deliberately left out: a single
+    melee or shooting simulation never reads them, only multi-step engagements do.
+    """
+    key = repr((ENGINE_VERSION, simulator.result_key()))
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class StoreStats:
+    """Counters for a result store, with its size on disk."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class ResultStore:
+    """Least-recently-used store of result distributions in an SQLite file.
+
+    :param path: Database file, created if missing
+    :param max_bytes: Stored probabilities are trimmed to this many bytes, least recently used first
+    :param timeout: Seconds to wait for another process holding the write lock
+    :param touch_interval: Hits only record their use time once per this many seconds, or on the
+        next store, so reads rarely need the write lock
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 64 * 1024 * 1024,
+        timeout: float = 30.0,
+        touch_interval: float = 5.0,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.touch_interval = touch_interval
+        self.hits = self.misses = self.evictions = 0
+        self._touched: dict[str, float] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections can't cross a fork, so each worker process opens its own
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            self._enable_wal(connection)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def _enable_wal(self, connection: sqlite3.Connection) -> None:
+        # Switching a new file to WAL fails at once rather than waiting if another process is doing the same
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                return
+            except sqlite3.OperationalError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.01)
+
+    def get(self, key: str) -> Distribution | None:
+        """Return the stored distribution for a fingerprint, or None."""
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute("SELECT offset, probs FROM results WHERE fingerprint = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = time.time()
+            if time.monotonic() - self._last_flush >= self.touch_interval:
+                with connection:
+                    self._flush_touches(connection)
+        offset, probs = row
+        return Distribution(np.frombuffer(probs, dtype=np.float64), offset)
+
+    def put(self, key: str, dist: Distribution) -> None:
+        """Store a distribution, evicting the least recently used entries over the size limit."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT INTO results VALUES (?, ?, ?, ?) ON CONFLICT (fingerprint) DO UPDATE SET "
+                    "offset = excluded.offset, probs = excluded.probs, last_used = excluded.last_used",
+                    (key, dist.offset, dist.probs.tobytes(), time.time()),
+                )
+                self._flush_touches(connection)
+                self._evict(connection)
+
+    def _flush_touches(self, connection: sqlite3.Connection) -> None:
+        # Write the use times of recent hits in one go, inside the caller's transaction
+        touched = [(used, key) for key, used in self._touched.items()]
+        connection.executemany("UPDATE results SET last_used = MAX(last_used, ?) WHERE fingerprint = ?", touched)
+        self._touched.clear()
+        self._last_flush = time.monotonic()
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        size = connection.execute("SELECT bytes FROM size").fetchone()[0]
+        if size <= self.max_bytes:
+            return
+        rows = connection.execute("SELECT fingerprint, LENGTH(probs) FROM results ORDER BY last_used")
+        stale = []
+        for key, length in rows:
+            if size <= self.max_bytes:
+                break
+            stale.append((key,))
+            size -= length
+        connection.executemany("DELETE FROM results WHERE fingerprint = ?", stale)
+        self.evictions += len(stale)
+
+    def get_distribution(self, simulator: ResultQueries) -> Distribution:
+        """Serve a simulator's result from the store, simulating and storing it on a miss."""
+        key = fingerprint(simulator)
+        dist = self.get(key)
+        if dist is None:
+            dist = simulator.simulate_distribution()
+            self.put(key, dist)
+        return dist
+
+    def stats(self) -> StoreStats:
+        """Return the counters and the current size of the store."""
+        with self._lock:
+            entries, size = self._connect().execute("SELECT (SELECT COUNT(*) FROM results), bytes FROM size").fetchone()
+            return StoreStats(self.hits, self.misses, self.evictions, entries, size, self.max_bytes)
+
+    def __len__(self) -> int:
+        return self.stats().entries
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM results")
+            self.hits = self.misses = self.evictions = 0
+
+    def close(self) -> None:
+        """Close this process's connection; the store reopens it on next use."""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                with self._connection:
+                    self._flush_touches(self._connection)
+                self._connection.close()
+            self._connection = self._pid = None
@@ -0,0 +1,186 @@
+"""Parallel sweeps of melee and shooting simulations over parameter grids."""
+
+import csv
+import itertools
+import json
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor
+from dataclasses import dataclass, field, fields
+from typing import TextIO
+
+from vonsneg.rules.matchups import SIMULATORS
+from vonsneg.rules.units import BaseUnit, unit_from_dict
+from vonsneg.rules.weapons import WEAPONS
+
+# Unit data for the current worker process, set by _init_worker
+_UNIT_DICTS: dict[str, dict] = {}
+
+
+@dataclass(frozen=True)
+class SweepCase:
+    """A single simulation in a sweep.
+
+    Units and weapons are referred to by their lowercase catalog names so cases
+    stay small and cheap to send to worker processes. ``overrides`` holds
+    ``(side, stat, value)`` triples applied on top of the catalog stats.
+    """
+
+    kind: str
+    attacker: str
+    attacker_weapon: str
+    defender: str
+    defender_weapon: str
+    attacker_models: int | None = None
+    defender_models: int | None = None
+    overrides: tuple[tuple[str, str, int], ...] = ()
+
+    def build_unit(self, side: str, unit_dicts: dict[str, dict]) -> BaseUnit:
+        """Build the attacker or defender with its weapon, models and overridden stats."""
+        entry = unit_dicts[getattr(self, side)]
+        unit = unit_from_dict(entry, WEAPONS[getattr(self, f"{side}_weapon")]())
+        unit.stats = dict(unit.stats)
+        for override_side, stat, value in self.overrides:
+            if override_side == side:
+                unit.stats[stat] = value
+        models = getattr(self, f"{side}_models")
+        if models is not None:
+            unit.models = models
+        return unit
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Summary of one simulated case."""
+
+    case: SweepCase
+    win: float
+    lose: float
+    draw: float
+    mean: float
+    distribution: dict[int, float] = field(repr=False)
+
+    def row(self) -> dict:
+        """Flatten the case and summary into a single output row."""
+        row = {f.name: getattr(self.case, f.name) for f in fields(SweepCase) if f.name != "overrides"}
+        row["overrides"] = ";".join(f"{side}.{stat}={value}" for side, stat, value in self.case.overrides)
+        row.update(win=self.win, lose=self.lose, draw=self.draw, mean=self.mean)
+        row["distribution"] = json.dumps(self.distribution)
+        return row
+
+
+def iter_cases(
+    kinds: Iterable[str],
+    attackers: Iterable[str],
+    defenders: Iterable[str],
+    attacker_weapons: Iterable[str],
+    defender_weapons: Iterable[str],
+    attacker_models: Iterable[int | None] = (None,),
+    defender_models: Iterable[int | None] = (None,),
+    overrides: Iterable[dict[str, int]] = ({},),
+) -> Iterator[SweepCase]:
+    """Yield the cartesian product of the grid axes as sweep cases.
+
+    Each override dict maps ``"attacker.V"`` style keys to stat values.
+    """
+    override_sets = [
+        tuple((*key.split(".", 1), value) for key, value in sorted(override.items())) for override in overrides
+    ]
+    for values in itertools.product(
+        kinds,
+        attackers,
+        attacker_weapons,
+        defenders,
+        defender_weapons,
+        attacker_models,
+        defender_models,
+        override_sets,
+    ):
+        kind, attacker, attacker_weapon, defender, defender_weapon, atk_models, def_models, override = values
+        yield SweepCase(kind, attacker, attacker_weapon, defender, defender_weapon, atk_models, def_models, override)
+
+
+def run_case(case: SweepCase, unit_dicts: dict[str, dict]) -> SweepResult:
+    """Simulate a single case."""
+    attacker = case.build_unit("attacker", unit_dicts)
+    defender = case.build_unit("defender", unit_dicts)
+    dist = SIMULATORS[case.kind](attacker, defender).simulate_distribution()
+    return SweepResult(case, dist.win(), dist.lose(), dist.draw(), dist.mean(), dist.to_dict())
+
+
+def _init_worker(unit_dicts: dict[str, dict]) -> None:
+    global _UNIT_DICTS
+    _UNIT_DICTS = unit_dicts
+
+
+def _run_worker_chunk(cases: list[SweepCase]) -> list[SweepResult]:
+    return [run_case(case, _UNIT_DICTS) for case in cases]
+
+
+def run_sweep(
+    cases: Iterable[SweepCase],
+    unit_dicts: dict[str, dict],
+    jobs: int = 1,
+    chunksize: int = 64,
+    progress: Callable[[int], None] | None = None,
+) -> Iterator[SweepResult]:
+    """Simulate every case and yield results in input order as they complete.
+
+    Cases are read lazily, a few chunks ahead of the results, so ``cases`` can be
+    an unbounded stream.
+
+    :param jobs: Number of worker processes, 1 runs everything in this process
+    :param chunksize: Number of cases sent to a worker at a time
+    :param progress: Called with the number of finished cases after each result
+    """
+    if jobs == 1:
+        results = (run_case(case, unit_dicts) for case in cases)
+        yield from _report(results, progress)
+        return
+
+    # Imported here since multiprocessing is slow to import and serial runs never need it
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(unit_dicts,)) as executor:
+        yield from _report(_map_chunks(executor, cases, chunksize, window=2 * jobs), progress)
+
+
+def _map_chunks(
+    executor: Executor,
+    cases: Iterable[SweepCase],
+    chunksize: int,
+    window: int,
+) -> Iterator[SweepResult]:
+    # Keep at most ``window`` chunks in flight so input is consumed as results are produced
+    cases = iter(cases)
+    pending = deque()
+    while True:
+        while len(pending) < window and (chunk := list(itertools.islice(cases, chunksize))):
+            pending.append(executor.submit(_run_worker_chunk, chunk))
+        if not pending:
+            return
+        yield from pending.popleft().result()
+
+
+def _report(results: Iterable[SweepResult], progress: Callable[[int], None] | None) -> Iterator[SweepResult]:
+    for done, result in enumerate(results, start=1):
+        if progress is not None:
+            progress(done)
+        yield result
+
+
+def write_results(results: Iterable[SweepResult], stream: TextIO, output_format: str = "csv") -> int:
+    """Stream results to ``stream`` as CSV or JSON lines and return how many were written."""
+    count = 0
+    writer = None
+    for result in results:
+        row = result.row()
+        if output_format == "jsonl":
+            stream.write(json.dumps({**row, "distribution": result.distribution}) + "\n")
+        else:
+            if writer is None:
+                writer = csv.DictWriter(stream, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+        count += 1
+    return count
@@ -1,8 +1,6 @@
-import json
 from dataclasses import dataclass, field
-from pathlib import Path
 
-from vonsneg.rules.weapons import BaseWeapon, CloseCombatWeapon
+from vonsneg.rules.weapons import BaseWeapon, BlackPowderWeapon, CloseCombatWeapon
 
 
 @dataclass
@@ -28,30 +26,77 @@ class BaseUnit:
     def is_fearless(self) -> bool:
         return "Fearless" in self.traits
 
+    def profile(self) -> "UnitProfile":
+        """Snapshot everything the simulators read from this unit as a hashable profile."""
+        return UnitProfile(
+            name=self.name,
+            models=self.models,
+            movement=self.stats.get("M", 0),
+            attacks=self.stats.get("A", 0),
+            inaccuracy=self.stats.get("I", 6),
+            vitality=self.stats.get("V", 6),
+            wounds=self.stats.get("W", 1),
+            traits=frozenset(self.traits),
+            weapon=self.weapon.name,
+            melee_inaccuracy_mod=self.weapon.melee_inaccuracy_mod,
+            shooting_save_mod=self.weapon.shooting_save_mod,
+            reroll_charge=self.weapon.reroll_charge,
+            can_shoot=bool(self.weapon.can_shoot()),
+            black_powder=isinstance(self.weapon, BlackPowderWeapon),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class UnitProfile:
+    """Immutable, hashable view of an armed unit.
+
+    Stats are plain fields and the weapon is reduced to its name and modifiers, so
+    profiles compare by value and can key caches shared between simulators.
+    """
+
+    name: str
+    models: int
+    movement: int
+    attacks: int
+    inaccuracy: int
+    vitality: int
+    wounds: int
+    traits: frozenset[str]
+    weapon: str
+    melee_inaccuracy_mod: int = 0
+    shooting_save_mod: int = 0
+    reroll_charge: bool = False
+    can_shoot: bool = False
+    black_powder: bool = False
+
 
 def load_unit_dicts_from_json(filepath: str = "data/units.json") -> dict[str, dict]:
-    """Load unit data as dictionaries (not BaseUnit objects), keyed by lowercase name."""
-    with Path(filepath).open(encoding="utf-8") as f:
-        data = json.load(f)["units"]
-    return {entry["name"].lower(): entry for entry in data}
+    """Load unit data as dictionaries (not BaseUnit objects), keyed by lowercase name.
+
+    Unlike :meth:`UnitCatalog.load`, this leaves no snapshot in the cache directory.
+    """
+    # Imported here since the catalog builds on this module
+    from vonsneg.rules.catalog import UnitCatalog
+
+    return dict(UnitCatalog.load(filepath, snapshot=False).entries)
 
 
 def load_units_from_json(filepath: str = "data/units.json") -> dict[str, BaseUnit]:
     """Load unit data as BaseUnit objects, keyed by lowercase name."""
-    with Path(filepath).open(encoding="utf-8") as f:
-        data = json.load(f)["units"]
-
-    units = {}
-    for entry in data:
-        unit = BaseUnit(
-            name=entry["name"],
-            unit_type=entry["type"],
-            models=entry["models"],
-            base_size=entry["base_size"],
-            stats=entry["stats"],
-            traits=entry["traits"],
-            weapon=CloseCombatWeapon(),  # Default weapon, can be changed later
-        )
-        units[unit.name.lower()] = unit  # store by lowercase name for easy lookup
+    from vonsneg.rules.catalog import UnitCatalog
+
+    catalog = UnitCatalog.load(filepath, snapshot=False)
+    return {name: catalog.unit(name) for name in catalog}
+
 
-    return units
+def unit_from_dict(entry: dict, weapon: BaseWeapon | None = None) -> BaseUnit:
+    """Build a BaseUnit from a unit data dictionary."""
+    return BaseUnit(
+        name=entry["name"],
+        unit_type=entry["type"],
+        models=entry["models"],
+        base_size=entry["base_size"],
+        stats=dict(entry["stats"]),
+        traits=list(entry["traits"]),
+        weapon=weapon or CloseCombatWeapon(),  # Default weapon, can be changed later
+    )
@@ -5,6 +5,15 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 
+# Module-level functions rather than lambdas so weapons can be pickled for worker processes
+def _always_shoots(unit_state: dict | None = None) -> bool:
+    return True
+
+
+def _never_shoots(unit_state: dict | None = None) -> bool:
+    return False
+
+
 @dataclass
 class BaseWeapon(ABC):
     """Base class for all weapons in the game."""
@@ -13,7 +22,7 @@ class BaseWeapon(ABC):
     melee_inaccuracy_mod: int = 0
     shooting_save_mod: int = 0
     reroll_charge: bool = False
-    can_shoot: callable = field(default=lambda: True, repr=False)
+    can_shoot: callable = field(default=_always_shoots, repr=False)
 
 
 @dataclass
@@ -23,7 +32,7 @@ class CloseCombatWeapon(BaseWeapon):
     name: str = "Close Combat Weapon"
     melee_inaccuracy_mod: int = -1
     reroll_charge: bool = True
-    can_shoot: callable = field(default=lambda: False, repr=False)
+    can_shoot: callable = field(default=_never_shoots, repr=False)
 
 
 @dataclass
@@ -51,7 +60,7 @@ class MissileWeapon(BaseWeapon):
 
     name: str = "Missile Weapon"
     shooting_save_mod: int = -2
-    can_shoot: callable = field(default=lambda: True, repr=False)
+    can_shoot: callable = field(default=_always_shoots, repr=False)
 
 
 @dataclass
@@ -60,7 +69,7 @@ class OldMissileWeapon(BaseWeapon):
 
     name: str = "Old Missile Weapon"
     shooting_save_mod: int = -1
-    can_shoot: callable = field(default=lambda: True, repr=False)
+    can_shoot: callable = field(default=_always_shoots, repr=False)
 
 
 @dataclass
@@ -68,4 +77,14 @@ class PistolAndSabre(BaseWeapon):
     """Pistol and sabre combination weapon."""
 
     name: str = "Pistol & Sabre"
-    can_shoot: callable = field(default=lambda: True, repr=False)
+    can_shoot: callable = field(default=_always_shoots, repr=False)
+
+
+# Map of available weapons
+WEAPONS: dict[str, type[BaseWeapon]] = {
+    "close combat": CloseCombatWeapon,
+    "black powder": BlackPowderWeapon,
+    "missile": MissileWeapon,
+    "old missile": OldMissileWeapon,
+    "pistol and sabre": PistolAndSabre,
+}
@@ -0,0 +1,106 @@
+"""Asynchronous simulation service for the Discord bot.
+
+Simulations are CPU-bound, so they run in a worker pool while the event loop
+keeps serving other commands. Identical requests that arrive while one is
+already being computed share its result.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+
+from vonsneg.dice.distribution import Distribution
+from vonsneg.rules.matchups import SIMULATORS, matchup_key
+from vonsneg.rules.store import ResultStore
+from vonsneg.rules.units import BaseUnit
+
+# Result stores opened by this process, keyed by path
+_STORES: dict[Path, ResultStore] = {}
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Result distribution of a simulation and its rendered description."""
+
+    distribution: Distribution
+    description: str
+
+
+def run_simulation(kind: str, attacker: BaseUnit, defender: BaseUnit, store: Path | None = None) -> SimulationResult:
+    """Run a simulation synchronously, as done inside a worker.
+
+    :param store: Path of a persistent result store to serve and keep the result in
+    """
+    simulator = SIMULATORS[kind](attacker, defender)
+    if store is not None and store not in _STORES:
+        _STORES[store] = ResultStore(store)
+    result_store = _STORES.get(store)
+    distribution = simulator.get_distribution(result_store)
+    return SimulationResult(distribution, simulator.describe(result=distribution))
+
+
+class SimulationService:
+    """Runs simulations off the event loop, coalescing identical in-flight requests.
+
+    :param executor: Pool to run simulations in, a process pool of spawned workers by default
+    :param timeout: Default time budget per request in seconds, None for no limit
+    :param store: Path of a persistent result store shared by the workers and across restarts
+    """
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        timeout: float | None = 10.0,
+        store: str | Path | None = None,
+    ):
+        self._owns_executor = executor is None
+        # Forking a process with running threads and open store connections isn't safe, so workers are spawned
+        self._executor = executor or ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        self.timeout = timeout
+        self.store = Path(store) if store is not None else None
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def simulate(
+        self,
+        kind: str,
+        attacker: BaseUnit,
+        defender: BaseUnit,
+        timeout: float | None = None,
+    ) -> SimulationResult:
+        """Simulate a matchup without blocking the event loop.
+
+        :param kind: "melee" or "shooting"
+        :param timeout: Time budget for this request, defaults to the service timeout
+        :raises TimeoutError: If the result is not ready within the time budget
+        """
+        if kind not in SIMULATORS:
+            raise ValueError(f"Unknown simulation '{kind}'.")
+        key = matchup_key(kind, attacker, defender)
+        future = self._in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, run_simulation, kind, attacker, defender, self.store)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shield the shared computation so one caller timing out doesn't cancel it for the others
+        budget = self.timeout if timeout is None else timeout
+        return await asyncio.wait_for(asyncio.shield(future), budget)
+
+    async def describe(self, kind: str, attacker: BaseUnit, defender: BaseUnit, timeout: float | None = None) -> str:
+        """Return only the rendered description of a matchup."""
+        return (await self.simulate(kind, attacker, defender, timeout)).description
+
+    def close(self) -> None:
+        """Shut down the worker pool if the service created it."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,18 @@
+"""Shared fixtures."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """Keep the package's cache files, such as catalog snapshots, out of the user's cache directory.
+
+    Session-wide, so module fixtures that load catalogs are covered too.
+    """
+    path = tmp_path_factory.mktemp("cache")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("VONSNEG_CACHE_DIR", str(path))
+        yield path
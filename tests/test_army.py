@@ -0,0 +1,70 @@
+"""Tests for army-against-army evaluation."""
+
+from pathlib import Path
+
+import pytest
+
+from vonsneg.rules import army as army_module
+from vonsneg.rules.army import ArmyEvaluator, army_from_catalog
+from vonsneg.rules.catalog import UnitCatalog
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.shooting import ShootingSimulator
+
+DATA = Path(__file__).resolve().parent.parent / "src" / "vonsneg" / "data"
+
+
+@pytest.fixture
+def catalog() -> UnitCatalog:
+    return UnitCatalog.load(DATA / "core_units.json")
+
+
+def test_matrices_match_individual_simulations(catalog: UnitCatalog) -> None:
+    """Every entry agrees with simulating that pairing on its own, in both directions."""
+    ours = army_from_catalog(catalog, [("brutes", "close combat"), ("chaff", "missile")])
+    theirs = army_from_catalog(catalog, [("fodder", "black powder"), "whelps"])
+    report = ArmyEvaluator(ours, theirs).evaluate()
+
+    melee = report.matrix("melee", "ours")
+    assert melee.attackers == ("Brutes (Close Combat Weapon)", "Chaff (Missile Weapon)")
+    assert melee.win[0, 1] == pytest.approx(MeleeSimulator(ours[0], theirs[1]).simulate_distribution().win())
+    assert melee.inflicted[0, 0] == pytest.approx(MeleeSimulator(ours[0], theirs[0]).expected_casualties())
+    shooting = report.matrix("shooting", "theirs")
+    simulator = ShootingSimulator(theirs[0], ours[1])
+    assert shooting.mean[0, 1] == pytest.approx(simulator.expected_delta())
+    assert shooting.suffered[0, 1] == pytest.approx(simulator.expected_casualties("attacker"))
+
+
+def test_identical_pairings_are_simulated_once(catalog: UnitCatalog, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    summarise = army_module._summarise
+    monkeypatch.setattr(army_module, "_summarise", lambda *args: calls.append(args) or summarise(*args))
+    ours = army_from_catalog(catalog, ["brutes", "brutes", "brutes"])
+    theirs = army_from_catalog(catalog, ["fodder", "fodder"])
+    report = ArmyEvaluator(ours, theirs).evaluate(["melee"])
+    assert len(calls) == 2  # brutes -> fodder and fodder -> brutes
+    assert report.matrix().win.shape == (3, 2)
+
+
+def test_summaries(catalog: UnitCatalog) -> None:
+    """Best targets, attrition and threats are read off the matrices."""
+    ours = army_from_catalog(catalog, ["bastards", "chaff"])
+    theirs = army_from_catalog(catalog, ["fodder", "toady", "bastards"])
+    report = ArmyEvaluator(ours, theirs).evaluate(["melee"])
+    matrix = report.matrix()
+
+    targets = report.best_targets()
+    assert [t.attacker for t in targets] == list(matrix.attackers)
+    for i, target in enumerate(targets):
+        assert target.win == pytest.approx(matrix.win[i].max())
+    inflicted, suffered = report.expected_attrition()
+    assert inflicted == pytest.approx(sum(t.inflicted for t in targets))
+    assert suffered >= 0
+
+    threats = report.threat_rankings()
+    assert threats[0][0] == "Bastards (Close Combat Weapon)"
+    assert [threat for _, threat in threats] == sorted((threat for _, threat in threats), reverse=True)
+
+
+def test_unknown_weapon(catalog: UnitCatalog) -> None:
+    with pytest.raises(KeyError, match="Weapon"):
+        army_from_catalog(catalog, [("brutes", "trebuchet")])
@@ -0,0 +1,52 @@
+"""Tests for closed-form dice success distributions."""
+
+from fractions import Fraction
+
+import pytest
+from icepool import Pool, d6, d12
+
+from vonsneg.dice.binomial import die_probability, success_pmf, success_probability
+from vonsneg.dice.roller import Roller
+
+
+@pytest.mark.parametrize("target", [1, 2, 3, 4, 5, 6, 7, 9])
+@pytest.mark.parametrize("num_dice", [1, 5, 12])
+def test_matches_icepool_exactly(num_dice: int, target: int) -> None:
+    """Closed-form PMF rounds to the same floats as the icepool pool."""
+    die = (d6 >= target) if target < 7 else (d12 >= 12)
+    dist = Pool([die.map({True: 1, False: 0})] * num_dice).sum()
+    expected = {k: float(dist.probability(k)) for k in dist}
+    assert Roller(num_dice, target).prob_dict() == expected
+
+
+def test_success_probability_targets() -> None:
+    """Per-die probabilities follow the d6 and d12 rules."""
+    assert success_probability(4) == Fraction(1, 2)
+    assert success_probability(0) == 1
+    assert success_probability(8) == Fraction(1, 12)
+
+
+def test_pmf_is_shared_and_read_only() -> None:
+    """The process-wide table hands out the same immutable array."""
+    pmf = success_pmf(6, 4)
+    assert pmf is Roller(6, 4).pmf()
+    with pytest.raises(ValueError):
+        pmf[0] = 1.0
+
+
+@pytest.mark.parametrize("target", [1, 2, 3, 4, 5, 6])
+@pytest.mark.parametrize("reroll", ["failures", "ones"])
+def test_rerolls_match_icepool(target: int, reroll: str) -> None:
+    """Rerolled dice have the same per-die odds as icepool's reroll."""
+    failures = [face for face in range(1, 7) if face < target]
+    rerolled = [1] if reroll == "ones" else failures
+    die = d6.reroll([face for face in rerolled if face in failures], depth=1)
+    assert die_probability(target, reroll) == (die >= target).probability(True)
+
+
+def test_reroll_ones_on_two_stage_targets() -> None:
+    """A 1 on the first d6 of a 6-then-4+ roll is rerolled too."""
+    assert die_probability(8, "ones") == Fraction(1, 12) * Fraction(7, 6)
+    assert die_probability(8, "failures") == Fraction(1, 12) + Fraction(11, 12) * Fraction(1, 12)
+    with pytest.raises(ValueError, match="Unknown reroll"):
+        die_probability(4, "sixes")
@@ -0,0 +1,69 @@
+"""Tests for exact melee bout resolution."""
+
+import pytest
+
+from vonsneg.dice.distribution import Distribution
+from vonsneg.rules.bout import BoutSide, bout_table, solve_bout
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.units import BaseUnit
+from vonsneg.rules.weapons import CloseCombatWeapon, MissileWeapon
+
+
+def test_ties_are_resolved_exactly() -> None:
+    """A 1v1 duel redistributes the tied mass as a geometric series."""
+    side = BoutSide(attacks=1, to_hit=4, to_save=5)
+    result = solve_bout(side, side, 1, 1)
+    assert result.to_dict() == pytest.approx({1: 3 / 5, -1: 2 / 5})
+
+
+def test_distribution_is_normalised() -> None:
+    """Large bouts keep all of their probability mass."""
+    fodder = BoutSide(attacks=1, to_hit=6, to_save=6)
+    brutes = BoutSide(attacks=2, to_hit=5, to_save=5)
+    assert solve_bout(fodder, brutes, 12, 6).total() == pytest.approx(1.0, abs=1e-12)
+
+
+def test_bout_that_always_ties_is_split() -> None:
+    """Sides that can never wound each other split the result evenly."""
+    side = BoutSide(attacks=1, to_hit=4, to_save=1)
+    assert solve_bout(side, side, 3, 3).to_dict() == {-1: 0.5, 1: 0.5}
+
+
+def test_bout_table_rows_match_single_bouts() -> None:
+    """Each table row is the bout for that many attackers, and row 0 never fights."""
+    attacker = BoutSide(attacks=2, to_hit=5, to_save=5)
+    defender = BoutSide(attacks=1, to_hit=6, to_save=6)
+    table, low = bout_table(attacker, defender, 6, 12)
+
+    assert table[0, -low] == 1.0
+    for models in range(1, 7):
+        row = Distribution(table[models], low)
+        assert row.to_dict() == pytest.approx(solve_bout(attacker, defender, models, 12).to_dict())
+
+
+def test_stand_and_shoot_mixture_matches_per_outcome_melee() -> None:
+    """Folding stand and shoot into the table equals fighting each outcome separately."""
+    brutes = BaseUnit("Brutes", "Follower", 6, "", {"A": 2, "I": 5, "V": 5, "W": 1}, [], CloseCombatWeapon())
+    fodder = BaseUnit("Fodder", "Follower", 12, "", {"A": 1, "I": 6, "V": 6, "W": 1}, [], MissileWeapon())
+    simulator = MeleeSimulator(brutes, fodder)
+
+    expected = Distribution.mixture(
+        (prob, simulator._simulate_melee_only(brutes.models - wounds).shift(-wounds))
+        if wounds < brutes.models
+        else (prob, Distribution.point(-wounds))
+        for wounds, prob in simulator._calculate_stand_and_shoot_wounds().items()
+    )
+    assert simulator.simulate() == pytest.approx(expected.to_dict())
+
+
+def test_weapon_melee_rules_shape_the_bout_side() -> None:
+    """Close combat weapons hit more easily and reroll failed hits when charging."""
+    brutes = BaseUnit("Brutes", "Follower", 6, "", {"A": 2, "I": 5, "V": 5, "W": 1}, [], CloseCombatWeapon())
+    archers = BaseUnit("Archers", "Follower", 6, "", {"A": 1, "I": 5, "V": 6, "W": 1}, [], MissileWeapon())
+    assert BoutSide.from_unit(brutes) == BoutSide(2, 4, 5, 1)
+    assert BoutSide.from_unit(brutes, charging=True) == BoutSide(2, 4, 5, 1, "failures")
+    assert BoutSide.from_unit(archers, charging=True) == BoutSide(1, 5, 6, 1)
+
+    expected = solve_bout(BoutSide(2, 4, 5, 1, "failures"), BoutSide(1, 5, 6, 1), 6, 6)
+    assert MeleeSimulator(brutes, archers)._simulate_melee_only() is expected
+    assert expected.win() > solve_bout(BoutSide(2, 4, 5, 1), BoutSide(1, 5, 6, 1), 6, 6).win()
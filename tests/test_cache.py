@@ -0,0 +1,53 @@
+"""Tests for the bounded engine caches."""
+
+import numpy as np
+import pytest
+
+from vonsneg.dice.cache import cache_stats, lru_cache
+from vonsneg.dice.compound import wound_pmf
+from vonsneg.rules.melee import MeleeCombatSimulator
+
+
+def test_lru_counts_hits_misses_and_evictions() -> None:
+    """The least recently used entry is evicted once the cache is full."""
+    calls = []
+
+    @lru_cache(maxsize=2)
+    def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    assert [square(1), square(2), square(1), square(3), square(2)] == [1, 4, 1, 9, 4]
+    assert calls == [1, 2, 3, 2]
+
+    stats = square.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size, stats.maxsize) == (1, 4, 2, 2, 2)
+    assert stats.name in cache_stats()
+
+
+def test_wound_distributions_shared_between_simulators() -> None:
+    """Two simulators asking for the same dice hit the same cache entry."""
+    first = MeleeCombatSimulator(6, 2, 4, 5, 6, 2, 4, 6)
+    second = MeleeCombatSimulator(3, 1, 3, 4, 3, 1, 3, 4)
+    before = cache_stats()["vonsneg.dice.compound.wound_pmf"]
+    first.wound_distribution(11, 4, 5)
+    second.wound_distribution(11, 4, 5)
+    after = cache_stats()["vonsneg.dice.compound.wound_pmf"]
+    assert after.hits - before.hits >= 1
+
+
+def test_keyword_and_default_arguments_share_entries() -> None:
+    """Arguments passed by keyword or left to their defaults key the same entry as positional ones."""
+    calls = []
+
+    @lru_cache(maxsize=8)
+    def roll(dice: int, reroll: str | None = None) -> tuple[int, str | None]:
+        calls.append((dice, reroll))
+        return dice, reroll
+
+    assert roll(2) == roll(2, None) == roll(2, reroll=None) == roll(dice=2) == (2, None)
+    assert roll(2, reroll="ones") == roll(2, "ones") == (2, "ones")
+    assert calls == [(2, None), (2, "ones")]
+    np.testing.assert_array_equal(wound_pmf(8, 4, 5, reroll="failures"), wound_pmf(8, 4, 5, "failures"))
+    with pytest.raises(TypeError):
+        roll()
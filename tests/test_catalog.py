@@ -0,0 +1,155 @@
+"""Tests for the unit catalog."""
+
+import json
+import marshal
+import os
+from pathlib import Path
+
+import pytest
+
+from vonsneg.rules import catalog as catalog_module
+from vonsneg.rules.catalog import (
+    SNAPSHOT_VERSION,
+    CatalogError,
+    UnitCatalog,
+    load_entries,
+    parse_units,
+    snapshot_path,
+)
+from vonsneg.rules.units import load_unit_dicts_from_json, load_units_from_json, unit_from_dict
+from vonsneg.rules.weapons import MissileWeapon
+
+CORE_UNITS = Path(__file__).resolve().parent.parent / "src" / "vonsneg" / "data" / "core_units.json"
+
+
+def unit_entry(name: str, unit_type: str = "Follower", traits: tuple[str, ...] = (), **stats) -> dict:
+    return {
+        "name": name,
+        "type": unit_type,
+        "models": 6,
+        "base_size": "25mm",
+        "stats": {"M": 6, "A": 1, "I": 5, "V": 5, "W": 1, **stats},
+        "traits": list(traits),
+    }
+
+
+def write_units(path: Path, *entries: dict) -> Path:
+    path.write_text(json.dumps({"units": list(entries)}), encoding="utf-8")
+    return path
+
+
+def test_core_units_load_and_index() -> None:
+    """The shipped catalog validates and indexes by type and trait."""
+    catalog = UnitCatalog.load(CORE_UNITS, snapshot=False)
+    assert "fodder" in catalog
+    assert "Fodder" in catalog
+    assert "fodder" in catalog.of_type("follower")
+    assert all("Skirmish" in catalog.get(name)["traits"] for name in catalog.with_trait("skirmish"))
+
+
+def test_faction_files_merge_and_reject_duplicates(tmp_path: Path) -> None:
+    """Several files combine into one catalog, but a name may only appear once."""
+    core = write_units(tmp_path / "core.json", unit_entry("Fodder", traits=("Safety in Numbers",)))
+    faction = write_units(tmp_path / "faction.json", unit_entry("Toadies", "Chaff", ("Skirmish",)))
+    catalog = UnitCatalog.load(core, faction)
+    assert list(catalog) == ["fodder", "toadies"]
+    assert catalog.of_type("Chaff") == ["toadies"]
+    assert catalog.with_trait("Skirmish") == ["toadies"]
+
+    with pytest.raises(CatalogError, match="duplicate unit 'Fodder'"):
+        UnitCatalog.load(core, core)
+
+
+@pytest.mark.parametrize(
+    ("change", "message"),
+    [
+        ({"models": 0}, "'models' must be at least 1"),
+        ({"models": "6"}, "'models' must be int"),
+        ({"stats": {"A": 1, "I": 5}}, "missing stat 'V'"),
+        ({"stats": {"A": 1, "I": 5, "V": "4+"}}, "stat 'V' must be int"),
+        ({"traits": "Skirmish"}, "'traits' must be list"),
+    ],
+)
+def test_invalid_entries_are_rejected(tmp_path: Path, change: dict, message: str) -> None:
+    """Malformed entries fail loudly with the file and unit index."""
+    path = write_units(tmp_path / "bad.json", unit_entry("Fodder"), {**unit_entry("Brutes"), **change})
+    with pytest.raises(CatalogError, match=message) as info:
+        UnitCatalog.load(path)
+    assert "unit 1" in str(info.value)
+
+
+def test_units_are_independent_of_the_catalog(tmp_path: Path) -> None:
+    """Changing a built unit leaves the catalog entry untouched."""
+    catalog = UnitCatalog.load(write_units(tmp_path / "core.json", unit_entry("Fodder")))
+    unit = catalog.unit("FODDER", MissileWeapon())
+    unit.stats["V"] = 3
+    unit.traits.append("Fearless")
+    assert catalog.get("fodder")["stats"]["V"] == 5
+    assert catalog.get("fodder")["traits"] == []
+    assert isinstance(unit.weapon, MissileWeapon)
+    with pytest.raises(KeyError, match="not found"):
+        catalog.unit("Nobody")
+
+
+def test_later_loads_are_independent_of_earlier_changes(tmp_path: Path) -> None:
+    """Entries cached for the process never pick up changes made through an earlier load."""
+    path = write_units(tmp_path / "core.json", unit_entry("Brutes"))
+    unit_from_dict(load_unit_dicts_from_json(path)["brutes"]).stats["V"] = 2
+    load_unit_dicts_from_json(path)["brutes"]["traits"].append("Fearless")
+    UnitCatalog.load(path).get("brutes")["stats"]["A"] = 4
+
+    assert load_unit_dicts_from_json(path)["brutes"]["stats"] == unit_entry("Brutes")["stats"]
+    assert load_units_from_json(path)["brutes"].stats["V"] == 5
+    assert load_units_from_json(path)["brutes"].traits == []
+
+
+def test_snapshot_is_reused_until_the_file_changes(
+    tmp_path: Path, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A fresh process reads the snapshot instead of reparsing the JSON."""
+    path = write_units(tmp_path / "core.json", unit_entry("Fodder"))
+    assert load_entries(path)[0]["name"] == "Fodder"
+    assert snapshot_path(path).exists()
+    assert snapshot_path(path).is_relative_to(cache_dir)
+    assert list(tmp_path.glob("core.json*")) == [path]
+
+    def fail(raw: bytes, source: str) -> list[dict]:
+        raise AssertionError("reparsed")
+
+    # Forget the in-process copy, as a new process would
+    monkeypatch.setattr(catalog_module, "_LOADED", {})
+    monkeypatch.setattr(catalog_module, "parse_units", fail)
+    assert load_entries(path)[0]["name"] == "Fodder"
+
+    # Touching the file without editing it is caught by the content hash
+    monkeypatch.setattr(catalog_module, "_LOADED", {})
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_entries(path)[0]["name"] == "Fodder"
+
+    # A real edit is parsed again
+    monkeypatch.setattr(catalog_module, "parse_units", parse_units)
+    write_units(path, unit_entry("Brutes"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert load_entries(path)[0]["name"] == "Brutes"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", marshal.dumps((SNAPSHOT_VERSION, (1, 2)))[:-3], b"\x80\x05 foreign", marshal.dumps((2, 0, 0, [])), b"[]"],
+)
+def test_damaged_snapshots_fall_back_to_the_file(tmp_path: Path, content: bytes) -> None:
+    """A truncated or foreign snapshot is ignored and rewritten from the JSON."""
+    path = write_units(tmp_path / "core.json", unit_entry("Fodder"))
+    snapshot_path(path).parent.mkdir(parents=True, exist_ok=True)
+    snapshot_path(path).write_bytes(content)
+    assert load_entries(path)[0]["name"] == "Fodder"
+    assert marshal.loads(snapshot_path(path).read_bytes())[3][0]["name"] == "Fodder"
+    assert list(snapshot_path(path).parent.glob("*.tmp")) == []
+
+
+def test_legacy_loaders_leave_no_snapshot(tmp_path: Path) -> None:
+    path = write_units(tmp_path / "core.json", unit_entry("Fodder"))
+    load_unit_dicts_from_json(path)
+    load_units_from_json(path)
+    assert not snapshot_path(path).exists()
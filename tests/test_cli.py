@@ -0,0 +1,100 @@
+"""Tests for the batch command line interface."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from vonsneg import cli
+from vonsneg.rules import sweep
+from vonsneg.rules.catalog import UnitCatalog
+from vonsneg.rules.sweep import SweepCase, SweepResult
+
+UNITS = str(Path(__file__).resolve().parent.parent / "src" / "vonsneg" / "data" / "core_units.json")
+
+
+@pytest.fixture(scope="module")
+def catalog() -> UnitCatalog:
+    return UnitCatalog.load(UNITS)
+
+
+def test_specs_parse_from_json_lines_and_csv(catalog: UnitCatalog) -> None:
+    """Both input formats produce the same case, with defaults filled in."""
+    jsonl = io.StringIO(
+        '{"kind": "melee", "attacker": "Brutes", "defender": "fodder", "overrides": {"attacker.V": 4}}\n\n'
+    )
+    rows = io.StringIO("kind,attacker,defender,defender_models,overrides\nmelee,brutes,fodder,,attacker.V=4\n")
+    expected = SweepCase("melee", "brutes", "close combat", "fodder", "close combat", overrides=(("attacker", "V", 4),))
+    assert list(cli.read_specs(jsonl, catalog)) == [expected]
+    assert list(cli.read_specs(rows, catalog, "csv")) == [expected]
+
+
+@pytest.mark.parametrize(
+    ("line", "message"),
+    [
+        ('{"kind": "duel", "attacker": "brutes", "defender": "fodder"}', "Unknown kind 'duel'"),
+        ('{"kind": "melee", "attacker": "nobody", "defender": "fodder"}', "Unit 'nobody' not found"),
+        ('{"kind": "melee", "attacker": "brutes", "defender": "fodder", "defender_weapon": "bow"}', "Weapon 'bow'"),
+        ('{"kind": "melee", "attacker": "brutes", "defender": "fodder", "overrides": {"V": 4}}', "Override 'V'"),
+        ("not json", "line 2"),
+    ],
+)
+def test_bad_specs_report_their_line(catalog: UnitCatalog, line: str, message: str) -> None:
+    """Invalid specs raise a SpecError naming the problem and the input line."""
+    stream = io.StringIO('{"kind": "melee", "attacker": "brutes", "defender": "fodder"}\n' + line + "\n")
+    with pytest.raises(cli.SpecError, match=message):
+        list(cli.read_specs(stream, catalog))
+
+
+def test_repeated_specs_are_simulated_once(catalog: UnitCatalog, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Duplicates come back in input order without being simulated again."""
+    first = SweepCase("melee", "brutes", "close combat", "fodder", "missile")
+    second = SweepCase("shooting", "fodder", "missile", "brutes", "close combat")
+    simulated = []
+    run_case = sweep.run_case
+
+    def counting_run_case(case: SweepCase, unit_dicts: dict[str, dict]) -> SweepResult:
+        simulated.append(case)
+        return run_case(case, unit_dicts)
+
+    monkeypatch.setattr(sweep, "run_case", counting_run_case)
+    results = list(cli.run_specs([first, second, first, first], catalog.entries))
+    assert [result.case for result in results] == [first, second, first, first]
+    assert simulated == [first, second]
+    assert results[2] is results[0]
+
+    # Only the most recent results are kept for repeats
+    simulated.clear()
+    results = list(cli.run_specs([first, second, first, second, second], catalog.entries, cache_size=1))
+    assert [result.case for result in results] == [first, second, first, second, second]
+    assert simulated == [first, second, first, second]
+
+
+def test_main_streams_results(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """The entry point reads a spec file and writes one JSON line per spec."""
+    specs = tmp_path / "specs.jsonl"
+    specs.write_text(
+        '{"kind": "melee", "attacker": "brutes", "defender": "fodder"}\n'
+        '{"kind": "shooting", "attacker": "fodder", "attacker_weapon": "missile", "defender": "brutes"}\n',
+        encoding="utf-8",
+    )
+    assert cli.main([str(specs), "--units", UNITS]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["kind"] for line in lines] == ["melee", "shooting"]
+    assert sum(lines[0]["distribution"].values()) == pytest.approx(1.0)
+
+    specs.write_text('{"kind": "melee", "attacker": "nobody", "defender": "fodder"}\n', encoding="utf-8")
+    assert cli.main([str(specs), "--units", UNITS]) == 2
+    assert "Unit 'nobody' not found" in capsys.readouterr().err
+
+
+def test_main_finds_the_default_units_from_any_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+) -> None:
+    """Without ``--units`` the project's unit data is used, wherever the command is run from."""
+    specs = tmp_path / "specs.jsonl"
+    specs.write_text('{"kind": "melee", "attacker": "brutes", "defender": "fodder"}\n', encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    assert cli.main([str(specs)]) == 0
+    assert json.loads(capsys.readouterr().out)["kind"] == "melee"
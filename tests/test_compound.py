@@ -0,0 +1,36 @@
+"""Tests for the hit-then-save wound distribution."""
+
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from vonsneg.dice.compound import wound_pmf, wound_table
+from vonsneg.dice.roller import Roller
+
+
+@pytest.mark.parametrize(("to_hit", "to_save"), [(4, 5), (5, 6), (7, 3), (3, 1)])
+def test_matches_two_stage_rolls(to_hit: int, to_save: int) -> None:
+    """Thinned binomial matches rolling hits and then saves on each hit count."""
+    expected = defaultdict(float)
+    for hits, p_hit in Roller(8, to_hit).prob_dict().items():
+        for saves, p_save in Roller(hits, to_save).prob_dict().items():
+            expected[hits - saves] += p_hit * p_save
+
+    pmf = wound_pmf(8, to_hit, to_save)
+    assert len(pmf) == 9
+    for wounds, prob in enumerate(pmf):
+        assert prob == pytest.approx(expected.get(wounds, 0.0), abs=1e-12)
+
+
+@pytest.mark.parametrize(
+    ("to_hit", "to_save", "reroll"), [(4, 5, None), (7, 3, "failures"), (5, 6, "ones"), (1, 7, None)]
+)
+def test_table_rows_match_per_count_pmfs(to_hit: int, to_save: int, reroll: str | None) -> None:
+    """Row ``n`` of the incrementally built table is the wound PMF for ``n`` dice."""
+    table = wound_table(24, to_hit, to_save, reroll)
+    assert table.shape == (25, 25)
+    assert not table.flags.writeable
+    for n in range(25):
+        np.testing.assert_allclose(table[n, : n + 1], wound_pmf(n, to_hit, to_save, reroll), rtol=1e-12, atol=1e-300)
+        assert not table[n, n + 1 :].any()
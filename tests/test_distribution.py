@@ -0,0 +1,58 @@
+"""Tests for the dense distribution type."""
+
+import pytest
+
+from vonsneg.dice.distribution import Distribution
+
+
+def test_dict_view_matches_probabilities() -> None:
+    """Mapping interface lists only possible outcomes."""
+    dist = Distribution([0.0, 0.25, 0.0, 0.75], offset=-2)
+    assert dist.to_dict() == {-1: 0.25, 1: 0.75}
+    assert dict(dist.items()) == {-1: 0.25, 1: 0.75}
+    assert sorted(dist) == [-1, 1]
+    assert dist[1] == 0.75
+    assert 0 not in dist
+    assert dist.offset == -1
+
+
+def test_convolution_and_negation() -> None:
+    """Subtracting independent outcomes convolves with the negated distribution."""
+    coin = Distribution([0.5, 0.5])
+    net = coin - coin
+    assert net.to_dict() == {-1: 0.25, 0: 0.5, 1: 0.25}
+    assert (-Distribution([0.2, 0.8], offset=1)).to_dict() == {-2: 0.8, -1: 0.2}
+
+
+def test_mixture_and_shift() -> None:
+    """Mixture weights shifted components."""
+    dist = Distribution.mixture([(0.5, Distribution.point(0).shift(-2)), (0.5, Distribution([0.5, 0.5], offset=1))])
+    assert dist.to_dict() == {-2: 0.5, 1: 0.25, 2: 0.25}
+
+
+def test_summary_statistics() -> None:
+    """Summary statistics come from the array."""
+    dist = Distribution([0.1, 0.2, 0.3, 0.4], offset=-1)
+    assert dist.mean() == pytest.approx(1.0)
+    assert dist.win() == pytest.approx(0.7)
+    assert dist.lose() == pytest.approx(0.1)
+    assert dist.draw() == pytest.approx(0.2)
+    assert dist.quantile(0.5) == 1
+    assert dist.total() == pytest.approx(1.0)
+
+
+def test_derived_values_stay_in_step_with_probs() -> None:
+    """Probabilities can't be changed in place, so the cached running total never goes stale."""
+    dist = Distribution([0.25, 0.25, 0.5], offset=-1)
+    assert dist.total() == pytest.approx(1.0)
+    with pytest.raises(ValueError, match="read-only"):
+        dist.probs[-1] = 1.0
+    assert dist.total() == float(dist.probs.sum())
+    assert dist.win() == pytest.approx(0.5)
+
+
+def test_empty_mapping_gives_the_empty_distribution() -> None:
+    dist = Distribution.from_dict({})
+    assert dist == Distribution([0.0]) == Distribution.mixture([])
+    assert dist.to_dict() == {}
+    assert dist.total() == 0.0
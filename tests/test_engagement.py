@@ -0,0 +1,94 @@
+"""Tests for multi-step engagements."""
+
+import numpy as np
+import pytest
+
+from vonsneg.dice.compound import wound_pmf
+from vonsneg.rules.bout import BoutSide, bout_casualties
+from vonsneg.rules.engagement import Charge, EngagementSimulator, EngagementState, MeleeRound, Reload, Volley
+from vonsneg.rules.shooting import shooting_targets
+from vonsneg.rules.units import BaseUnit
+from vonsneg.rules.weapons import BlackPowderWeapon, CloseCombatWeapon, MissileWeapon
+
+
+def make_unit(name: str, models: int, weapon, **stats) -> BaseUnit:
+    return BaseUnit(name, "Follower", models, "", {"A": 1, "I": 5, "V": 5, "W": 1, **stats}, [], weapon)
+
+
+def test_engagement_keeps_all_mass() -> None:
+    """Every step of a long engagement keeps the state distribution normalised."""
+    archers = make_unit("Archers", 8, MissileWeapon())
+    brutes = make_unit("Brutes", 6, CloseCombatWeapon(), A=2)
+    result = EngagementSimulator(archers, brutes).simulate(
+        [Volley("attacker"), Charge("defender"), MeleeRound("defender"), MeleeRound("attacker")]
+    )
+    assert sum(result.states.values()) == pytest.approx(1.0, abs=1e-12)
+    assert result.models_distribution("attacker").total() == pytest.approx(1.0, abs=1e-12)
+    assert 0 < result.wiped_out("attacker") < 1
+
+
+def test_volley_casualties_match_wound_distribution() -> None:
+    """A one-sided volley kills one model per wound, capped at the target's size."""
+    archers = make_unit("Archers", 8, MissileWeapon())
+    fodder = make_unit("Fodder", 5, CloseCombatWeapon(), V=6)
+    result = EngagementSimulator(archers, fodder).simulate([Volley()])
+
+    wounds = wound_pmf(8, *shooting_targets(archers.profile(), fodder.profile()))
+    expected = {5 - lost: float(prob) for lost, prob in enumerate(wounds[:5])}
+    expected[0] = float(wounds[5:].sum())
+    assert result.models_distribution("defender").to_dict() == pytest.approx(expected)
+    assert result.expected_models("attacker") == 8
+
+
+def test_smoke_blocks_a_second_black_powder_volley() -> None:
+    """Black powder leaves smoke that stops the next volley until the unit reloads."""
+    musketeers = make_unit("Musketeers", 6, BlackPowderWeapon())
+    fodder = make_unit("Fodder", 10, CloseCombatWeapon())
+    simulator = EngagementSimulator(musketeers, fodder)
+
+    once = simulator.simulate([Volley()])
+    assert all(state.attacker_smoke for state in once.states)
+    assert simulator.simulate([Volley(), Volley()]).states == once.states
+
+    reloaded = simulator.simulate([Volley(), Reload(), Volley()])
+    assert reloaded.expected_models("defender") < once.expected_models("defender")
+
+
+def test_initial_smoke_comes_from_unit_state() -> None:
+    """A unit that starts with a smoke token cannot fire until it reloads."""
+    musketeers = make_unit("Musketeers", 6, BlackPowderWeapon())
+    musketeers.state["smoke"] = True
+    fodder = make_unit("Fodder", 10, CloseCombatWeapon())
+    result = EngagementSimulator(musketeers, fodder).simulate([Volley()])
+    assert result.states == {EngagementState(6, 10, attacker_smoke=True): 1.0}
+
+
+def test_charge_without_stand_and_shoot_is_one_bout() -> None:
+    """Charging a unit that cannot shoot is a single bout from the starting models."""
+    brutes = make_unit("Brutes", 4, CloseCombatWeapon(), A=2)
+    fodder = make_unit("Fodder", 6, CloseCombatWeapon(), I=6, V=6)
+    result = EngagementSimulator(brutes, fodder).simulate([Charge()])
+
+    losses = bout_casualties(BoutSide.from_unit(brutes, charging=True), BoutSide.from_unit(fodder), 4, 6)
+    for state, prob in result.states.items():
+        assert prob == pytest.approx(losses[4 - state.attacker_models, 6 - state.defender_models])
+
+
+def test_charge_into_stand_and_shoot_mixes_survivors() -> None:
+    """Stand and shoot thins the charger before the bout is fought."""
+    brutes = make_unit("Brutes", 4, CloseCombatWeapon(), A=2)
+    archers = make_unit("Archers", 6, MissileWeapon())
+    result = EngagementSimulator(brutes, archers).simulate([Charge()])
+
+    stand = wound_pmf(6, *shooting_targets(archers.profile(), brutes.profile()))
+    attacker, defender = BoutSide.from_unit(brutes, charging=True), BoutSide.from_unit(archers)
+    expected = np.zeros((5, 7))
+    for lost, prob in enumerate(stand.tolist()):
+        survivors = max(4 - lost, 0)
+        if survivors == 0:
+            expected[4, 0] += prob
+            continue
+        losses = bout_casualties(attacker, defender, survivors, 6)
+        expected[4 - survivors : 4 - survivors + losses.shape[0], : losses.shape[1]] += prob * losses
+    for state, prob in result.states.items():
+        assert prob == pytest.approx(expected[4 - state.attacker_models, 6 - state.defender_models])
@@ -0,0 +1,73 @@
+"""Tests for the exact rational numeric backend."""
+
+from fractions import Fraction
+from pathlib import Path
+
+import pytest
+
+from vonsneg.dice.exact import binomial_counts, wound_counts
+from vonsneg.dice.roller import Roller
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.shooting import ShootingSimulator
+from vonsneg.rules.store import ResultStore
+from vonsneg.rules.units import BaseUnit
+from vonsneg.rules.weapons import CloseCombatWeapon, MissileWeapon
+
+
+def make_unit(name: str, models: int, weapon, **stats) -> BaseUnit:
+    return BaseUnit(name, "Follower", models, "", {"A": 1, "I": 5, "V": 5, "W": 1, **stats}, [], weapon)
+
+
+MATCHUPS = [
+    (make_unit("Brutes", 4, CloseCombatWeapon(), A=2), make_unit("Archers", 6, MissileWeapon())),
+    (make_unit("Louts", 5, CloseCombatWeapon(), I=4), make_unit("Brutes", 3, CloseCombatWeapon(), W=2, V=4)),
+    (make_unit("Archers", 8, MissileWeapon()), make_unit("Brutes", 5, MissileWeapon(), A=2, W=2)),
+    (make_unit("Fodder", 10, CloseCombatWeapon(), I=7), make_unit("Fodder", 10, CloseCombatWeapon(), I=7)),
+]
+
+
+def test_binomial_counts_sum_to_their_denominator() -> None:
+    counts, denominator = binomial_counts(3, Fraction(1, 2))
+    assert counts == (1, 3, 3, 1)
+    assert denominator == 8
+    counts, denominator = wound_counts(4, 8, 4)
+    assert sum(counts) == denominator == 24**4
+
+
+@pytest.mark.parametrize("simulator", [MeleeSimulator, ShootingSimulator])
+@pytest.mark.parametrize(("attacker", "defender"), MATCHUPS)
+def test_exact_results_match_the_float_path(simulator, attacker: BaseUnit, defender: BaseUnit) -> None:
+    """Exact results are Fractions summing to one, and round to the float results."""
+    sim = simulator(attacker, defender)
+    exact = sim.simulate(numeric="exact")
+    fast = sim.simulate()
+    assert all(isinstance(p, Fraction) for p in exact.values())
+    assert sum(exact.values()) == 1
+    assert exact.keys() == fast.keys()
+    for delta, prob in fast.items():
+        assert float(exact[delta]) == pytest.approx(prob, rel=1e-9, abs=1e-15)
+    assert sim.get_result(numeric="exact") == exact
+
+
+def test_roller_exact_prob_dict() -> None:
+    assert Roller(2, 4).prob_dict(numeric="exact") == {0: Fraction(1, 4), 1: Fraction(1, 2), 2: Fraction(1, 4)}
+    exact = Roller(3, 8, reroll="failures").prob_dict("exact")
+    assert sum(exact.values()) == 1
+    assert Roller(3, 8, reroll="failures").prob_dict() == pytest.approx({k: float(p) for k, p in exact.items()})
+
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(ValueError, match="numeric backend"):
+        ShootingSimulator(*MATCHUPS[2]).simulate(numeric="decimal")
+    with pytest.raises(ValueError, match="numeric backend"):
+        Roller(1, 4).prob_dict("decimal")
+
+
+@pytest.mark.parametrize("simulator", [MeleeSimulator, ShootingSimulator])
+def test_exact_backend_rejects_float_only_arguments(simulator, tmp_path: Path) -> None:
+    """Arguments only the float path uses raise instead of being silently dropped."""
+    sim = simulator(*MATCHUPS[0])
+    with pytest.raises(ValueError, match="takes no store argument"):
+        sim.get_result(numeric="exact", store=ResultStore(tmp_path / "results.db"))
+    with pytest.raises(ValueError, match="takes no seed argument"):
+        sim.simulate(numeric="exact", seed=1)
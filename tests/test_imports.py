@@ -0,0 +1,56 @@
+"""Import-time budget: heavy backends stay out of startup."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Microseconds spent importing vonsneg's own modules (not numpy and friends) for the CLI.
+# This is about three times what a laptop measures, so only real regressions trip it.
+OWN_IMPORT_BUDGET_US = 150_000
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    return subprocess.run([sys.executable, *flags, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+
+def loaded_after(module: str, candidates: tuple[str, ...]) -> set[str]:
+    code = f"import sys, {module}; print(' '.join(m for m in {candidates!r} if m in sys.modules))"
+    return set(run_python(code).stdout.split())
+
+
+@pytest.mark.parametrize(
+    ("module", "forbidden"),
+    [
+        ("vonsneg.dice.roller", ("icepool", "numpy")),
+        ("vonsneg.cli", ("icepool", "multiprocessing", "discord")),
+        ("vonsneg.rules.melee", ("icepool", "multiprocessing", "discord")),
+    ],
+)
+def test_heavy_backends_load_lazily(module: str, forbidden: tuple[str, ...]) -> None:
+    """Importing an entry point does not drag in backends it only needs on first use."""
+    assert loaded_after(module, forbidden) == set()
+
+
+def test_icepool_loads_on_first_distribution() -> None:
+    """Roller.distribution still works, importing icepool when it is called."""
+    code = "import sys; from vonsneg.dice.roller import Roller; Roller(2, 4).distribution(); print('icepool' in sys.modules)"
+    assert run_python(code).stdout.strip() == "True"
+
+
+def test_cli_import_time_budget() -> None:
+    """Time spent in vonsneg's own modules while importing the CLI stays within budget."""
+    report = run_python("import vonsneg.cli", "-X", "importtime").stderr
+    own = 0
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        if name.strip().startswith("vonsneg"):
+            own += int(self_us)
+    assert 0 < own < OWN_IMPORT_BUDGET_US
@@ -0,0 +1,98 @@
+"""Tests for the opt-in profiling of simulator stages."""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from vonsneg import instrumentation
+from vonsneg.dice.cache import clear_caches
+from vonsneg.dice.roller import Roller
+from vonsneg.instrumentation import count, instrumented, profiling
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.units import BaseUnit
+from vonsneg.rules.weapons import CloseCombatWeapon, MissileWeapon
+
+
+def make_unit(name: str, models: int, weapon, **stats) -> BaseUnit:
+    return BaseUnit(name, "Follower", models, "", {"A": 1, "I": 5, "V": 5, "W": 1, **stats}, [], weapon)
+
+
+def test_nothing_is_recorded_outside_profiling() -> None:
+    """Instrumented code runs normally and records nothing when profiling is off."""
+    calls = []
+
+    @instrumented("stage")
+    def stage(x: int) -> int:
+        calls.append(x)
+        return x * 2
+
+    assert stage(3) == 6
+    count("anything")
+    assert calls == [3]
+    assert instrumentation._ACTIVE is None
+
+
+def test_melee_stages_counters_and_caches_are_recorded() -> None:
+    """A cold melee simulation times every stage and reports cache misses, then hits."""
+    clear_caches()
+    simulator = MeleeSimulator(
+        make_unit("Brutes", 4, CloseCombatWeapon(), A=2), make_unit("Archers", 6, MissileWeapon())
+    )
+    with profiling() as stats:
+        simulator.simulate()
+        simulator.simulate()
+        Roller(3, 4)
+
+    assert stats.stages["melee.simulate"].calls == 2
+    assert stats.stages["melee_distribution"].calls == 1
+    assert stats.stages["solve_bout"].calls == 4
+    assert stats.stages["melee_distribution"].max_size > 0
+    assert stats.max_depth >= 3
+    assert stats.counters == {"roller_constructions": 1}
+    melee = stats.caches["vonsneg.rules.melee.melee_distribution"]
+    assert (melee.hits, melee.misses) == (1, 1)
+    assert instrumentation._ACTIVE is None
+
+
+def test_exports() -> None:
+    """The stats export as JSON and as Prometheus text."""
+    with profiling() as stats:
+        MeleeSimulator(
+            make_unit("Brutes", 3, CloseCombatWeapon()), make_unit("Louts", 3, CloseCombatWeapon())
+        ).simulate()
+        Roller(1, 4)
+
+    data = json.loads(stats.to_json())
+    assert data["stages"]["melee.simulate"]["calls"] == 1
+    assert data["counters"]["roller_constructions"] == 1
+    text = stats.to_prometheus()
+    assert 'vonsneg_stage_calls_total{stage="melee.simulate"} 1' in text
+    assert "# TYPE vonsneg_roller_constructions_total counter" in text
+    assert "vonsneg_roller_constructions_total 1" in text
+    assert 'vonsneg_cache_hit_ratio{cache="vonsneg.rules.melee.melee_distribution"}' in text
+
+
+def test_profiling_does_not_nest() -> None:
+    with profiling(), pytest.raises(RuntimeError), profiling():
+        pass
+
+
+def test_depth_is_tracked_per_thread() -> None:
+    """Stages running at once in separate threads don't add to each other's nesting depth."""
+    threads = 4
+    barrier = threading.Barrier(threads)
+
+    @instrumented("inner")
+    def inner() -> None:
+        barrier.wait(timeout=10)
+
+    @instrumented("outer")
+    def outer() -> None:
+        inner()
+
+    with profiling() as stats, ThreadPoolExecutor(threads) as executor:
+        list(executor.map(lambda _: outer(), range(threads)))
+    assert stats.max_depth == 2
+    assert stats.stages["inner"].calls == threads
@@ -0,0 +1,74 @@
+"""Tests for the precomputed matchup table."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from vonsneg.rules import matchups
+from vonsneg.rules.matchups import MatchupTable, iter_matchups
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.shooting import ShootingSimulator
+from vonsneg.rules.store import ENGINE_VERSION
+from vonsneg.rules.units import load_unit_dicts_from_json, unit_from_dict
+from vonsneg.rules.weapons import CloseCombatWeapon, MissileWeapon
+
+DATA = Path(__file__).resolve().parent.parent / "src" / "vonsneg" / "data"
+
+
+def test_round_trip_serves_simulated_results(tmp_path: Path) -> None:
+    """Saved tables answer with the same distributions as a live simulation."""
+    unit_dicts = load_unit_dicts_from_json(DATA / "core_units.json")
+    subset = {name: unit_dicts[name] for name in ("fodder", "whelps")}
+    weapons = {"close combat": CloseCombatWeapon, "missile": MissileWeapon}
+    MatchupTable.build(iter_matchups(subset, weapons)).save(tmp_path / "matchups.npz")
+
+    table = MatchupTable.load(tmp_path / "matchups.npz")
+    assert len(table) == 2 * 4 * 4
+
+    fodder = unit_from_dict(subset["fodder"], MissileWeapon())
+    whelps = unit_from_dict(subset["whelps"], CloseCombatWeapon())
+    assert table.lookup("melee", whelps, fodder) == MeleeSimulator(whelps, fodder).simulate()
+    assert table.lookup("shooting", fodder, whelps) == ShootingSimulator(fodder, whelps).simulate()
+
+
+def test_cold_query_falls_back_and_appends(tmp_path: Path) -> None:
+    """Unknown matchups are simulated and optionally kept for the next save."""
+    unit_dicts = load_unit_dicts_from_json(DATA / "core_units.json")
+    brutes = unit_from_dict(unit_dicts["brutes"])
+    chaff = unit_from_dict(unit_dicts["chaff"])
+    table = MatchupTable()
+
+    assert table.lookup("melee", brutes, chaff) is None
+    assert table.get("melee", brutes, chaff) == MeleeSimulator(brutes, chaff).simulate()
+    assert len(table) == 0
+
+    table.get("melee", brutes, chaff, append=True)
+    table.save(tmp_path / "matchups.npz")
+    assert MatchupTable.load(tmp_path / "matchups.npz").lookup("melee", brutes, chaff) is not None
+
+    # Adding a stored matchup again replaces it instead of saving it twice
+    table = MatchupTable.load(tmp_path / "matchups.npz")
+    table.add("melee", brutes, chaff)
+    assert len(table) == 1
+    table.save(tmp_path / "matchups.npz")
+    assert len(MatchupTable.load(tmp_path / "matchups.npz")) == 1
+
+
+def test_tables_in_other_formats_are_rejected(tmp_path: Path) -> None:
+    """Tables saved before the current key format fail to load rather than silently missing."""
+    MatchupTable().save(tmp_path / "current.npz")
+    assert len(MatchupTable.load(tmp_path / "current.npz")) == 0
+
+    np.savez(tmp_path / "old.npz", keys=np.array(["melee|a|b"]), offsets=[0], lengths=[1], probs=[1.0])
+    with pytest.raises(ValueError, match="format version 1, expected 2"):
+        MatchupTable.load(tmp_path / "old.npz")
+
+
+def test_tables_from_other_engine_versions_are_rejected(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Results computed by an older engine aren't served once the rules change."""
+    monkeypatch.setattr(matchups, "ENGINE_VERSION", ENGINE_VERSION - 1)
+    MatchupTable().save(tmp_path / "stale.npz")
+    monkeypatch.undo()
+    with pytest.raises(ValueError, match=f"engine version {ENGINE_VERSION - 1}, expected {ENGINE_VERSION}"):
+        MatchupTable.load(tmp_path / "stale.npz")
@@ -1,6 +1,11 @@
 """Tests for melee combat simulator."""
 
-from vonsneg.rules.melee import MeleeCombatSimulator
+import pytest
+
+from vonsneg.dice.cache import cache_stats, clear_caches
+from vonsneg.rules.melee import MeleeCombatSimulator, MeleeSimulator
+from vonsneg.rules.units import BaseUnit
+from vonsneg.rules.weapons import CloseCombatWeapon, MissileWeapon
 
 
 class DummyUnit:
@@ -68,3 +73,32 @@ def test_describe_output() -> None:
     assert "Wound Delta Distribution:" in desc
     assert "Win by ≥1" in desc
     assert "Lose by ≥1" in desc
+
+
+def test_get_result_follows_unit_changes() -> None:
+    """Changing a stat after a result was cached recomputes only what depends on it."""
+    brutes = BaseUnit("Brutes", "Follower", 6, "", {"A": 2, "I": 5, "V": 5, "W": 1}, [], CloseCombatWeapon())
+    fodder = BaseUnit("Fodder", "Follower", 8, "", {"A": 1, "I": 6, "V": 6, "W": 1}, [], MissileWeapon())
+    simulator = MeleeSimulator(brutes, fodder)
+    before = simulator.get_result()
+
+    clear_caches()
+    fodder.stats["V"] = 4
+    after = simulator.get_result()
+    assert after == MeleeSimulator(brutes, fodder).simulate()
+    assert after != before
+
+    # Stand and shoot against the unchanged attacker is served from cache
+    fodder.stats["V"] = 6
+    assert simulator.get_result() == before
+    assert cache_stats()["vonsneg.dice.compound.wound_pmf"].hits > 0
+
+
+def test_shared_results_are_read_only() -> None:
+    """Results served from the cache can't be changed under later simulators."""
+    brutes = BaseUnit("Brutes", "Follower", 6, "", {"A": 2, "I": 5, "V": 5, "W": 1}, [], CloseCombatWeapon())
+    fodder = BaseUnit("Fodder", "Follower", 8, "", {"A": 1, "I": 6, "V": 6, "W": 1}, [], MissileWeapon())
+    dist = MeleeSimulator(brutes, fodder).get_distribution()
+    with pytest.raises(ValueError, match="read-only"):
+        dist.probs[:] = 0
+    assert MeleeSimulator(brutes, fodder).get_distribution() == dist
@@ -0,0 +1,56 @@
+"""Tests for the Monte Carlo cross-check engines."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from vonsneg.dice.roller import Roller
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.monte_carlo import simulate_melee, simulate_shooting
+from vonsneg.rules.shooting import ShootingSimulator
+from vonsneg.rules.units import load_unit_dicts_from_json, unit_from_dict
+from vonsneg.rules.weapons import CloseCombatWeapon, MissileWeapon
+
+DATA = Path(__file__).resolve().parent.parent / "src" / "vonsneg" / "data"
+TRIALS = 200_000
+
+
+@pytest.fixture(scope="module")
+def unit_dicts() -> dict[str, dict]:
+    return load_unit_dicts_from_json(DATA / "core_units.json")
+
+
+def test_roller_sample_is_seedable() -> None:
+    """Batched rolls are reproducible and within range."""
+    first = Roller(10, 4).sample(1000, np.random.default_rng(7))
+    second = Roller(10, 4).sample(1000, np.random.default_rng(7))
+    assert (first == second).all()
+    assert first.min() >= 0
+    assert first.max() <= 10
+
+
+def test_melee_agrees_with_exact_engine(unit_dicts: dict[str, dict]) -> None:
+    """Stand and shoot into melee matches the exact distribution within its confidence interval."""
+    attacker = unit_from_dict(unit_dicts["brutes"], CloseCombatWeapon())
+    defender = unit_from_dict(unit_dicts["fodder"], MissileWeapon())
+    exact = MeleeSimulator(attacker, defender).simulate_distribution()
+    result = simulate_melee(attacker, defender, TRIALS, np.random.default_rng(1))
+
+    low, high = result.win_interval(confidence=0.999)
+    assert low <= exact.win() <= high
+    assert result.distribution().total() == pytest.approx(1.0)
+
+
+def test_shooting_agrees_with_exact_engine(unit_dicts: dict[str, dict]) -> None:
+    """Simultaneous shooting matches the exact distribution within its confidence interval."""
+    attacker = unit_from_dict(unit_dicts["chaff"], MissileWeapon())
+    defender = unit_from_dict(unit_dicts["fodder"], MissileWeapon())
+    exact = ShootingSimulator(attacker, defender).simulate_distribution()
+    result = simulate_shooting(attacker, defender, TRIALS, np.random.default_rng(2))
+
+    low, high = result.mean_interval(confidence=0.999)
+    assert low <= exact.mean() <= high
+    for outcome in (-2, 0, 1):
+        low, high = result.probability_interval(outcome, confidence=0.999)
+        assert low <= exact.get(outcome, 0.0) <= high
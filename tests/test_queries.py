@@ -0,0 +1,108 @@
+"""Tests for one-number queries on the simulators."""
+
+import numpy as np
+import pytest
+
+from vonsneg.dice.distribution import Distribution
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.queries import ResultQueries
+from vonsneg.rules.shooting import ShootingSimulator
+from vonsneg.rules.units import BaseUnit
+from vonsneg.rules.weapons import CloseCombatWeapon, MissileWeapon
+
+
+def make_unit(name: str, models: int, weapon, **stats) -> BaseUnit:
+    return BaseUnit(name, "Follower", models, "", {"A": 1, "I": 5, "V": 5, "W": 1, **stats}, [], weapon)
+
+
+@pytest.fixture(params=[MeleeSimulator, ShootingSimulator])
+def simulator(request: pytest.FixtureRequest) -> MeleeSimulator | ShootingSimulator:
+    archers = make_unit("Archers", 8, MissileWeapon())
+    brutes = make_unit("Brutes", 5, MissileWeapon(), A=2, W=2)
+    return request.param(archers, brutes)
+
+
+def test_distribution_tails_use_cumulative_mass() -> None:
+    """CDF and tail queries agree with summing the outcomes."""
+    dist = Distribution([0.1, 0.2, 0.3, 0.4], offset=-1)
+    assert dist.cdf(-2) == 0.0
+    assert dist.cdf(0) == pytest.approx(0.3)
+    assert dist.cdf(10) == pytest.approx(1.0)
+    assert dist.at_least(1) == pytest.approx(0.7)
+    assert (dist.win(), dist.draw(), dist.lose()) == pytest.approx((0.7, 0.2, 0.1))
+    assert not dist.cumulative().flags.writeable
+
+
+def test_queries_match_the_full_distribution(simulator: MeleeSimulator | ShootingSimulator) -> None:
+    """Every query agrees with the materialised result."""
+    result = simulator.simulate()
+    for delta in range(-15, 15):
+        assert simulator.probability_at_least(delta) == pytest.approx(sum(p for d, p in result.items() if d >= delta))
+        assert simulator.probability_at_most(delta) == pytest.approx(sum(p for d, p in result.items() if d <= delta))
+    assert simulator.win_probability() == pytest.approx(sum(p for d, p in result.items() if d > 0))
+    assert simulator.lose_probability() == pytest.approx(sum(p for d, p in result.items() if d < 0))
+    assert simulator.expected_delta() == pytest.approx(sum(d * p for d, p in result.items()))
+    assert simulator.quantile(0.5) == simulator.get_distribution().quantile(0.5)
+
+
+def test_out_of_range_thresholds_skip_simulation(simulator: MeleeSimulator | ShootingSimulator) -> None:
+    """Thresholds beyond what the units can do are answered without simulating."""
+
+    def fail(**kwargs) -> Distribution:
+        raise AssertionError("simulated")
+
+    simulator.simulate_distribution = fail
+    low, high = simulator.delta_bounds()
+    assert simulator.probability_at_least(high + 1) == 0.0
+    assert simulator.probability_at_least(low) == 1.0
+    assert simulator.probability_at_most(low - 1) == 0.0
+    assert simulator.probability_at_most(high) == 1.0
+
+
+def test_shooting_casualties_count_wounds_per_model() -> None:
+    """Two-wound models die to every second wound, capped at the unit size."""
+    archers = make_unit("Archers", 8, MissileWeapon())
+    brutes = make_unit("Brutes", 3, CloseCombatWeapon(), W=2)
+    simulator = ShootingSimulator(archers, brutes)
+    wounds = simulator.simulate()
+    expected = sum(min(w // 2, 3) * p for w, p in wounds.items())
+    assert simulator.expected_casualties() == pytest.approx(expected)
+    assert simulator.expected_casualties("attacker") == 0.0
+
+
+def test_melee_casualties_cover_stand_and_shoot_and_the_bout() -> None:
+    """Melee casualties include the models lost to stand and shoot before the bout."""
+    brutes = make_unit("Brutes", 4, CloseCombatWeapon(), A=2)
+    archers = make_unit("Archers", 6, MissileWeapon())
+    charged = MeleeSimulator(brutes, archers)
+    unopposed = MeleeSimulator(brutes, make_unit("Archers", 6, CloseCombatWeapon()))
+
+    assert 0 < charged.expected_casualties("defender") < 6
+    assert charged.expected_casualties("attacker") > unopposed.expected_casualties("attacker")
+    assert np.isclose(MeleeSimulator(brutes, make_unit("Nobody", 0, CloseCombatWeapon())).expected_casualties(), 0)
+
+
+def test_incomplete_simulators_fail_on_construction() -> None:
+    """A simulator missing part of the query interface can't be built."""
+
+    class Unbounded(ResultQueries):
+        def get_distribution(self) -> Distribution:
+            return Distribution.point(0)
+
+        def simulate_distribution(self) -> Distribution:
+            return Distribution.point(0)
+
+        def result_key(self) -> tuple:
+            return ()
+
+    class Unkeyed(ResultQueries):
+        def get_distribution(self) -> Distribution:
+            return Distribution.point(0)
+
+        def delta_bounds(self) -> tuple[int, int]:
+            return 0, 0
+
+    with pytest.raises(TypeError, match="delta_bounds"):
+        Unbounded()
+    with pytest.raises(TypeError, match="result_key"):
+        Unkeyed()
@@ -67,3 +67,23 @@ def test_extreme_modifier_results() -> None:
     roller = Roller(num_dice=MAX_DICE, target=2, modifier=-1)
     prob_dict = roller.prob_dict()
     assert pytest.approx(prob_dict.get(MAX_DICE, 0.0), abs=1e-6) == 1.0
+
+
+@pytest.mark.parametrize("reroll", ["failures", "ones"])
+def test_rerolls_agree_across_engines(reroll: str) -> None:
+    """The exact PMF, icepool and rolled dice agree once rerolls are folded in."""
+    roller = Roller(6, target=5, modifier=-1, reroll=reroll)
+    dist = roller.distribution()
+    assert roller.prob_dict() == pytest.approx({k: float(dist.probability(k)) for k in dist})
+
+    expected = sum(k * p for k, p in roller.prob_dict().items())
+    assert expected > Roller(6, target=4).distribution().mean()
+    rolled = [roller.simulate() for _ in range(4000)]
+    assert sum(rolled) / len(rolled) == pytest.approx(expected, abs=0.15)
+    assert roller.sample(4000).mean() == pytest.approx(expected, abs=0.15)
+
+
+def test_unknown_reroll_is_rejected() -> None:
+    """Only failures and ones can be rerolled."""
+    with pytest.raises(ValueError, match="Unknown reroll"):
+        Roller(6, 4, reroll="sixes")
@@ -0,0 +1,70 @@
+"""Tests for threshold and best-weapon searches."""
+
+from pathlib import Path
+
+import pytest
+
+from vonsneg.rules.catalog import UnitCatalog
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.search import best_weapon, minimum_to_win, rank_weapons, with_parameter
+from vonsneg.rules.weapons import WEAPONS, CloseCombatWeapon
+
+DATA = Path(__file__).resolve().parent.parent / "src" / "vonsneg" / "data"
+
+
+@pytest.fixture
+def catalog() -> UnitCatalog:
+    return UnitCatalog.load(DATA / "core_units.json")
+
+
+def test_minimum_models_matches_a_linear_scan(catalog: UnitCatalog) -> None:
+    """Binary search finds the same model count as trying every count in turn."""
+    fodder = catalog.unit("fodder")
+    bastards = catalog.unit("bastards")
+    result = minimum_to_win("melee", fodder, bastards, 0.7)
+
+    naive = next(
+        models
+        for models in range(1, 51)
+        if MeleeSimulator(with_parameter(fodder, "models", models), bastards).win_probability() >= 0.7
+    )
+    assert result.value == naive
+    assert result.win >= 0.7
+    assert result.evaluations <= 6
+    assert fodder.models == 12  # the searched unit is left alone
+
+
+def test_stat_search_and_unreachable_thresholds(catalog: UnitCatalog) -> None:
+    brutes = catalog.unit("brutes")
+    fodder = catalog.unit("fodder")
+    result = minimum_to_win("melee", brutes, fodder, 0.9, parameter="I", values=range(6, 1, -1))
+    assert result.parameter == "I"
+    weaker = with_parameter(brutes, "I", result.value + 1)
+    assert MeleeSimulator(weaker, fodder).win_probability() < 0.9 <= result.win
+
+    assert minimum_to_win("melee", brutes, fodder, 1.01) is None
+    with pytest.raises(ValueError, match="Candidate values"):
+        minimum_to_win("melee", brutes, fodder, 0.5, parameter="A")
+
+
+def test_defender_side_search(catalog: UnitCatalog) -> None:
+    """Searching the defender finds how big it must be to beat the charge."""
+    bastards = catalog.unit("bastards")
+    result = minimum_to_win("melee", bastards, catalog.unit("fodder"), 0.5, side="defender")
+    defender = with_parameter(catalog.unit("fodder"), "models", result.value)
+    assert MeleeSimulator(bastards, defender).lose_probability() == pytest.approx(result.win)
+
+
+def test_weapon_ranking(catalog: UnitCatalog) -> None:
+    """Every weapon is scored as if simulated directly, best first."""
+    brutes = catalog.unit("brutes")
+    fodder = catalog.unit("fodder", CloseCombatWeapon())
+    ranking = rank_weapons("melee", brutes, fodder)
+
+    assert len(ranking) == len(WEAPONS)
+    assert [choice.win for choice in ranking] == sorted((choice.win for choice in ranking), reverse=True)
+    for choice in ranking:
+        weapon = next(w() for w in WEAPONS.values() if w().name == choice.weapon)
+        brutes.weapon = weapon
+        assert choice.win == pytest.approx(MeleeSimulator(brutes, fodder).win_probability())
+    assert best_weapon("melee", catalog.unit("brutes"), fodder) == ranking[0]
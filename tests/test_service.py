@@ -0,0 +1,119 @@
+"""Tests for the asynchronous simulation service."""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from vonsneg import service
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.store import ResultStore
+from vonsneg.rules.units import BaseUnit, load_unit_dicts_from_json, unit_from_dict
+from vonsneg.rules.weapons import CloseCombatWeapon, MissileWeapon
+from vonsneg.service import SimulationService, run_simulation
+
+DATA = Path(__file__).resolve().parent.parent / "src" / "vonsneg" / "data"
+
+
+class GatedExecutor(ThreadPoolExecutor):
+    """Thread pool that counts submissions and holds work until released."""
+
+    def __init__(self) -> None:
+        super().__init__(max_workers=2)
+        self.submitted = 0
+        self.release = threading.Event()
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+
+        def gated():
+            self.release.wait()
+            return fn(*args, **kwargs)
+
+        return super().submit(gated)
+
+
+@pytest.fixture
+def units() -> tuple[BaseUnit, BaseUnit]:
+    unit_dicts = load_unit_dicts_from_json(DATA / "core_units.json")
+    return unit_from_dict(unit_dicts["brutes"], CloseCombatWeapon()), unit_from_dict(
+        unit_dicts["fodder"], MissileWeapon()
+    )
+
+
+def test_identical_requests_share_one_computation(units: tuple[BaseUnit, BaseUnit]) -> None:
+    """Concurrent identical requests are computed once and all get the result."""
+    attacker, defender = units
+    executor = GatedExecutor()
+
+    async def run():
+        service = SimulationService(executor)
+        tasks = [asyncio.create_task(service.simulate("melee", attacker, defender)) for _ in range(3)]
+        await asyncio.sleep(0)
+        executor.release.set()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(run())
+    executor.shutdown()
+    assert executor.submitted == 1
+    assert results[0] is results[1] is results[2]
+    assert results[0].distribution == MeleeSimulator(attacker, defender).simulate()
+    assert "Combat Outcome:" in results[0].description
+
+
+def test_time_budget_is_enforced(units: tuple[BaseUnit, BaseUnit]) -> None:
+    """Requests that exceed their budget time out without blocking the loop."""
+    attacker, defender = units
+    executor = GatedExecutor()
+
+    async def run():
+        service = SimulationService(executor, timeout=0.01)
+        with pytest.raises(TimeoutError):
+            await service.simulate("shooting", attacker, defender)
+        executor.release.set()
+        return await service.simulate("shooting", attacker, defender, timeout=5)
+
+    result = asyncio.run(run())
+    executor.shutdown()
+    assert executor.submitted == 1
+    assert result.distribution.total() == pytest.approx(1.0)
+
+
+def test_process_pool_round_trip(units: tuple[BaseUnit, BaseUnit]) -> None:
+    """Units and results survive the trip through worker processes."""
+    attacker, defender = units
+
+    async def run():
+        async with SimulationService(timeout=30) as service:
+            return await service.describe("melee", attacker, defender)
+
+    assert asyncio.run(run()) == MeleeSimulator(attacker, defender).describe()
+
+
+def test_restarted_service_serves_from_the_store(units: tuple[BaseUnit, BaseUnit], tmp_path: Path) -> None:
+    """A service backed by a result store reuses what an earlier service computed."""
+    attacker, defender = units
+
+    async def run():
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            service = SimulationService(executor, store=tmp_path / "results.db")
+            return await service.simulate("melee", attacker, defender)
+
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+    assert second.distribution == first.distribution
+    assert ResultStore(tmp_path / "results.db").stats().entries == 1
+
+
+def test_each_request_looks_up_the_store_once(units: tuple[BaseUnit, BaseUnit], tmp_path: Path) -> None:
+    """The description is rendered from the served distribution rather than a second lookup."""
+    attacker, defender = units
+    path = tmp_path / "results.db"
+    first = run_simulation("melee", attacker, defender, path)
+    second = run_simulation("melee", attacker, defender, path)
+    assert second == first
+    stats = service._STORES[path].stats()
+    assert (stats.hits, stats.misses) == (1, 1)
@@ -4,7 +4,7 @@ import pytest
 
 from vonsneg.rules.shooting import ShootingSimulator
 from vonsneg.rules.units import BaseUnit
-from vonsneg.rules.weapons import MissileWeapon
+from vonsneg.rules.weapons import CloseCombatWeapon, MissileWeapon
 
 
 def test_missile_weapon_with_vulnerability_modifier() -> None:
@@ -41,3 +41,15 @@ def test_missile_weapon_with_vulnerability_modifier() -> None:
     # Additional assertions to verify the distribution makes sense
     assert all(prob >= 0 for prob in outcome.values())  # All probabilities should be non-negative
     assert all(prob <= 1 for prob in outcome.values())  # All probabilities should be <= 1
+
+
+def test_get_result_follows_weapon_swap() -> None:
+    """Swapping a weapon after a result was cached changes the result."""
+    shooter = BaseUnit("Shooter", "Shooter", 5, "medium", {"A": 1, "I": 4, "V": 6}, [], MissileWeapon())
+    target = BaseUnit("Target", "Target", 10, "large", {"A": 1, "I": 4, "V": 5, "W": 1}, [], MissileWeapon())
+    simulator = ShootingSimulator(shooter, target)
+    simultaneous = simulator.get_result()
+
+    target.weapon = CloseCombatWeapon()
+    assert simulator.get_result() == ShootingSimulator(shooter, target).simulate()
+    assert min(simulator.get_result()) == 0 < -min(simultaneous)
@@ -0,0 +1,120 @@
+"""Tests for the persistent result store."""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from vonsneg.dice.distribution import Distribution
+from vonsneg.rules import store as store_module
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.shooting import ShootingSimulator
+from vonsneg.rules.store import ResultStore, fingerprint
+from vonsneg.rules.units import BaseUnit
+from vonsneg.rules.weapons import BlackPowderWeapon, CloseCombatWeapon, MissileWeapon
+
+
+def make_unit(name: str, models: int, weapon, **stats) -> BaseUnit:
+    return BaseUnit(name, "Follower", models, "", {"A": 1, "I": 5, "V": 5, "W": 1, **stats}, [], weapon)
+
+
+def fail(**kwargs) -> Distribution:
+    raise AssertionError("simulated")
+
+
+def test_warm_restart_serves_without_simulating(tmp_path: Path) -> None:
+    """A store reopened on the same file answers from disk."""
+    simulator = MeleeSimulator(
+        make_unit("Brutes", 4, CloseCombatWeapon(), A=2), make_unit("Archers", 6, MissileWeapon())
+    )
+    cold = ResultStore(tmp_path / "results.db")
+    expected = simulator.get_distribution(cold)
+    assert cold.stats().misses == 1
+    cold.close()
+
+    warm = ResultStore(tmp_path / "results.db")
+    simulator.simulate_distribution = fail
+    assert simulator.get_result(store=warm) == expected.to_dict()
+    assert simulator.describe(warm)
+    assert warm.stats().hits >= 1
+    assert warm.stats().misses == 0
+
+
+def test_fingerprint_covers_the_inputs(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Renamed but identical units share a fingerprint, any rules change does not."""
+    archers = make_unit("Archers", 8, MissileWeapon())
+    brutes = make_unit("Brutes", 5, CloseCombatWeapon())
+    key = fingerprint(ShootingSimulator(archers, brutes))
+    assert fingerprint(ShootingSimulator(make_unit("Bowmen", 8, MissileWeapon()), brutes)) == key
+    assert fingerprint(MeleeSimulator(archers, brutes)) != key
+    assert fingerprint(ShootingSimulator(archers, make_unit("Brutes", 5, MissileWeapon()))) != key
+    assert fingerprint(ShootingSimulator(archers, make_unit("Brutes", 5, CloseCombatWeapon(), V=4))) != key
+    assert fingerprint(ShootingSimulator(archers, make_unit("Brutes", 4, CloseCombatWeapon()))) != key
+
+    # Single simulations ignore powder smoke, so it is left out rather than splitting entries
+    gunners, smoked = make_unit("Gunners", 8, BlackPowderWeapon()), make_unit("Gunners", 8, BlackPowderWeapon())
+    smoked.state["smoke"] = True
+    assert fingerprint(ShootingSimulator(smoked, brutes)) == fingerprint(ShootingSimulator(gunners, brutes))
+    assert ShootingSimulator(smoked, brutes).simulate() == ShootingSimulator(gunners, brutes).simulate()
+
+    monkeypatch.setattr(store_module, "ENGINE_VERSION", store_module.ENGINE_VERSION + 1)
+    assert fingerprint(ShootingSimulator(archers, brutes)) != key
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    store = ResultStore(tmp_path / "results.db", max_bytes=3 * 8 * 4)
+    for key in "abc":
+        store.put(key, Distribution(np.full(4, 0.25)))
+    assert store.get("a") is not None  # a is now more recent than b
+    store.put("d", Distribution(np.full(4, 0.25)))
+
+    assert store.get("b") is None
+    assert all(store.get(key) is not None for key in "acd")
+    stats = store.stats()
+    assert (stats.entries, stats.evictions) == (3, 1)
+    assert stats.size_bytes <= stats.max_bytes
+
+
+def _fill(path: Path, worker: int) -> None:
+    store = ResultStore(path)
+    for i in range(20):
+        store.put(f"{worker}-{i}", Distribution([0.5, 0.5], i))
+
+
+def test_concurrent_writers(tmp_path: Path) -> None:
+    """Worker processes can write to the same store at once."""
+    path = tmp_path / "results.db"
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        list(executor.map(_fill, [path] * 3, range(3)))
+    store = ResultStore(path)
+    assert len(store) == 60
+    assert store.get("2-7") == Distribution([0.5, 0.5], 7)
+
+
+def test_size_is_tracked_without_scanning(tmp_path: Path) -> None:
+    """The running size follows inserts, replacements, evictions and clears."""
+    store = ResultStore(tmp_path / "results.db", max_bytes=10 * 8)
+    store.put("a", Distribution(np.full(4, 0.25)))
+    store.put("b", Distribution(np.full(2, 0.5)))
+    store.put("a", Distribution(np.full(5, 0.2)))
+    assert store.stats().size_bytes == 7 * 8
+    store.put("c", Distribution(np.full(4, 0.25)))  # b is evicted
+    assert (store.stats().entries, store.stats().size_bytes) == (2, 9 * 8)
+    store.clear()
+    assert (store.stats().entries, store.stats().size_bytes) == (0, 0)
+
+
+def test_hits_batch_their_use_times(tmp_path: Path) -> None:
+    """Reads don't write until the touch interval passes or the next store."""
+    store = ResultStore(tmp_path / "results.db", touch_interval=3600)
+    store.put("a", Distribution([1.0]))
+    connection = store._connect()
+    writes = connection.total_changes
+    for _ in range(5):
+        assert store.get("a") == Distribution([1.0])
+    assert connection.total_changes == writes
+
+    store.touch_interval = 0
+    store.get("a")
+    assert connection.total_changes == writes + 1
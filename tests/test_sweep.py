@@ -0,0 +1,76 @@
+"""Tests for the parallel sweep runner."""
+
+import io
+import itertools
+from pathlib import Path
+
+import pytest
+
+from vonsneg.rules.melee import MeleeSimulator
+from vonsneg.rules.sweep import iter_cases, run_sweep, write_results
+from vonsneg.rules.units import load_unit_dicts_from_json, unit_from_dict
+from vonsneg.rules.weapons import CloseCombatWeapon, MissileWeapon
+
+DATA = Path(__file__).resolve().parent.parent / "src" / "vonsneg" / "data"
+
+
+@pytest.fixture(scope="module")
+def unit_dicts() -> dict[str, dict]:
+    return load_unit_dicts_from_json(DATA / "core_units.json")
+
+
+def test_grid_expands_every_axis(unit_dicts: dict[str, dict]) -> None:
+    """Cases cover the product of all axes and apply overrides and model counts."""
+    cases = list(
+        iter_cases(
+            kinds=["melee"],
+            attackers=["brutes"],
+            defenders=["fodder", "chaff"],
+            attacker_weapons=["close combat"],
+            defender_weapons=["close combat", "missile"],
+            attacker_models=[3, 4],
+            overrides=[{"attacker.V": 4}, {}],
+        ),
+    )
+    assert len(cases) == 2 * 2 * 2 * 2
+    brutes = cases[0].build_unit("attacker", unit_dicts)
+    assert (brutes.models, brutes.stats["V"]) == (3, 4)
+    assert unit_dicts["brutes"]["stats"]["V"] == 5
+
+
+def test_parallel_results_are_ordered(unit_dicts: dict[str, dict]) -> None:
+    """Worker processes return the same results, in order, as a serial run."""
+    cases = list(
+        iter_cases(["melee", "shooting"], ["fodder", "whelps"], ["brutes"], ["missile"], ["close combat", "missile"]),
+    )
+    serial = list(run_sweep(cases, unit_dicts))
+    parallel = list(run_sweep(cases, unit_dicts, jobs=2, chunksize=3))
+    assert [result.case for result in parallel] == cases
+    assert [result.distribution for result in parallel] == [result.distribution for result in serial]
+
+    fodder = unit_from_dict(unit_dicts["fodder"], MissileWeapon())
+    brutes = unit_from_dict(unit_dicts["brutes"], CloseCombatWeapon())
+    assert serial[0].distribution == MeleeSimulator(fodder, brutes).simulate()
+
+
+def test_write_results_streams_rows(unit_dicts: dict[str, dict]) -> None:
+    """Results are written as a header plus one CSV row per case."""
+    cases = iter_cases(["shooting"], ["fodder"], ["brutes", "chaff"], ["missile"], ["close combat"])
+    stream = io.StringIO()
+    assert write_results(run_sweep(cases, unit_dicts), stream) == 2
+    assert len(stream.getvalue().splitlines()) == 3
+
+
+def test_parallel_sweep_reads_cases_lazily(unit_dicts: dict[str, dict]) -> None:
+    """Worker pools only read a few chunks ahead, so cases can come from a stream."""
+    consumed = []
+
+    def stream():
+        for case in itertools.cycle(iter_cases(["shooting"], ["fodder"], ["brutes"], ["missile"], ["close combat"])):
+            consumed.append(case)
+            yield case
+
+    results = run_sweep(stream(), unit_dicts, jobs=2, chunksize=2)
+    assert next(results).case == consumed[0]
+    assert len(consumed) <= 2 * 2 * 2 + 1
+    results.close()
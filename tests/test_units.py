@@ -0,0 +1,46 @@
+"""Tests for units and unit profiles."""
+
+import pickle
+
+from vonsneg.rules.units import BaseUnit, UnitProfile
+from vonsneg.rules.weapons import BlackPowderWeapon, CloseCombatWeapon, MissileWeapon
+
+
+def make_unit(weapon) -> BaseUnit:
+    return BaseUnit("Chaff", "Follower", 10, "25mm", {"M": 6, "A": 1, "I": 6, "V": 6}, ["Skirmish"], weapon)
+
+
+def test_profile_reads_stats_traits_and_weapon() -> None:
+    """A profile flattens stats, traits and weapon modifiers into plain fields."""
+    profile = make_unit(MissileWeapon()).profile()
+    assert (profile.movement, profile.attacks, profile.inaccuracy, profile.vitality) == (6, 1, 6, 6)
+    assert profile.wounds == 1
+    assert profile.traits == frozenset({"Skirmish"})
+    assert profile.weapon == "Missile Weapon"
+    assert profile.shooting_save_mod == -2
+    assert profile.can_shoot
+    assert not profile.black_powder
+    assert make_unit(BlackPowderWeapon()).profile().black_powder
+
+
+def test_profiles_compare_and_hash_by_value() -> None:
+    """Separately built units with the same stats and weapon share a cache key."""
+    first, second = make_unit(CloseCombatWeapon()).profile(), make_unit(CloseCombatWeapon()).profile()
+    assert first is not second
+    assert first == second
+    assert len({first, second}) == 1
+    assert first != make_unit(MissileWeapon()).profile()
+    assert pickle.loads(pickle.dumps(first)) == first
+
+
+def test_profile_is_a_snapshot() -> None:
+    """Changing the unit afterwards does not change an existing profile."""
+    unit = make_unit(CloseCombatWeapon())
+    profile = unit.profile()
+    unit.stats["V"] = 4
+    unit.traits.append("Fearless")
+    assert profile.vitality == 6
+    assert "Fearless" not in profile.traits
+    assert unit.profile().vitality == 4
+    assert not hasattr(profile, "__dict__")
+    assert isinstance(profile, UnitProfile)